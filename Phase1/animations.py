@@ -1,10 +1,14 @@
 import pygame
 import math
+from text_renderer import get_font, render_text
 
 
 class Animation:
     """Classe de base pour toutes les animations"""
 
+    # Rayon maximal dessiné autour de la position de l'animation (en pixels)
+    bounds_radius = 40
+
     def __init__(self, duration=1.0):
         self.elapsed_time = 0
         self.duration = duration
@@ -20,6 +24,13 @@ class Animation:
         """Méthode à surcharger dans les classes enfants"""
         pass
 
+    def get_bounds(self, position):
+        """Retourne la zone de l'écran sur laquelle l'animation peut dessiner"""
+        size = self.bounds_radius * 2
+        bounds = pygame.Rect(0, 0, size, size)
+        bounds.center = position
+        return bounds
+
     def reset(self):
         """Réinitialise l'animation"""
         self.elapsed_time = 0
@@ -71,8 +82,8 @@ class PotionMixingAnimation(Animation):
         # Afficher la progression (optionnel)
         if progress < 1.0:
             progress_percent = int(progress * 100)
-            font = pygame.font.SysFont('Arial', 12)
-            text_surface = font.render(f"{progress_percent}%", True, (255, 255, 255))
+            font = get_font('Arial', 12)
+            text_surface = render_text(font, f"{progress_percent}%", True, (255, 255, 255))
             surface.blit(
                 text_surface,
                 (center_x - text_surface.get_width() // 2, center_y - 20)
@@ -121,6 +132,11 @@ class AnimationManager:
             position = anim_data["position"]
             animation.draw(surface, position)
 
+    def get_bounds(self):
+        """Retourne les zones de l'écran couvertes par les animations actives"""
+        return [anim_data["animation"].get_bounds(anim_data["position"])
+                for anim_data in self.animations.values()]
+
     def is_animation_active(self, name):
         """Vérifie si une animation est active"""
         return name in self.animations
\ No newline at end of file
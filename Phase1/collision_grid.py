@@ -0,0 +1,70 @@
+import pygame
+
+from constants import COLLISION_CELL_SIZE
+
+
+class CollisionGrid:
+    """
+    Grille de collision statique d'une carte, construite une seule fois au chargement.
+    Chaque mur est rangé dans toutes les cellules qu'il recouvre ; les cellules
+    entièrement couvertes par un mur sont en plus marquées comme pleines.
+    Tester un rectangle ne regarde que les cellules qu'il recouvre : le coût d'un
+    déplacement ne dépend pas du nombre de murs de la carte.
+    """
+
+    def __init__(self, walls, cell_size=COLLISION_CELL_SIZE):
+        """
+        :param walls: rectangles de collision de la carte (murs, objets, bords de l'écran)
+        :param cell_size: taille d'une cellule de la grille en pixels
+        """
+        self.cell_size = cell_size
+        self.walls = [pygame.Rect(wall) for wall in walls]
+        self.cells = {}  # (colonne, ligne) -> tuple des murs qui recouvrent la cellule
+        self.solid = set()  # Cellules entièrement couvertes par un mur
+
+        for wall in self.walls:
+            if wall.width <= 0 or wall.height <= 0:
+                continue
+
+            for cell in self._cells_for(wall):
+                self.cells[cell] = self.cells.get(cell, ()) + (wall,)
+
+                cell_rect = pygame.Rect(cell[0] * cell_size, cell[1] * cell_size, cell_size, cell_size)
+                if wall.contains(cell_rect):
+                    self.solid.add(cell)
+
+    def _cells_for(self, rect):
+        """Cellules recouvertes par un rectangle"""
+        size = self.cell_size
+        return [(column, row)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for column in range(rect.left // size, (rect.right - 1) // size + 1)]
+
+    def collides(self, rect):
+        """True si le rectangle touche un mur"""
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+
+        for cell in self._cells_for(rect):
+            if cell in self.solid:
+                return True
+            for wall in self.cells.get(cell, ()):
+                if rect.colliderect(wall):
+                    return True
+        return False
+
+    def move_and_collide(self, rect, dx, dy):
+        """
+        Calcule le déplacement possible d'un rectangle, un axe après l'autre
+        (horizontal puis vertical) : un axe bloqué par un mur est annulé sans
+        empêcher le glissement le long de l'autre.
+        :param rect: rectangle à déplacer (non modifié)
+        :param dx: déplacement horizontal souhaité en pixels
+        :param dy: déplacement vertical souhaité en pixels
+        :return: (dx, dy) réellement possibles
+        """
+        if dx and self.collides(rect.move(dx, 0)):
+            dx = 0
+        if dy and self.collides(rect.move(dx, dy)):
+            dy = 0
+        return dx, dy
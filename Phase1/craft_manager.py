@@ -2,6 +2,11 @@ from Phase1.potions import Potion
 import pygame
 from Phase1.animations import Animation, AnimationManager
 from Phase1.elements import Element
+from text_renderer import get_font, render_text
+from event_bus import ZONE_OBJECT_PLACED, ZONE_OBJECT_REMOVED, CRAFT_COMPLETED
+from log import get_logger
+
+logger = get_logger(__name__)
 
 
 class CraftingAnimation(Animation):
@@ -38,9 +43,9 @@ class CraftingAnimation(Animation):
 
         # Afficher le progrès
         if progress < 1.0:
-            font = pygame.font.SysFont('Arial', 12)
+            font = get_font('Arial', 12)
             progress_percent = int(progress * 100)
-            text_surface = font.render(f"{progress_percent}%", True, (255, 255, 255))
+            text_surface = render_text(font, f"{progress_percent}%", True, (255, 255, 255))
             surface.blit(
                 text_surface,
                 (center_x - text_surface.get_width() // 2, center_y - 20)
@@ -48,7 +53,15 @@ class CraftingAnimation(Animation):
 
 
 class AutoCraftManager:
-    """Gestionnaire pour le crafting automatique d'éléments"""
+    """
+    Gestionnaire pour le crafting automatique d'éléments.
+    Le crafting est piloté par les événements : la table de craft n'est réexaminée
+    que lorsqu'un objet est posé sur une de ses zones ou en est retiré (dépôt,
+    ramassage, consommation, résultat). Les images sans changement ne coûtent rien.
+    """
+
+    # Types de zones qui forment une table de craft
+    BENCH_ZONE_TYPES = ("craft_zone", "end_craft_zone")
 
     def __init__(self, game):
         self.game = game
@@ -58,6 +71,52 @@ class AutoCraftManager:
         self.craft_center = None
         self.elements_to_craft = []
         self.matching_recipe = None  # Initialisé à None pour éviter les erreurs
+        # Groupe d'éléments et zones de résultat de la table du craft en cours,
+        # gardés au lancement : le craft se termine sur sa table même si la carte active change
+        self.craft_elements_group = None
+        self.result_zones = []
+
+        # Zones de table de craft modifiées depuis le dernier examen
+        self.changed_zones = set()
+
+        game.events.subscribe(ZONE_OBJECT_PLACED, self.on_zone_changed)
+        game.events.subscribe(ZONE_OBJECT_REMOVED, self.on_zone_changed)
+
+    def on_zone_changed(self, zone, obj):
+        """
+        Note qu'une zone de table de craft a changé (appelé par le bus d'événements).
+        Un ingrédient retiré de la table pendant le craft annule celui-ci.
+        """
+        if zone.type in self.BENCH_ZONE_TYPES:
+            self.changed_zones.add(zone)
+            if self.craft_in_progress and obj in self.elements_to_craft:
+                self.cancel_crafting()
+
+    def reset(self):
+        """Oublie les changements en attente et annule le craft en cours (nouvelle partie)"""
+        if self.craft_in_progress:
+            self.cancel_crafting()
+        self.changed_zones.clear()
+
+    def cancel_crafting(self):
+        """Annule le craft en cours : les ingrédients restants restent sur la table"""
+        logger.debug("Crafting annulé : un ingrédient a quitté la table de craft")
+        self.craft_in_progress = False
+        self.craft_timer = 0
+        self.clear_craft_state()
+
+    def bench_changed(self):
+        """
+        True si une zone de la table de craft de la carte active a changé depuis le dernier examen.
+        Les changements des autres cartes restent en attente jusqu'à ce qu'elles redeviennent actives.
+        """
+        if not self.changed_zones:
+            return False
+
+        bench_zones = [zone for zone in self.changed_zones
+                       if zone in self.game.craft_zones or zone in self.game.end_craft_zones]
+        self.changed_zones.difference_update(bench_zones)
+        return bool(bench_zones)
 
     def check_for_crafting(self):
         """Vérifie si des éléments sont sur la table de craft et lance le crafting si nécessaire"""
@@ -69,28 +128,17 @@ class AutoCraftManager:
         zones_with_elements = []
 
         # Vérifier les zones de craft
+        occupancy = self.game.zone_occupancy
         for zone in self.game.craft_zones:
-            print(f"DEBUG: Vérification zone craft {zone.id}, occupée: {zone.have_object}")
-            if zone.have_object:
-                # Chercher l'élément sur cette zone
-                element_found = False
-                for element in self.game.elements:
-                    if not element.held_by_player and zone.rect.colliderect(element.rect):
-                        elements_on_craft.append(element)
-                        zones_with_elements.append(zone)
-                        print(f"DEBUG: Élément {element.name} trouvé sur zone {zone.id}")
-                        element_found = True
-                        break
-
-                # Si aucun élément n'est trouvé mais la zone est marquée comme occupée, corriger l'état
-                if not element_found:
-                    print(f"DEBUG: Zone {zone.id} marquée comme occupée mais aucun élément trouvé. Correction...")
-                    zone.have_object = False
+            element = occupancy.get(zone)
+            if isinstance(element, Element):
+                elements_on_craft.append(element)
+                zones_with_elements.append(zone)
+                logger.debug("Élément %s trouvé sur zone %s", element.name, zone.id)
 
         # S'il y a exactement 2 éléments, lancer le crafting automatique
         if len(elements_on_craft) == 2:
-            print(
-                f"DEBUG: 2 éléments trouvés pour crafting: {elements_on_craft[0].name} et {elements_on_craft[1].name}")
+            logger.debug("2 éléments trouvés pour crafting: %s et %s", elements_on_craft[0].name, elements_on_craft[1].name)
 
             # Calculer le centre pour l'animation (moyenne des positions des zones de craft)
             craft_center_x = sum(zone.rect.centerx for zone in zones_with_elements) // len(zones_with_elements)
@@ -98,36 +146,20 @@ class AutoCraftManager:
             self.craft_center = (craft_center_x, craft_center_y)
 
             # Vérifier si la zone de résultat est libre
-            result_zone_free = True
-            if self.game.end_craft_zones:
-                for result_zone in self.game.end_craft_zones:
-                    # Vérifier si des objets sont présents sur la zone de résultat
-                    objects = []
-                    for element in self.game.elements:
-                        if not element.held_by_player and result_zone.rect.colliderect(element.rect):
-                            objects.append(element)
-
-                    if objects or result_zone.have_object:
-                        result_zone_free = False
-                        break
+            result_zone_free = not any(occupancy.is_occupied(zone) for zone in self.game.end_craft_zones)
 
             if result_zone_free:
-                # Vérifier s'il existe une recette pour ces éléments
-                posed_ids = sorted([el.id for el in elements_on_craft])
-
-                # Trouver une recette correspondante
-                self.matching_recipe = None  # Réinitialiser
-                for recipe in self.game.recipes_data:
-                    if sorted(recipe["ingredients"]) == posed_ids:
-                        self.matching_recipe = recipe
-                        break
+                # Trouver une recette correspondante via l'index des recettes
+                self.matching_recipe = self.game.recipe_index.find([el.id for el in elements_on_craft])
 
                 if self.matching_recipe:
-                    print("DEBUG: Recette trouvée pour auto-craft:", self.matching_recipe["result_name"])
+                    logger.debug("Recette trouvée pour auto-craft: %s", self.matching_recipe["result_name"])
                     self.craft_in_progress = True
                     self.craft_timer = 0
                     self.elements_to_craft = elements_on_craft
                     self.zones_with_elements = zones_with_elements
+                    self.craft_elements_group = self.game.elements
+                    self.result_zones = list(self.game.end_craft_zones)
 
                     # Ajouter l'animation
                     craft_anim = CraftingAnimation(duration=self.craft_time_required)
@@ -140,21 +172,24 @@ class AutoCraftManager:
                     self.game.ui.show_message(f"Crafting {self.matching_recipe['result_name']} en cours...", 2.0)
                     return True
                 else:
-                    print("DEBUG: Pas de recette trouvée pour ces éléments")
+                    logger.debug("Pas de recette trouvée pour ces éléments")
             else:
-                print("DEBUG: Zone de résultat occupée, impossible de crafter")
+                logger.debug("Zone de résultat occupée, impossible de crafter")
         else:
-            print(f"DEBUG: Nombre d'éléments insuffisant pour crafting: {len(elements_on_craft)}")
+            logger.debug("Nombre d'éléments insuffisant pour crafting: %s", len(elements_on_craft))
 
         return False
 
     def update(self, dt):
         """Met à jour le processus de crafting"""
         if not self.craft_in_progress:
+            # Réexaminer la table seulement si elle a changé
+            if self.bench_changed():
+                self.check_for_crafting()
             return
 
         self.craft_timer += dt
-        print(f"DEBUG: Timer crafting: {self.craft_timer:.2f}/{self.craft_time_required}")
+        logger.debug("Timer crafting: %.2f/%s", self.craft_timer, self.craft_time_required)
 
         # Vérifier si le temps requis est écoulé
         if self.craft_timer >= self.craft_time_required:
@@ -165,76 +200,56 @@ class AutoCraftManager:
     def complete_crafting(self):
         """Termine le processus de crafting en créant le nouvel élément"""
         if self.matching_recipe is None or not self.elements_to_craft or len(self.elements_to_craft) != 2:
-            print("DEBUG: Impossible de compléter le crafting - données manquantes")
+            logger.debug("Impossible de compléter le crafting - données manquantes")
             self.game.animation_manager.remove_animation("element_crafting")
             return
 
-        # Supprimer les éléments utilisés
+        # Supprimer les éléments utilisés et libérer leurs zones de craft
+        occupancy = self.game.zone_occupancy
         for element in self.elements_to_craft:
-            self.game.elements.remove(element)
-            print(f"DEBUG: Élément {element.name} consommé dans le crafting")
+            self.craft_elements_group.remove(element)
+            zone = occupancy.remove(element)
+            logger.debug("Élément %s consommé dans le crafting (zone %s libérée)",
+                         element.name, zone.id if zone else None)
 
-        # Libérer les zones de craft
-        if hasattr(self, 'zones_with_elements'):
-            for zone in self.zones_with_elements:
-                zone.have_object = False
-                print(f"DEBUG: Zone {zone.id} libérée")
-
-        # Trouver les données de l'élément résultant
-        result_data = next(e for e in self.game.elements_data if e["id"] == self.matching_recipe['result'])
+        # Données de l'élément résultant, déjà résolues par l'index des recettes
+        result_data = self.matching_recipe["result_data"]
 
         # Créer le nouvel élément dans la zone de résultat si elle existe
         result_zone = None
-        if self.game.end_craft_zones:
-            # Vérifier chaque zone de résultat
-            for zone in self.game.end_craft_zones:
-                # Vérifier si la zone est réellement libre
-                objects = self.game.get_objects_on_zone(zone)
-                if not objects and not zone.have_object:
-                    result_zone = zone
-                    break
-                elif zone.have_object:
-                    # Si la zone est marquée comme occupée mais sans objet, corriger
-                    if not objects:
-                        zone.have_object = False
-                        result_zone = zone
-                        break
+        for zone in self.result_zones:
+            if not occupancy.is_occupied(zone):
+                result_zone = zone
+                break
 
         if result_zone:
             # Placer le résultat dans la zone prévue
             new_element = Element(result_zone.rect.centerx, result_zone.rect.centery, result_data)
-            result_zone.have_object = True  # Marquer explicitement la zone comme occupée
-            print(
-                f"DEBUG: Nouvel élément {self.matching_recipe['result_name']} créé dans la zone de résultat {result_zone.id}")
+            occupancy.place(new_element, result_zone)
+            logger.debug("Nouvel élément %s créé dans la zone de résultat %s", self.matching_recipe['result_name'], result_zone.id)
         else:
             # Fallback au centre des zones de craft si pas de zone de résultat
             new_element = Element(self.craft_center[0], self.craft_center[1], result_data)
-            print(f"DEBUG: Nouvel élément {self.matching_recipe['result_name']} créé au centre des zones de craft")
+            logger.debug("Nouvel élément %s créé au centre des zones de craft", self.matching_recipe['result_name'])
 
-        self.game.elements.add(new_element)
+        self.craft_elements_group.add(new_element)
+        self.game.events.publish(CRAFT_COMPLETED, recipe=self.matching_recipe, result=new_element)
 
         # Donner de l'XP au joueur
         self.game.player.gain_experience(5)
         self.game.ui.show_message(f"Élément {self.matching_recipe['result_name']} créé!", 3.0)
 
         # Réinitialiser
+        self.clear_craft_state()
+
+    def clear_craft_state(self):
+        """Oublie les données du craft en cours et retire son animation"""
         self.elements_to_craft = []
         self.craft_center = None
         self.matching_recipe = None
+        self.craft_elements_group = None
+        self.result_zones = []
         if hasattr(self, 'zones_with_elements'):
             delattr(self, 'zones_with_elements')
         self.game.animation_manager.remove_animation("element_crafting")
 
-
-def check_block_craft(posed_elements, recipes):
-    """
-    Vérifie si une combinaison d'éléments correspond à une recette
-    :param posed_elements : liste des éléments posés sur la table de craft
-    :param recipes : liste des recettes (chargées depuis recipes.json)
-    """
-    posed_ids = sorted([el.id for el in posed_elements])
-
-    for recipe in recipes:
-        if sorted(recipe["ingredients"]) == posed_ids:
-            return recipe  # On retourne toute la recette
-    return None
\ No newline at end of file
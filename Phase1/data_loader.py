@@ -1,11 +1,38 @@
+import hashlib
 import json
+import os
+import pickle
 
-def load_elements(path):
-    """Charge les éléments depuis un fichier JSON."""
-    with open(path, "r", encoding="utf-8") as file:
-        data = json.load(file)
+from log import get_logger
+
+logger = get_logger(__name__)
+
+# Fichiers sources des données de jeu, relatifs au dossier Data/
+DATA_FILES = {
+    "elements": "elements.json",
+    "recipes": "recipes.json",
+    "potions": "potion.json",
+    "stones": "enhancement_stones.json",
+    "waves": "waves.json",
+}
+
+# À incrémenter dès que le format des données compilées change
+CACHE_VERSION = 2
+CACHE_FILE_NAME = "game_data.pickle"
+
+# Courbes d'apparition acceptées dans waves.json (implémentées par Phase2.wave_scheduler)
+SPAWN_CURVE_NAMES = ("linear", "accelerate", "decelerate")
 
-    print("Données brutes chargées :", data)  # Vérification
+
+def _read_json(path):
+    """Lit un fichier JSON et retourne (données, empreinte sha1 du contenu)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return json.loads(raw.decode("utf-8")), hashlib.sha1(raw).hexdigest()
+
+
+def parse_elements(data):
+    """Valide et retourne la liste des éléments d'un document elements.json."""
     elements = data.get("blocks", [])  # On s'assure de récupérer une liste
 
     if not isinstance(elements, list):
@@ -13,30 +40,339 @@ def load_elements(path):
 
     return elements
 
-def load_recipes(path):
-    """Charge les recettes depuis un fichier JSON séparé."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def parse_recipes(data):
+    """Retourne la liste des recettes d'un document recipes.json."""
     return data["recipes"]
 
-def load_potions(path):
-    """Charge les données des potions depuis un fichier JSON."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
+def parse_potions(data):
+    """Valide et retourne la liste des potions d'un document potion.json."""
     potions = data["potions"]
     if not isinstance(potions, list):
         raise TypeError(f"Erreur : 'potions' doit être une liste, reçu {type(potions)} : {potions}")
     return potions
 
-def load_enhancement_stones(path):
-    """Charge les données des pierres d'amélioration depuis un fichier JSON."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
+def parse_enhancement_stones(data):
+    """Valide et retourne la liste des pierres d'un document enhancement_stones.json."""
     stones = data["stones"]
     if not isinstance(stones, list):
         raise TypeError(f"Erreur : 'stones' doit être une liste, reçu {type(stones)} : {stones}")
     return stones
 
+def parse_waves(data):
+    """Valide et retourne la description des vagues d'un document waves.json."""
+    enemy_types = data["enemy_types"]
+    if not isinstance(enemy_types, dict):
+        raise TypeError(f"Erreur : 'enemy_types' doit être un dictionnaire, reçu {type(enemy_types)} : {enemy_types}")
+    for type_name, enemy_type in enemy_types.items():
+        _check_keys(enemy_type, ("flying",), f"type d'ennemi {type_name}")
+        if enemy_type["flying"]:
+            altitude = enemy_type.get("altitude")
+            if not isinstance(altitude, list) or len(altitude) != 2 or altitude[0] > altitude[1]:
+                raise ValueError(f"Erreur : 'altitude' d'un ennemi volant doit être [min, max] "
+                                 f"(type d'ennemi {type_name}), reçu {altitude}")
+    waves = data.get("waves", [])
+    if not isinstance(waves, list):
+        raise TypeError(f"Erreur : 'waves' doit être une liste, reçu {type(waves)} : {waves}")
+
+    _check_keys(data["scaling"], ("difficulty_start", "difficulty_step", "health_base",
+                                  "health_per_difficulty", "speed_base", "speed_per_difficulty"), "scaling")
+
+    # Chaque type utilisé par un groupe ou un mélange doit être décrit
+    default_wave = data["default_wave"]
+    _check_keys(default_wave, ("count", "count_growth", "count_max", "interval", "interval_growth",
+                               "interval_min", "mix"), "default_wave")
+    _check_wave_group(default_wave, "default_wave")
+    mixes = [default_wave["mix"]]
+    for wave in waves:
+        _check_keys(wave, ("wave", "groups"), "vague")
+        if not isinstance(wave["groups"], list):
+            raise TypeError(f"Erreur : 'groups' doit être une liste (vague {wave['wave']}), reçu {wave['groups']}")
+        for group in wave["groups"]:
+            _check_keys(group, ("count",), f"vague {wave['wave']}")
+            _check_wave_group(group, f"vague {wave['wave']}")
+            if "type" in group:
+                mixes.append({group["type"]: 1})
+            if "mix" in group:
+                mixes.append(group["mix"])
+    for mix in mixes:
+        for type_name in mix:
+            if type_name not in enemy_types:
+                raise ValueError(f"Erreur : type d'ennemi inconnu dans waves.json : {type_name}")
+        if any(weight < 0 for weight in mix.values()) or sum(mix.values()) <= 0:
+            raise ValueError(f"Erreur : les poids d'un mélange doivent être positifs et de somme non nulle : {mix}")
+
+    return {
+        "enemy_types": enemy_types,
+        "scaling": data["scaling"],
+        "max_enemies": data.get("max_enemies", 10),
+        "default_wave": default_wave,
+        "waves": waves,
+    }
+
+def _check_keys(record, keys, where):
+    """Vérifie qu'un enregistrement de waves.json contient les clés requises."""
+    missing = [key for key in keys if key not in record]
+    if missing:
+        raise ValueError(f"Erreur : clé(s) manquante(s) dans waves.json ({where}) : {', '.join(missing)}")
+
+def _check_wave_group(group, where):
+    """Vérifie le nombre, la salve, l'intervalle et la courbe d'un groupe de waves.json."""
+    if group["count"] < 1:
+        raise ValueError(f"Erreur : 'count' doit être au moins 1 ({where}), reçu {group['count']}")
+    if group.get("burst", 1) < 1:
+        raise ValueError(f"Erreur : 'burst' doit être au moins 1 ({where}), reçu {group['burst']}")
+    if group.get("interval", 1.0) < 0:
+        raise ValueError(f"Erreur : 'interval' ne peut pas être négatif ({where}), reçu {group['interval']}")
+    curve = group.get("curve", "linear")
+    if curve not in SPAWN_CURVE_NAMES:
+        raise ValueError(f"Erreur : courbe d'apparition inconnue ({where}) : {curve}, attendu {list(SPAWN_CURVE_NAMES)}")
+
+def load_elements(path):
+    """Charge les éléments depuis un fichier JSON."""
+    return parse_elements(_read_json(path)[0])
+
+def load_recipes(path):
+    """Charge les recettes depuis un fichier JSON séparé."""
+    return parse_recipes(_read_json(path)[0])
+
+def load_potions(path):
+    """Charge les données des potions depuis un fichier JSON."""
+    return parse_potions(_read_json(path)[0])
+
+def load_enhancement_stones(path):
+    """Charge les données des pierres d'amélioration depuis un fichier JSON."""
+    return parse_enhancement_stones(_read_json(path)[0])
+
+def load_waves(path):
+    """Charge la description des vagues depuis un fichier JSON."""
+    return parse_waves(_read_json(path)[0])
+
+
+
+
+class Catalog:
+    """
+    Catalogue d'enregistrements (éléments, potions ou pierres) avec des index par id et par nom.
+    Les enregistrements qui ont des ingrédients sont aussi indexés par ingrédient (index inverse).
+    """
+
+    def __init__(self, records):
+        """
+        :param records: liste de dictionnaires chargés depuis un fichier JSON
+        """
+        self.records = list(records)
+        self.by_id = {}
+        self.by_name = {}
+        self.by_ingredient = {}  # nom d'ingrédient -> enregistrements qui l'utilisent
+
+        for record in self.records:
+            # En cas de doublon, le premier enregistrement du fichier l'emporte
+            self.by_id.setdefault(record["id"], record)
+            self.by_name.setdefault(record["name"], record)
+
+            for ingredient in record.get("ingredients") or []:
+                users = self.by_ingredient.setdefault(ingredient, [])
+                if not users or users[-1] is not record:
+                    users.append(record)
+
+    def get(self, record_id):
+        """Retourne l'enregistrement ayant cet id, ou None"""
+        return self.by_id.get(record_id)
+
+    def get_by_name(self, name):
+        """Retourne l'enregistrement ayant ce nom, ou None"""
+        return self.by_name.get(name)
+
+    def find_by_ingredient(self, ingredient):
+        """Retourne le premier enregistrement (dans l'ordre du fichier) qui utilise cet ingrédient, ou None"""
+        users = self.by_ingredient.get(ingredient)
+        return users[0] if users else None
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+
+class RecipeIndex:
+    """
+    Index des recettes construit une seule fois au chargement.
+    Les recettes sont indexées par le multiensemble de leurs ingrédients (ids triés),
+    ce qui rend la recherche d'une recette en O(1) quel que soit le nombre de recettes.
+    """
+
+    def __init__(self, recipes, elements):
+        """
+        :param recipes: liste des recettes (chargées depuis recipes.json)
+        :param elements: catalogue des éléments (Catalog construit depuis elements.json)
+        """
+
+        self.recipes = []
+        self.by_ingredients = {}  # clé canonique -> recette
+        self.by_ingredient = {}  # id d'ingrédient -> recettes qui l'utilisent
+        self.by_result = {}  # id du résultat -> recettes qui le produisent
+
+        for recipe in recipes:
+            result_data = elements.get(recipe["result"])
+            if result_data is None:
+                raise ValueError(f"Erreur : la recette {recipe.get('result_name')} produit un élément inconnu "
+                                 f"(id {recipe['result']})")
+
+            # Copie de la recette avec le résultat déjà résolu
+            entry = dict(recipe)
+            entry["result_data"] = result_data
+            self.recipes.append(entry)
+
+            # Comme le parcours linéaire, la première recette rencontrée l'emporte
+            self.by_ingredients.setdefault(self.make_key(recipe["ingredients"]), entry)
+
+            for ingredient_id in set(recipe["ingredients"]):
+                self.by_ingredient.setdefault(ingredient_id, []).append(entry)
+            self.by_result.setdefault(recipe["result"], []).append(entry)
+
+    @staticmethod
+    def make_key(ingredient_ids):
+        """Retourne la clé canonique (multiensemble trié) d'une liste d'ids d'ingrédients"""
+        return tuple(sorted(ingredient_ids))
+
+    def find(self, ingredient_ids):
+        """
+        Cherche la recette correspondant exactement aux ingrédients donnés
+        :param ingredient_ids: ids des éléments posés (ordre quelconque)
+        :return: la recette (avec 'result_data') ou None
+        """
+        return self.by_ingredients.get(self.make_key(ingredient_ids))
+
+    def recipes_using(self, element_id):
+        """Retourne les recettes qui utilisent l'élément donné comme ingrédient"""
+        return self.by_ingredient.get(element_id, [])
+
+    def recipes_producing(self, element_id):
+        """Retourne les recettes qui produisent l'élément donné"""
+        return self.by_result.get(element_id, [])
+
+    def __len__(self):
+        return len(self.recipes)
+
+
+class GameData:
+    """Ensemble des données de jeu validées et indexées, tel que stocké dans le cache compilé"""
+
+    def __init__(self, elements, recipes, potions, stones, waves, source_hashes=None):
+        """
+        :param elements, recipes, potions, stones: listes validées issues des fichiers JSON
+        :param waves: description validée des vagues de la phase de défense (waves.json)
+        :param source_hashes: empreintes sha1 des fichiers sources, par clé de DATA_FILES
+        """
+        self.element_catalog = Catalog(elements)
+        self.potion_catalog = Catalog(potions)
+        self.stone_catalog = Catalog(stones)
+        self.recipe_index = RecipeIndex(recipes, self.element_catalog)
+        self.waves = waves
+        self.source_hashes = dict(source_hashes or {})
+
+
+def _source_paths(data_dir):
+    return {key: os.path.join(data_dir, name) for key, name in DATA_FILES.items()}
+
+
+def _source_stamps(paths):
+    """Retourne (mtime, taille) de chaque fichier source, pour une vérification rapide du cache"""
+    stamps = {}
+    for key, path in paths.items():
+        stat = os.stat(path)
+        stamps[key] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def _source_hashes(paths):
+    hashes = {}
+    for key, path in paths.items():
+        with open(path, "rb") as f:
+            hashes[key] = hashlib.sha1(f.read()).hexdigest()
+    return hashes
+
+
+def _read_cache(cache_path):
+    """Lit le cache compilé, ou retourne None s'il est absent, illisible ou d'une autre version"""
+    try:
+        with open(cache_path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, TypeError,
+            ValueError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return None
+    return payload
+
+
+def _write_cache(cache_path, payload):
+    """Écrit le cache de façon atomique ; un échec d'écriture n'empêche pas le jeu de démarrer"""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Impossible d'écrire le cache de données %s : %s", cache_path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def compile_game_data(data_dir="Data"):
+    """Charge, valide et indexe toutes les données de jeu depuis les fichiers JSON"""
+    paths = _source_paths(data_dir)
+    documents = {}
+    hashes = {}
+    for key, path in paths.items():
+        documents[key], hashes[key] = _read_json(path)
+
+    return GameData(parse_elements(documents["elements"]),
+                    parse_recipes(documents["recipes"]),
+                    parse_potions(documents["potions"]),
+                    parse_enhancement_stones(documents["stones"]),
+                    parse_waves(documents["waves"]),
+                    hashes)
+
+
+def load_game_data(data_dir="Data", cache_dir=".cache"):
+    """
+    Charge les données de jeu en passant par un cache binaire compilé.
+    Le cache est relu d'un seul bloc si aucun fichier source n'a changé ; il est reconstruit
+    automatiquement dès que le contenu d'un fichier JSON change.
+    :param data_dir: dossier contenant les fichiers JSON
+    :param cache_dir: dossier du cache compilé (None pour désactiver le cache)
+    :return: une instance de GameData
+    """
+    if cache_dir is None:
+        return compile_game_data(data_dir)
+
+    paths = _source_paths(data_dir)
+    cache_path = os.path.join(cache_dir, CACHE_FILE_NAME)
+    stamps = _source_stamps(paths)
+
+    payload = _read_cache(cache_path)
+    if payload is not None and payload.get("data_dir") == os.path.abspath(data_dir):
+        # Vérification rapide : aucune date de modification n'a bougé
+        if payload["stamps"] == stamps:
+            return payload["data"]
+
+        # Les dates ont changé : on compare le contenu avant de tout reconstruire
+        if payload["data"].source_hashes == _source_hashes(paths):
+            payload["stamps"] = stamps
+            _write_cache(cache_path, payload)
+            return payload["data"]
 
+    data = compile_game_data(data_dir)
+    _write_cache(cache_path, {
+        "version": CACHE_VERSION,
+        "data_dir": os.path.abspath(data_dir),
+        "stamps": stamps,
+        "data": data,
+    })
+    return data
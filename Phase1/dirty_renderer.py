@@ -0,0 +1,230 @@
+from collections import Counter
+
+import pygame
+
+from render_target import present
+from profiler import profiler
+
+
+class DirtyRenderer:
+    """
+    Rendu de la phase 1 par rectangles modifiés.
+    Chaque image, le jeu décrit ce qu'il faut afficher (fond de carte, sprites,
+    calques animés, éléments d'interface) ; le renderer compare avec l'image
+    précédente et ne redessine que les zones qui ont changé, à partir d'un fond
+    de carte mis en cache, avant de les présenter avec render_target.present(rects).
+    """
+
+    # Au-delà de cette proportion de l'écran à redessiner, on redessine tout
+    FULL_REDRAW_RATIO = 0.5
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+
+        # Fond de carte en cache (carte + décalage de la vue)
+        self.background = None
+        self.background_key = None
+
+        # Description de l'image en cours
+        self.sprites = []  # Liste de (image, rect)
+        self.layers = []  # Liste de (fonction de dessin, rects) redessinés à chaque image
+        self.overlays = []  # Liste de (clé, signature, fonction de dessin)
+
+        # État de l'image précédente
+        self.previous_sprites = []
+        self.previous_layer_rects = []
+        self.previous_overlays = {}  # clé -> (signature, rects)
+        self.profiler_rect = None  # Panneau du profileur dessiné par present() sur l'image précédente
+
+        self.needs_full_redraw = True
+        self.full_frame = True
+        self.dirty_rects = []
+
+        # Statistiques
+        self.frames = 0
+        self.full_redraws = 0
+        self.dirty_area = 0
+
+    def invalidate(self):
+        """Force un rendu complet à la prochaine image (l'écran a été modifié ailleurs)"""
+        self.needs_full_redraw = True
+
+    def begin_frame(self, background_key, draw_background):
+        """
+        Commence la description d'une nouvelle image
+        :param background_key: identifiant du fond (ex: nom de la carte et position de la vue)
+        :param draw_background: fonction dessinant le fond sur la surface passée en paramètre
+        """
+        if self.background is None or background_key != self.background_key:
+            if self.background is None:
+                self.background = pygame.Surface(self.screen_rect.size).convert()
+            draw_background(self.background)
+            self.background_key = background_key
+            self.needs_full_redraw = True
+
+        self.sprites = []
+        self.layers = []
+        self.overlays = []
+
+    def add_sprite(self, image, rect):
+        """Ajoute une image statique à la position donnée"""
+        self.sprites.append((image, pygame.Rect(rect)))
+
+    def add_layer(self, draw_fn, rects):
+        """
+        Ajoute un calque animé, redessiné à chaque image
+        :param draw_fn: fonction dessinant le calque sur la surface passée en paramètre
+        :param rects: zones couvertes par le calque
+        """
+        self.layers.append((draw_fn, [pygame.Rect(rect) for rect in rects]))
+
+    def add_overlay(self, key, signature, draw_fn):
+        """
+        Ajoute un élément d'interface dessiné par-dessus le reste
+        :param key: identifiant de l'élément
+        :param signature: valeur qui change quand l'élément doit être redessiné
+        :param draw_fn: fonction dessinant l'élément, retournant le(s) rect(s) dessiné(s)
+        """
+        self.overlays.append((key, signature, draw_fn))
+
+    def render(self, full=False):
+        """
+        Dessine l'image décrite sur l'écran
+        :param full: True pour tout redessiner (écrans superposés, débogage...)
+        """
+        self.frames += 1
+        full = full or self.needs_full_redraw
+
+        if not full:
+            dirty, redraw_keys = self._compute_dirty()
+            area = sum(rect.width * rect.height for rect in dirty)
+            if area > self.FULL_REDRAW_RATIO * self.screen_rect.width * self.screen_rect.height:
+                full = True
+
+        if full:
+            self.screen.blit(self.background, (0, 0))
+            self._draw_scene()
+            redraw_keys = {key for key, _, _ in self.overlays}
+            dirty = [self.screen_rect.copy()]
+            self.full_redraws += 1
+        else:
+            for rect in dirty:
+                self.screen.set_clip(rect)
+                self.screen.blit(self.background, rect, rect)
+                self._draw_scene(rect)
+            self.screen.set_clip(None)
+            self.dirty_area += area
+
+        # Éléments d'interface : seuls ceux qui ont changé ou qui ont été effacés sont redessinés
+        overlays = {}
+        for key, signature, draw_fn in self.overlays:
+            if key in redraw_keys:
+                rects = self._as_rects(draw_fn(self.screen))
+                dirty.extend(rects)
+            else:
+                rects = self.previous_overlays[key][1]
+            overlays[key] = (signature, rects)
+
+        self.previous_sprites = self.sprites
+        self.previous_layer_rects = [rect for _, rects in self.layers for rect in rects]
+        self.previous_overlays = overlays
+        self.needs_full_redraw = False
+        self.profiler_rect = None
+        self.full_frame = full
+        self.dirty_rects = dirty
+
+    def present(self):
+        """Affiche à l'écran les zones redessinées par render()"""
+        if self.full_frame:
+            self.profiler_rect = present()
+        elif self.dirty_rects or profiler.enabled:
+            # Le profileur est redessiné à chaque image, même sans autre changement
+            self.profiler_rect = present(self.dirty_rects)
+
+    def _draw_scene(self, clip=None):
+        """Dessine les sprites et calques (éventuellement limités à une zone)"""
+        for image, rect in self.sprites:
+            if clip is None or clip.colliderect(rect):
+                self.screen.blit(image, rect)
+
+        for draw_fn, rects in self.layers:
+            if clip is None or clip.collidelist(rects) != -1:
+                draw_fn(self.screen)
+
+    def _compute_dirty(self):
+        """
+        Détermine les zones à redessiner par rapport à l'image précédente
+        :return: (liste de rects fusionnés, clés des éléments d'interface à redessiner)
+        """
+        dirty = []
+
+        # Sprites apparus, disparus ou déplacés
+        current = Counter((id(image), tuple(rect)) for image, rect in self.sprites)
+        previous = Counter((id(image), tuple(rect)) for image, rect in self.previous_sprites)
+        for _, rect in (current - previous) + (previous - current):
+            dirty.append(pygame.Rect(rect))
+
+        # Calques animés : ancienne et nouvelle position
+        dirty.extend(self.previous_layer_rects)
+        for _, rects in self.layers:
+            dirty.extend(rects)
+
+        # Panneau translucide du profileur : sa zone est restaurée avant qu'il soit redessiné
+        if self.profiler_rect is not None:
+            dirty.append(pygame.Rect(self.profiler_rect))
+
+        # Éléments d'interface disparus ou modifiés
+        current_keys = {key for key, _, _ in self.overlays}
+        for key, (signature, rects) in self.previous_overlays.items():
+            if key not in current_keys:
+                dirty.extend(rects)
+
+        redraw_keys = set()
+        for key, signature, _ in self.overlays:
+            previous_overlay = self.previous_overlays.get(key)
+            if previous_overlay is None or previous_overlay[0] != signature:
+                redraw_keys.add(key)
+                if previous_overlay is not None:
+                    dirty.extend(previous_overlay[1])
+
+        # Un élément d'interface dont la zone est effacée doit être redessiné en entier
+        # (et sa zone entière effacée, pour ne pas superposer deux fois la transparence)
+        changed = True
+        while changed:
+            changed = False
+            for key, _, _ in self.overlays:
+                if key in redraw_keys or key not in self.previous_overlays:
+                    continue
+                rects = self.previous_overlays[key][1]
+                if any(rect.collidelist(dirty) != -1 for rect in rects):
+                    redraw_keys.add(key)
+                    dirty.extend(rects)
+                    changed = True
+
+        return self._merge(dirty), redraw_keys
+
+    def _merge(self, rects):
+        """Limite les rects à l'écran et fusionne ceux qui se chevauchent"""
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+
+            # Absorber tous les rects déjà retenus qui touchent le nouveau
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    @staticmethod
+    def _as_rects(result):
+        """Normalise le retour d'une fonction de dessin en liste de rects"""
+        if result is None:
+            return []
+        if isinstance(result, pygame.Rect):
+            return [result]
+        return [pygame.Rect(rect) for rect in result]
@@ -1,4 +1,7 @@
 from Phase1.elements import Element
+from log import get_logger
+
+logger = get_logger(__name__)
 
 
 class ElementFactory:
@@ -15,14 +18,10 @@ class ElementFactory:
         :return: L'élément créé ou None si la création a échoué
         """
         # Trouver la donnée de l'élément correspondant au nom de la zone
-        element_data = None
-        for data in game.elements_data:
-            if data["name"] == zone_name:
-                element_data = data
-                break
+        element_data = game.element_catalog.get_by_name(zone_name)
 
         if element_data is None:
-            print(f"DEBUG: Aucune donnée trouvée pour l'élément {zone_name}")
+            logger.debug("Aucune donnée trouvée pour l'élément %s", zone_name)
             return None
 
         # Créer l'élément
@@ -34,7 +33,7 @@ class ElementFactory:
                 break
 
         if creation_zone is None:
-            print(f"DEBUG: Aucune zone trouvée pour créer l'élément {zone_name}")
+            logger.debug("Aucune zone trouvée pour créer l'élément %s", zone_name)
             return None
 
         # Créer l'élément directement à la position du joueur pour faciliter la récupération
@@ -42,5 +41,5 @@ class ElementFactory:
         new_element.held_by_player = True  # Marquer comme étant déjà tenu par le joueur
         game.elements.add(new_element)
 
-        print(f"DEBUG: Élément {zone_name} créé et assigné au joueur")
+        logger.debug("Élément %s créé et assigné au joueur", zone_name)
         return new_element
\ No newline at end of file
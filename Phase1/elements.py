@@ -1,5 +1,10 @@
 import pygame
 import os
+from texture_atlas import load_item_texture
+from log import get_logger
+
+logger = get_logger(__name__)
+
 class Element(pygame.sprite.Sprite):
     def __init__(self, x, y, element_data):
         """
@@ -23,9 +28,9 @@ class Element(pygame.sprite.Sprite):
 
         # Chargement de l'image
         chemin_image = os.path.join(os.path.dirname(os.path.abspath(os.path.dirname(os.path.dirname(__file__)))), "Pixel-Alchemist", "Assets", "Art", "Items", "Elements", self.texture)
-        self.image = pygame.image.load(chemin_image).convert_alpha()
+        self.image = load_item_texture("Elements", self.texture, chemin_image)
         self.rect = self.image.get_rect(topleft=(x, y))
-        print("Image chargée :", self.image.get_size())  # Vérifie la taille de l'image
+        logger.debug("Image chargée : %s", self.image.get_size())  # Vérifie la taille de l'image
 
         self.held_by_player = False
 
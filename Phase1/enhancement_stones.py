@@ -1,5 +1,6 @@
 import pygame
 import os
+from texture_atlas import load_item_texture
 
 
 class EnhancementStone(pygame.sprite.Sprite):
@@ -21,7 +22,7 @@ class EnhancementStone(pygame.sprite.Sprite):
 
         # Essaye de charger l'image spécifique, sinon charge une image par défaut
         try:
-            self.image = pygame.image.load(chemin_image).convert_alpha()
+            self.image = load_item_texture("Stones", image_name, chemin_image)
         except FileNotFoundError:
             # Crée une image de remplacement si l'image n'existe pas
             self.image = pygame.Surface((20, 20))
@@ -1,20 +1,175 @@
 from Phase1.elements import *
+from event_bus import ZONE_OBJECT_PLACED, ZONE_OBJECT_REMOVED
+from log import get_logger
+
+logger = get_logger(__name__)
+
+# Taille (en pixels) d'une zone et d'une case de la grille des zones
+ZONE_SIZE = 32
+
+
+class ZoneOccupancy:
+    """
+    Index des objets posés sur les zones (zone -> objet et objet -> zone).
+    C'est la seule source de vérité sur l'occupation des zones : il est mis à jour
+    quand le joueur pose ou ramasse un objet et quand un craft consomme ses
+    ingrédients ou produit son résultat, jamais en comparant des rectangles.
+    Chaque changement est publié sur le bus d'événements (ZONE_OBJECT_PLACED,
+    ZONE_OBJECT_REMOVED) pour que les systèmes concernés (crafting) réagissent.
+    """
+
+    def __init__(self, events=None):
+        """
+        :param events: bus d'événements sur lequel publier les changements (optionnel)
+        """
+        self.events = events
+        self.object_by_zone = {}  # zone -> objet posé
+        self.zone_by_object = {}  # objet posé -> zone
+
+    def place(self, obj, zone):
+        """
+        Pose un objet sur une zone
+        :return: True si réussi, False si la zone est déjà occupée
+        """
+        if zone in self.object_by_zone:
+            return False
+
+        # Un objet ne peut être posé que sur une seule zone
+        self.remove(obj)
+
+        self.object_by_zone[zone] = obj
+        self.zone_by_object[obj] = zone
+        if self.events is not None:
+            self.events.publish(ZONE_OBJECT_PLACED, zone=zone, obj=obj)
+        return True
+
+    def remove(self, obj):
+        """
+        Retire un objet de sa zone (ramassé ou consommé)
+        :return: la zone libérée, ou None si l'objet n'était sur aucune zone
+        """
+        zone = self.zone_by_object.pop(obj, None)
+        if zone is not None:
+            del self.object_by_zone[zone]
+            if self.events is not None:
+                self.events.publish(ZONE_OBJECT_REMOVED, zone=zone, obj=obj)
+        return zone
+
+    def clear_zone(self, zone):
+        """
+        Libère une zone
+        :return: l'objet qui y était posé, ou None
+        """
+        obj = self.object_by_zone.pop(zone, None)
+        if obj is not None:
+            del self.zone_by_object[obj]
+            if self.events is not None:
+                self.events.publish(ZONE_OBJECT_REMOVED, zone=zone, obj=obj)
+        return obj
+
+    def get(self, zone):
+        """Retourne l'objet posé sur la zone, ou None"""
+        return self.object_by_zone.get(zone)
+
+    def zone_of(self, obj):
+        """Retourne la zone sur laquelle l'objet est posé, ou None"""
+        return self.zone_by_object.get(obj)
+
+    def is_occupied(self, zone):
+        return zone in self.object_by_zone
+
+    def clear(self):
+        """Vide l'index (nouvelle partie, sans publier d'événement)"""
+        self.object_by_zone.clear()
+        self.zone_by_object.clear()
+
+    def __len__(self):
+        return len(self.object_by_zone)
 
 
 class Zone(pygame.sprite.Sprite):
     def __init__(self, x, y, id, type):
         super().__init__()
-        self.rect = pygame.Rect(x, y, 32, 32)
+        self.rect = pygame.Rect(x, y, ZONE_SIZE, ZONE_SIZE)
         self.id = id
         self.type = type
-        self.have_object = False
         # Ajout d'une référence au jeu, initialisée à None
         self.game = None
 
+    @property
+    def have_object(self):
+        """True si un objet est posé sur la zone (lu dans l'index d'occupation du jeu)"""
+        return self.game is not None and self.game.zone_occupancy.is_occupied(self)
 
-def get_front_tile(player, zones):
+
+class ZoneIndex:
+    """
+    Index des zones d'une carte, construit une fois au chargement :
+    - une grille de cases de ZONE_SIZE pixels donnant les zones qui recouvrent chaque case,
+      pour trouver la zone sous un point en un calcul et un accès au tableau
+    - des dictionnaires par identifiant et par type de zone
+    """
+
+    def __init__(self, zones, cell_size=ZONE_SIZE):
+        """
+        :param zones: zones de la carte, dans l'ordre de priorité de détection
+        :param cell_size: taille (en pixels) d'une case de la grille
+        """
+        self.zones = list(zones)
+        self.cell_size = cell_size
+
+        self.by_id = {}
+        self.by_type = {}
+        for zone in self.zones:
+            self.by_id.setdefault(zone.id, zone)
+            self.by_type.setdefault(zone.type, []).append(zone)
+
+        # Dimensions de la grille : juste assez pour couvrir toutes les zones
+        self.columns = max((zone.rect.right // cell_size + 1 for zone in self.zones), default=0)
+        self.rows = max((zone.rect.bottom // cell_size + 1 for zone in self.zones), default=0)
+        self.grid = [[() for _ in range(self.columns)] for _ in range(self.rows)]
+
+        # Une zone non alignée sur la grille est enregistrée dans toutes les cases qu'elle recouvre
+        for zone in self.zones:
+            rect = zone.rect
+            for row in range(max(0, rect.top // cell_size), (rect.bottom - 1) // cell_size + 1):
+                for column in range(max(0, rect.left // cell_size), (rect.right - 1) // cell_size + 1):
+                    self.grid[row][column] += (zone,)
+
+    def zone_at(self, position):
+        """
+        Retourne la zone qui contient le point donné
+        :return: la zone, ou None s'il n'y en a pas
+        """
+        column = int(position[0]) // self.cell_size
+        row = int(position[1]) // self.cell_size
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            return None
+
+        for zone in self.grid[row][column]:
+            if zone.rect.collidepoint(position):
+                return zone
+        return None
+
+    def get_by_id(self, zone_id, zone_type=None):
+        """
+        Retourne la zone d'identifiant donné
+        :param zone_type: type attendu (optionnel), None si la zone est d'un autre type
+        """
+        zone = self.by_id.get(zone_id)
+        if zone is not None and zone_type is not None and zone.type != zone_type:
+            return None
+        return zone
+
+    def get_by_type(self, zone_type):
+        """Retourne la liste des zones d'un type (vide s'il n'y en a pas)"""
+        return self.by_type.get(zone_type, [])
+
+
+def get_front_tile(player, zone_index):
     """
     Vérifie la présence d'une tuile devant le joueur
+    :param zone_index: index des zones de la carte active (ZoneIndex)
     :return: None s'il y en a pas ou la tuile si elle est présente
     """
     # Ajustement des distances pour mieux détecter les zones
@@ -33,52 +188,41 @@ def get_front_tile(player, zones):
         # Direction par défaut si non spécifiée
         front_tile_position = (player_position[0], player_position[1] + offset)
 
-    for zone in zones:
-        if zone.rect.collidepoint(front_tile_position):
-            print("La zone présente devant est ", zone.type, zone.id)
-            return zone
+    zone = zone_index.zone_at(front_tile_position)
+    if zone is not None:
+        logger.debug("La zone présente devant est %s %s", zone.type, zone.id)
+    return zone
 
-    return None
 
-
-def get_element_on_tile(zone, game_objects, potion_craft_state=None):
+def get_element_on_tile(zone, occupancy, potion_craft_state=None):
     """
     Permet de savoir quel objet est sur la zone demandée et gère les états si nécessaire
     :param zone: zone parmi les zones récupérées dans le fichier de la carte
-    :param game_objects: un dictionnaire avec les différents groupes d'objets {'elements': elements_group, 'potions': potions_group, 'stones': stones_group}
+    :param occupancy: index des objets posés sur les zones (ZoneOccupancy)
     :param potion_craft_state: état du crafting de potion (optionnel)
     :return: l'objet présent sur la zone ou None
     """
-    # Vérifier pour chaque type d'objet si l'un d'eux est sur la zone
-    for object_type, object_group in game_objects.items():
-        for obj in object_group:
-            if obj.held_by_player:
-                continue
-
-            # Amélioration de la détection de collision
-            overlap_rect = obj.rect.clip(zone.rect)
-            if overlap_rect.width > 0 and overlap_rect.height > 0:
-                # Si on a un état de crafting de potion et que c'est une zone de crafting
-                if potion_craft_state is not None and zone.type == "potioncraft_zone":
-                    zone_id = zone.id
-                    print(f"DEBUG: Récupération d'un objet ({object_type}) sur la zone {zone_id}")
-
-                    # Réinitialiser l'état correspondant en fonction du type d'objet et de la zone
-                    if zone_id == 35 and potion_craft_state["element"] == obj:
-                        print("DEBUG: Réinitialisation de l'élément principal")
-                        potion_craft_state["element"] = None
-                    elif zone_id == 33 and potion_craft_state["stone1"] == obj:
-                        print("DEBUG: Réinitialisation de la pierre 1")
-                        potion_craft_state["stone1"] = None
-                    elif zone_id == 34 and potion_craft_state["stone2"] == obj:
-                        print("DEBUG: Réinitialisation de la pierre 2")
-                        potion_craft_state["stone2"] = None
-
-                # Indiquer que la zone n'a plus d'objet
-                zone.have_object = False
-                return obj
-
-    return None
+    obj = occupancy.get(zone)
+    if obj is None:
+        return None
+
+    # Si on a un état de crafting de potion et que c'est une zone de crafting
+    if potion_craft_state is not None and zone.type == "potioncraft_zone":
+        zone_id = zone.id
+        logger.debug("Récupération d'un objet sur la zone %s", zone_id)
+
+        # Réinitialiser l'état correspondant en fonction de la zone
+        if zone_id == 35 and potion_craft_state["element"] == obj:
+            logger.debug("Réinitialisation de l'élément principal")
+            potion_craft_state["element"] = None
+        elif zone_id == 33 and potion_craft_state["stone1"] == obj:
+            logger.debug("Réinitialisation de la pierre 1")
+            potion_craft_state["stone1"] = None
+        elif zone_id == 34 and potion_craft_state["stone2"] == obj:
+            logger.debug("Réinitialisation de la pierre 2")
+            potion_craft_state["stone2"] = None
+
+    return obj
 
 
 def create_base_element(self, zone_name):
@@ -88,14 +232,10 @@ def create_base_element(self, zone_name):
     :return: L'élément créé ou None si la création a échoué
     """
     # Trouver la donnée de l'élément correspondant au nom de la zone
-    element_data = None
-    for data in self.elements_data:
-        if data["name"] == zone_name:
-            element_data = data
-            break
+    element_data = self.element_catalog.get_by_name(zone_name)
 
     if element_data is None:
-        print(f"DEBUG: Aucune donnée trouvée pour l'élément {zone_name}")
+        logger.debug("Aucune donnée trouvée pour l'élément %s", zone_name)
         return None
 
     # Créer l'élément
@@ -107,11 +247,11 @@ def create_base_element(self, zone_name):
             break
 
     if creation_zone is None:
-        print(f"DEBUG: Aucune zone trouvée pour créer l'élément {zone_name}")
+        logger.debug("Aucune zone trouvée pour créer l'élément %s", zone_name)
         return None
 
     # Créer l'élément au centre de la zone
     new_element = Element(creation_zone.rect.centerx, creation_zone.rect.centery, element_data)
     self.elements.add(new_element)
 
-    print(f"DEBUG: Élément {zone_name} créé")
\ No newline at end of file
+    logger.debug("Élément %s créé", zone_name)
\ No newline at end of file
@@ -1,4 +1,7 @@
 import pygame
+from log import get_logger
+
+logger = get_logger(__name__)
 
 
 class Player(pygame.sprite.Sprite):
@@ -27,6 +30,9 @@ class Player(pygame.sprite.Sprite):
         self.inventory_size = 5  # Taille maximale de l'inventaire
         self.potion_count = 0  # Nombre de potions créées (pour le score)
 
+        # Index des objets posés sur les zones (ZoneOccupancy), fourni par le jeu
+        self.zone_occupancy = None
+
         # Statistiques du joueur
         self.level = 1
         self.experience = 0
@@ -66,13 +72,17 @@ class Player(pygame.sprite.Sprite):
         :return: Modification dynamique
         """
         if self.held_item is not None:
-            print(f"Tu tiens déjà l'objet suivant : {self.held_item}")
+            logger.info("Tu tiens déjà l'objet suivant : %s", self.held_item)
             return False
 
-        print(f"Objet récupéré: {item}")
+        logger.info("Objet récupéré: %s", item)
         self.held_item = item
         item.held_by_player = True
 
+        # L'objet quitte la zone sur laquelle il était posé
+        if self.zone_occupancy is not None:
+            self.zone_occupancy.remove(item)
+
         # Mettre à jour immédiatement la position de l'objet
         # pour qu'il apparaisse au bon endroit dès la prise
         offset_x, offset_y = 0, 0
@@ -99,36 +109,22 @@ class Player(pygame.sprite.Sprite):
         if self.held_item:
             # Vérifier si la zone est déjà occupée
             if zone.have_object:
-                print("Cette zone contient déjà un objet")
+                logger.info("Cette zone contient déjà un objet")
                 return False
 
-            # Vérifier si l'objet est déjà sur une autre case
-            if hasattr(zone, 'game') and zone.game is not None:
-                for existing_zone in zone.game.zones:
-                    if existing_zone != zone and existing_zone.have_object:
-                        # Vérifier si l'élément tenu par le joueur est sur cette zone
-                        element_groups = [zone.game.elements]
-                        for group in element_groups:
-                            for element in group:
-                                if not element.held_by_player and existing_zone.rect.colliderect(
-                                        element.rect) and element == self.held_item:
-                                    # L'élément est déjà sur une autre zone, refuser le dépôt
-                                    print("Cet objet est déjà posé ailleurs")
-                                    return False
+            # Marquer la zone comme occupée (l'objet reste en main si la pose échoue)
+            if self.zone_occupancy is not None and not self.zone_occupancy.place(self.held_item, zone):
+                logger.info("Cette zone contient déjà un objet")
+                return False
 
             self.held_item.held_by_player = False
 
             # Positionner l'objet au centre de la zone
             self.held_item.rect.center = zone.rect.center
-
-            item = self.held_item
             self.held_item = None
-
-            # Marquer la zone comme occupée
-            zone.have_object = True
             return True
         else:
-            print("Aucun objet à déposer")
+            logger.info("Aucun objet à déposer")
             return False
 
     def gain_experience(self, amount):
@@ -156,7 +152,7 @@ class Player(pygame.sprite.Sprite):
         self.speed += 0.2  # Légère augmentation de la vitesse
         self.inventory_size += 1  # Une place d'inventaire supplémentaire
 
-        print(f"Niveau supérieur ! Vous êtes maintenant niveau {self.level}")
+        logger.info("Niveau supérieur ! Vous êtes maintenant niveau %s", self.level)
 
     def craft_success(self, potion_type):
         """
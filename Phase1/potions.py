@@ -1,5 +1,6 @@
 import pygame
 import os
+from texture_atlas import load_item_texture
 
 
 class Potion(pygame.sprite.Sprite):
@@ -26,12 +27,12 @@ class Potion(pygame.sprite.Sprite):
 
         # Essaye de charger l'image spécifique, sinon charge une image par défaut
         try:
-            self.image = pygame.image.load(chemin_image).convert_alpha()
+            self.image = load_item_texture("Potions", texture_name, chemin_image)
         except FileNotFoundError:
             # Charge une image par défaut si l'image spécifique n'existe pas
             default_image = os.path.join(os.path.dirname(os.path.abspath(os.path.dirname(os.path.dirname(__file__)))),
                                          "Pixel-Alchemist", "Assets", "Art", "Items", "Potions", "default_potion.png")
-            self.image = pygame.image.load(default_image).convert_alpha()
+            self.image = load_item_texture("Potions", "default_potion.png", default_image)
 
         self.rect = self.image.get_rect(topleft=(x, y))
 
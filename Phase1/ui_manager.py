@@ -1,4 +1,6 @@
 import pygame
+from texture_atlas import get_scaled_icon
+from text_renderer import get_font, render_text
 
 
 class UIManager:
@@ -13,8 +15,8 @@ class UIManager:
 
         # Polices
         pygame.font.init()
-        self.font = pygame.font.SysFont('Arial', 16)
-        self.title_font = pygame.font.SysFont('Arial', 24, bold=True)
+        self.font = get_font('Arial', 16)
+        self.title_font = get_font('Arial', 24, bold=True)
 
         # Couleurs
         self.BLACK = (0, 0, 0)
@@ -60,18 +62,19 @@ class UIManager:
         :param screen: Surface d'affichage
         :param player: Objet joueur
         :param player_inventory: Liste des objets dans l'inventaire du joueur
+        :return: Rect de la zone dessinée
         """
         # Fond semi-transparent
         info_surface = pygame.Surface((200, 80), pygame.SRCALPHA)
         info_surface.fill((0, 0, 0, 128))
 
         # Titre
-        level_text = self.title_font.render(f"Niveau {player.level}", True, self.WHITE)
+        level_text = render_text(self.title_font, f"Niveau {player.level}", True, self.WHITE)
         info_surface.blit(level_text, (10, 10))
 
         # Expérience
         xp_required = 100 * player.level
-        xp_text = self.font.render(f"XP: {player.experience}/{xp_required}", True, self.WHITE)
+        xp_text = render_text(self.font, f"XP: {player.experience}/{xp_required}", True, self.WHITE)
         info_surface.blit(xp_text, (10, 40))
 
         # Barre d'XP
@@ -80,12 +83,14 @@ class UIManager:
         pygame.draw.rect(info_surface, self.LIGHT_BLUE, (10, 60, int(180 * xp_percentage), 10))
 
         # Affichage sur l'écran
-        screen.blit(info_surface, (10, 10))
+        info_rect = screen.blit(info_surface, (10, 10))
 
         # Afficher l'inventaire du joueur
         if player_inventory:
             self.draw_inventory(screen, player_inventory)
 
+        return info_rect
+
     def draw_inventory(self, screen, player_inventory):
         """
         Dessine l'inventaire du joueur
@@ -103,7 +108,7 @@ class UIManager:
         inventory_surface.fill((0, 0, 0, 160))
 
         # Titre
-        title_text = self.font.render("Inventaire:", True, self.WHITE)
+        title_text = render_text(self.font, "Inventaire:", True, self.WHITE)
         inventory_surface.blit(title_text, (10, 5))
 
         # Afficher les objets de l'inventaire
@@ -125,10 +130,8 @@ class UIManager:
             # Essayer d'afficher l'image de l'objet
             try:
                 if hasattr(item, 'image'):
-                    # Redimensionner l'image si nécessaire
-                    item_img = item.image
-                    if item_img.get_width() != item_size or item_img.get_height() != item_size:
-                        item_img = pygame.transform.scale(item_img, (item_size, item_size))
+                    # Redimensionner l'image si nécessaire (icône mise en cache)
+                    item_img = get_scaled_icon(item.image, (item_size, item_size))
                     inventory_surface.blit(item_img, (item_x, item_y))
             except (AttributeError, pygame.error):
                 # Fallback si pas d'image : dessiner un rectangle coloré
@@ -146,7 +149,7 @@ class UIManager:
                                  (item_x + 4, item_y + 4, item_size - 8, item_size - 8))
 
         # Afficher le nombre total d'objets dans l'inventaire
-        count_text = self.font.render(f"{len(player_inventory)}", True, self.WHITE)
+        count_text = render_text(self.font, f"{len(player_inventory)}", True, self.WHITE)
         inventory_surface.blit(count_text, (panel_width - 30, 5))
 
         # Afficher sur l'écran
@@ -178,18 +181,18 @@ class UIManager:
         info_surface.fill((0, 0, 0, 160))
 
         # Nom de la potion
-        name_text = self.font.render(potion.name, True, self.WHITE)
+        name_text = render_text(self.font, potion.name, True, self.WHITE)
         info_surface.blit(name_text, (10, 10))
 
         # Effet
-        effect_text = self.font.render(potion.effect, True, self.LIGHT_BLUE)
+        effect_text = render_text(self.font, potion.effect, True, self.LIGHT_BLUE)
         info_surface.blit(effect_text, (10, 35))
 
         # Puissance et durée
-        power_text = self.font.render(f"Puissance: {potion.power}", True, self.WHITE)
+        power_text = render_text(self.font, f"Puissance: {potion.power}", True, self.WHITE)
         info_surface.blit(power_text, (10, 55))
 
-        duration_text = self.font.render(f"Durée: {potion.duration}", True, self.WHITE)
+        duration_text = render_text(self.font, f"Durée: {potion.duration}", True, self.WHITE)
         info_surface.blit(duration_text, (10, 75))
 
         # Affichage sur l'écran, en s'assurant qu'il reste visible
@@ -197,12 +200,12 @@ class UIManager:
         y = min(y, screen.get_height() - info_height)
         screen.blit(info_surface, (x, y))
 
-    def draw_tooltip(self, screen, mouse_pos, elements, potions, stones):
+    def get_tooltip_text(self, mouse_pos, elements, potions, stones):
         """
-        Affiche une infobulle quand le curseur est sur un objet
-        :param screen: Surface d'affichage
+        Retourne le texte de l'infobulle de l'objet sous le curseur
         :param mouse_pos: Position de la souris
         :param elements, potions, stones: Groupes d'objets à vérifier
+        :return: le texte, ou None si le curseur n'est sur aucun objet
         """
         # Vérifier si la souris est sur un objet
         tooltip_text = None
@@ -234,10 +237,31 @@ class UIManager:
                         tooltip_text = "Pierre de Durée"
                     break
 
+        return tooltip_text
+
+    def draw_tooltip(self, screen, mouse_pos, elements, potions, stones):
+        """
+        Affiche une infobulle quand le curseur est sur un objet
+        :param screen: Surface d'affichage
+        :param mouse_pos: Position de la souris
+        :param elements, potions, stones: Groupes d'objets à vérifier
+        :return: Rect de la bulle dessinée, ou None
+        """
+        tooltip_text = self.get_tooltip_text(mouse_pos, elements, potions, stones)
+        return self.draw_tooltip_text(screen, mouse_pos, tooltip_text)
+
+    def draw_tooltip_text(self, screen, mouse_pos, tooltip_text):
+        """
+        Affiche une infobulle près du curseur
+        :param screen: Surface d'affichage
+        :param mouse_pos: Position de la souris
+        :param tooltip_text: Texte de la bulle (rien n'est affiché si None)
+        :return: Rect de la bulle dessinée, ou None
+        """
         # Si on a un texte, afficher la bulle
         if tooltip_text:
             font = self.font
-            text_surface = font.render(tooltip_text, True, self.BLACK)
+            text_surface = render_text(font, tooltip_text, True, self.BLACK)
             width = text_surface.get_width() + 10
             height = text_surface.get_height() + 10
 
@@ -257,15 +281,26 @@ class UIManager:
             if y + height > screen.get_height():
                 y = screen.get_height() - height
 
-            screen.blit(tooltip, (x, y))
+            return screen.blit(tooltip, (x, y))
+
+        return None
+
+    def get_messages_signature(self):
+        """
+        Retourne une valeur qui change dès que l'affichage des messages temporaires change
+        (texte ou opacité), pour savoir s'il faut les redessiner
+        """
+        return tuple((message, min(255, int(255 * (timer / 1.0)))) for message, timer in self.temp_messages)
 
     def draw_temp_messages(self, screen):
         """
         Affiche les messages temporaires
         :param screen: Surface d'affichage
+        :return: Liste des rects dessinés
         """
+        rects = []
         if not self.temp_messages:
-            return
+            return rects
 
         # Position de départ
         y = screen.get_height() - 100
@@ -274,7 +309,7 @@ class UIManager:
             # Calculer l'opacité basée sur le temps restant
             alpha = min(255, int(255 * (timer / 1.0)))
 
-            text_surface = self.font.render(message, True, self.WHITE)
+            text_surface = render_text(self.font, message, True, self.WHITE)
             text_width = text_surface.get_width() + 20
 
             back_surface = pygame.Surface((text_width, 30), pygame.SRCALPHA)
@@ -283,6 +318,8 @@ class UIManager:
             back_surface.blit(text_surface, (10, 5))
 
             x = (screen.get_width() - text_width) // 2
-            screen.blit(back_surface, (x, y))
+            rects.append(screen.blit(back_surface, (x, y)))
+
+            y -= 35  # Espacement vertical entre les messages
 
-            y -= 35  # Espacement vertical entre les messages
\ No newline at end of file
+        return rects
\ No newline at end of file
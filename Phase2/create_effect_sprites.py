@@ -1,7 +1,12 @@
 import pygame
 import os
 import math
-import random
+
+from rng import EFFECT_FRAMES_STREAM, get_stream
+
+
+# Flux des images générées : avec RNG_SEED fixé, les sprites sont identiques d'une génération à l'autre
+rng = get_stream(EFFECT_FRAMES_STREAM)
 
 
 def ensure_dirs():
@@ -28,12 +33,12 @@ def create_explosion_frames():
 
         # Éclats qui s'éloignent du centre
         for _ in range(5 + i * 3):
-            angle = random.uniform(0, 2 * math.pi)
+            angle = rng.uniform(0, 2 * math.pi)
             dist = (0.5 + i * 0.1) * (size // 2) * scale
             px = int(size // 2 + math.cos(angle) * dist)
             py = int(size // 2 + math.sin(angle) * dist)
-            p_size = random.randint(3, 8)
-            p_alpha = random.randint(100, 230)
+            p_size = rng.randint(3, 8)
+            p_alpha = rng.randint(100, 230)
             pygame.draw.circle(surf, (*color, p_alpha), (px, py), p_size)
 
         frames.append(surf)
@@ -59,9 +64,9 @@ def create_smoke_frames():
 
         # Nuage de base qui monte et s'étend
         for _ in range(8 + i):
-            cloud_x = size // 2 + random.uniform(-20 * expand, 20 * expand)
-            cloud_y = size - 20 - rising + random.uniform(-10, 10)
-            cloud_size = (10 + i * 2) * random.uniform(0.7, 1.3)
+            cloud_x = size // 2 + rng.uniform(-20 * expand, 20 * expand)
+            cloud_y = size - 20 - rising + rng.uniform(-10, 10)
+            cloud_size = (10 + i * 2) * rng.uniform(0.7, 1.3)
             alpha = 200 - i * 15
 
             pygame.draw.circle(surf, (*color, alpha),
@@ -89,11 +94,11 @@ def create_water_frames():
         if i < 3:  # Début: éclaboussure vers le haut
             # Gouttelettes qui montent
             for _ in range(10 + i * 5):
-                angle = random.uniform(-math.pi, 0)  # Vers le haut
+                angle = rng.uniform(-math.pi, 0)  # Vers le haut
                 dist = 10 + i * 15
                 px = size // 2 + math.cos(angle) * dist
                 py = size // 2 + math.sin(angle) * dist
-                p_size = random.randint(3, 7)
+                p_size = rng.randint(3, 7)
                 alpha = 200 - i * 20
 
                 pygame.draw.circle(surf, (*color, alpha), (int(px), int(py)), p_size)
@@ -106,10 +111,10 @@ def create_water_frames():
 
             # Gouttelettes qui retombent
             for _ in range(15 - i):
-                px = size // 2 + random.uniform(-flaque_size, flaque_size)
-                py = size // 2 + random.uniform(-30, 20)
-                p_size = random.randint(2, 5)
-                alpha = 150 + random.randint(-40, 40)
+                px = size // 2 + rng.uniform(-flaque_size, flaque_size)
+                py = size // 2 + rng.uniform(-30, 20)
+                p_size = rng.randint(2, 5)
+                alpha = 150 + rng.randint(-40, 40)
 
                 pygame.draw.circle(surf, (*color, alpha), (int(px), int(py)), p_size)
 
@@ -137,13 +142,13 @@ def create_fire_puddle_frames():
         # Ajouter des flammes qui dansent
         cycle = (i % 4)  # Cycle de 4 frames
         for _ in range(20):
-            angle = random.uniform(0, math.pi * 2)
-            dist = random.uniform(10, size // 2 - 10)
+            angle = rng.uniform(0, math.pi * 2)
+            dist = rng.uniform(10, size // 2 - 10)
             px = size // 2 + math.cos(angle) * dist
             py = size // 2 + math.sin(angle) * dist
 
             # Variations de hauteur selon le cycle
-            height = 10 + (cycle + random.uniform(-1, 1)) * 5
+            height = 10 + (cycle + rng.uniform(-1, 1)) * 5
 
             # Dessiner une flamme (triangle)
             pygame.draw.polygon(surf, (*color, 180), [
@@ -177,17 +182,17 @@ def create_mud_frames():
         # Texture de la boue (petites taches plus sombres)
         darker_color = (max(0, color[0] - 40), max(0, color[1] - 40), max(0, color[2] - 40))
         for _ in range(20):
-            px = random.randint(10, size - 10)
-            py = random.randint(5, size // 2 - 5)
-            p_size = random.randint(3, 8)
+            px = rng.randint(10, size - 10)
+            py = rng.randint(5, size // 2 - 5)
+            p_size = rng.randint(3, 8)
             pygame.draw.circle(surf, (*darker_color, alpha), (px, py), p_size)
 
         # Ajouter quelques bulles
         for j in range(3):
-            if random.random() > 0.3:  # 70% de chance d'avoir une bulle
-                px = random.randint(20, size - 20)
-                py = random.randint(10, size // 2 - 10)
-                p_size = random.randint(4, 10)
+            if rng.random() > 0.3:  # 70% de chance d'avoir une bulle
+                px = rng.randint(20, size - 20)
+                py = rng.randint(10, size // 2 - 10)
+                p_size = rng.randint(4, 10)
                 lighter_color = (min(255, color[0] + 20), min(255, color[1] + 20), min(255, color[2] + 20))
                 pygame.draw.circle(surf, (*lighter_color, alpha - 40), (px, py), p_size)
                 # Reflet sur la bulle
@@ -249,15 +254,15 @@ def create_tornado_frames():
 
             # Ajouter des débris qui tournent
             for _ in range(10):
-                h_pct = random.random()  # Position verticale
+                h_pct = rng.random()  # Position verticale
                 curr_width = base_width * (1 - h_pct * 0.7) * 0.8
 
                 # Décalage horizontal basé sur l'angle
                 h_offset = math.sin(math.radians(angle + h_pct * 360)) * curr_width / 2
 
-                x = width / 2 + h_offset + random.uniform(-curr_width / 2, curr_width / 2)
+                x = width / 2 + h_offset + rng.uniform(-curr_width / 2, curr_width / 2)
                 y = height - 30 - h_pct * (height - 40)
-                size = random.randint(2, 5)
+                size = rng.randint(2, 5)
 
                 pygame.draw.circle(surf, (*color, 220), (x, y), size)
 
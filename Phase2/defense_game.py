@@ -1,20 +1,46 @@
 import pygame
 import math
-import random  # Nécessaire pour la sélection aléatoire de conseils
 import os
 from Phase2.enemy import EnemyManager
 from Phase2.launcher import Launcher
 from Phase2.laboratory import Laboratory
 from Phase2.effects import EffectManager
+from Phase2.defense_stats import DefenseStats
+from Phase2.spatial_hash import SpatialHash
+from texture_atlas import get_scaled_icon
+from game_loop import GameLoop
+from text_renderer import get_font, render_text
+from render_target import present
+from profiler import profiler, profile_section
+from rng import DECOR_STREAM, RandomStreams
+from replay import LiveInput
 from constants import *
+from log import get_logger
+
+logger = get_logger(__name__)
 
 class DefenseGame:
     """Classe principale pour la phase de défense du laboratoire"""
 
-    def __init__(self, screen, player, potions):
+    def __init__(self, screen, player, potions, waves, headless=False, seed=RNG_SEED, input_source=None):
+        """
+        :param screen: Surface d'affichage
+        :param player: Joueur (reçoit le score et l'expérience en fin de partie)
+        :param potions: Potions créées pendant la phase 1
+        :param waves: Description des vagues (GameData.waves)
+        :param headless: True pour une simulation sans affichage (voir run_headless)
+        :param seed: Graine des flux aléatoires de la partie (None pour une graine tirée au hasard)
+        :param input_source: Source des entrées (voir replay.py, par défaut le clavier et la souris)
+        """
         self.screen = screen
         self.player = player
-        self.native_surface = pygame.Surface((800, 600))  # Plus grande pour la phase de défense
+        self.headless = headless
+        self.input = input_source if input_source is not None else LiveInput()
+
+        # Flux aléatoires de la partie : la même graine rejoue la même partie
+        self.random_streams = RandomStreams(seed)
+        self.decor_rng = self.random_streams.stream(DECOR_STREAM)
+        logger.info("Graine aléatoire de la partie : %s", self.random_streams.seed)
 
         # Récupération des potions créées dans la phase 1
         self.available_potions = list(potions)
@@ -29,10 +55,10 @@ class DefenseGame:
         # Charger le background PNG pour la phase 2
         try:
             self.background = pygame.image.load('Assets/Map/Map Main 2.png').convert()
-            print("Background PNG chargé avec succès pour la phase de défense!")
+            logger.info("Background PNG chargé avec succès pour la phase de défense!")
         except FileNotFoundError:
             # En cas d'erreur, créer un background par défaut
-            print("Image map_main_2.png non trouvée. Utilisation d'un background par défaut.")
+            logger.warning("Image map_main_2.png non trouvée. Utilisation d'un background par défaut.")
             self.background = pygame.Surface((800, 600))
             self.background.fill((100, 150, 255))  # Fond bleu ciel
 
@@ -43,7 +69,7 @@ class DefenseGame:
             # Montagnes en arrière-plan
             for i in range(5):
                 x = 100 + i * 160
-                height = 80 + random.randint(0, 40)
+                height = 80 + self.decor_rng.randint(0, 40)
                 pygame.draw.polygon(self.background, (80, 80, 80),
                                     [(x - 60, self.floor_level), (x, self.floor_level - height),
                                      (x + 60, self.floor_level)])
@@ -51,7 +77,7 @@ class DefenseGame:
             # Quelques nuages
             for i in range(3):
                 x = 150 + i * 250
-                y = 50 + random.randint(0, 100)
+                y = 50 + self.decor_rng.randint(0, 100)
                 pygame.draw.ellipse(self.background, (230, 230, 230), (x, y, 120, 40))
                 pygame.draw.ellipse(self.background, (230, 230, 230), (x + 30, y - 20, 80, 40))
 
@@ -66,21 +92,21 @@ class DefenseGame:
         self.launcher = Launcher(100, self.floor_level - 20 , self.floor_level)  # Près du sol
 
         # Gestionnaire d'ennemis - avec le bon niveau de sol
-        self.enemy_manager = EnemyManager(WINDOW_WIDTH, WINDOW_HEIGHT, self.floor_level)
+        self.enemy_manager = EnemyManager(WINDOW_WIDTH, WINDOW_HEIGHT, waves, self.floor_level, self.random_streams)
 
         # Gestionnaire d'effets visuels
-        self.effect_manager = EffectManager()
+        self.effect_manager = EffectManager(self.random_streams)
 
-        # Gestionnaire d'effets visuels
-        self.effect_manager = EffectManager()
+        # Index spatial des ennemis, reconstruit à chaque pas (collisions et effets de zone)
+        self.enemy_hash = SpatialHash()
 
         # État du jeu
         self.wave = 1
         self.score = 0
 
         # Interface
-        self.font = pygame.font.SysFont('Arial', 20)
-        self.title_font = pygame.font.SysFont('Arial', 32)
+        self.font = get_font('Arial', 20)
+        self.title_font = get_font('Arial', 32)
         self.selected_potion_index = 0 if self.available_potions else -1
 
         # Sélectionner la première potion si disponible
@@ -90,10 +116,14 @@ class DefenseGame:
         # Gestion du temps
         self.wave_timer = 0
         self.wave_duration = 60  # Durée d'une vague en secondes
+        self.elapsed_time = 0
+
+        # Statistiques de la partie
+        self.stats = DefenseStats()
 
     def handle_events(self):
         """Gère les événements clavier/souris"""
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 return False
 
@@ -101,6 +131,18 @@ class DefenseGame:
                 if event.key == pygame.K_ESCAPE:
                     pass
 
+                # F2 : profileur de temps d'image, F6 : export des mesures en CSV
+                if event.key == pygame.K_F2:
+                    profiler.toggle()
+                    continue
+                elif event.key == pygame.K_F6:
+                    if profiler.frames:
+                        try:
+                            logger.info("Mesures du profileur écrites dans %s", profiler.export_csv())
+                        except OSError as e:
+                            logger.error("Impossible d'écrire les mesures du profileur : %s", e)
+                    continue
+
                 # Si on est en état de game over, gérer les options spéciales
                 if self.game_over_state:
                     if event.key == pygame.K_r:  # R pour recommencer
@@ -132,15 +174,7 @@ class DefenseGame:
                     else:
                         # Lancer la potion sélectionnée
                         used_potion = self.launcher.launch()
-                        if used_potion in self.available_potions:
-                            self.available_potions.remove(used_potion)
-                            if self.available_potions:
-                                self.selected_potion_index = min(self.selected_potion_index,
-                                                                 len(self.available_potions) - 1)
-                                self.launcher.select_potion(self.available_potions[self.selected_potion_index])
-                            else:
-                                self.selected_potion_index = -1
-                                self.launcher.select_potion(None)
+                        self.remove_used_potion(used_potion)
 
             # Gestion des événements de souris
             elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
@@ -158,44 +192,79 @@ class DefenseGame:
                         self.launcher.select_potion(self.available_potions[self.selected_potion_index])
                 elif result is not None:
                     # Une potion a été lancée, la retirer de la liste
-                    used_potion = result
-                    if used_potion in self.available_potions:
-                        self.available_potions.remove(used_potion)
-                        if self.available_potions:
-                            self.selected_potion_index = min(self.selected_potion_index,
-                                                             len(self.available_potions) - 1)
-                            self.launcher.select_potion(self.available_potions[self.selected_potion_index])
-                        else:
-                            self.selected_potion_index = -1
-                            self.launcher.select_potion(None)
+                    self.remove_used_potion(result)
 
         return True
 
+    def remove_used_potion(self, used_potion):
+        """Retire une potion lancée de la liste et sélectionne la suivante"""
+        if used_potion in self.available_potions:
+            self.available_potions.remove(used_potion)
+            if self.available_potions:
+                self.selected_potion_index = min(self.selected_potion_index,
+                                                 len(self.available_potions) - 1)
+                self.launcher.select_potion(self.available_potions[self.selected_potion_index])
+            else:
+                self.selected_potion_index = -1
+                self.launcher.select_potion(None)
+
+    def launch_potion(self, angle, power, potion_name=None):
+        """
+        Lance une potion avec un angle et une puissance donnés (commandes scriptées)
+        :param angle: Angle du lanceur en degrés (0 à 90)
+        :param power: Puissance du lancer (1 à 10)
+        :param potion_name: Nom de la potion à lancer, None pour la potion sélectionnée.
+                            Une pierre est lancée si la potion n'est plus disponible.
+        """
+        self.launcher.set_angle(angle)
+        self.launcher.set_power(power)
+
+        if potion_name is not None:
+            potion = next((p for p in self.available_potions if p.name == potion_name), None)
+            if potion is not None:
+                self.selected_potion_index = self.available_potions.index(potion)
+            self.launcher.select_potion(potion)
+
+        self.remove_used_potion(self.launcher.launch())
+
     def update(self, dt):
         """Mise à jour de tous les éléments du jeu"""
-        # Mise à jour du lanceur et des projectiles
-        self.launcher.update(dt)
-
-        # Mise à jour des ennemis
-        self.enemy_manager.update(dt)
-
-        # Mise à jour des effets visuels
-        self.effect_manager.update(dt)
-
-        # Mise à jour des effets visuels
-        self.effect_manager.update(dt)
-
-        # Appliquer les effets aux ennemis
-        self.effect_manager.affect_enemies(self.enemy_manager.enemies, dt)
-
-        # Vérifier les collisions entre projectiles et ennemis
-        hits = self.launcher.check_collision_with_enemies(self.enemy_manager.enemies, self.effect_manager)
-        for enemy, potion in hits:
-            # Appliquer l'effet de la potion à l'ennemi
-            enemy.apply_potion_effect(potion)
-
-            # Ajouter des points au score
-            self.score += 10  # Points pour avoir touché un ennemi
+        with profile_section("update.launcher"):
+            # Mise à jour du lanceur et des projectiles
+            self.launcher.update(dt)
+
+        with profile_section("update.enemies"):
+            # Mise à jour des ennemis (la brûlure est attribuée à la potion qui l'a causée)
+            self.stats.snapshot_burns(self.enemy_manager.enemies)
+            self.enemy_manager.update(dt)
+            self.stats.record_burns()
+            self.enemy_hash.rebuild(self.enemy_manager.enemies)
+
+        with profile_section("update.effects"):
+            # Mise à jour des effets visuels
+            self.effect_manager.update(dt)
+
+            # Mise à jour des effets visuels
+            self.effect_manager.update(dt)
+
+        with profile_section("update.affect_enemies"):
+            # Appliquer les effets aux ennemis
+            effect_damage = self.effect_manager.affect_enemies(self.enemy_manager.enemies, dt, self.enemy_hash)
+            for potion_name, damage in effect_damage.items():
+                self.stats.record_damage(potion_name, damage)
+
+        with profile_section("update.collisions"):
+            # Vérifier les collisions entre projectiles et ennemis
+            hits = self.launcher.check_collision_with_enemies(self.enemy_manager.enemies, self.effect_manager,
+                                                              self.enemy_hash)
+            for enemy, potion in hits:
+                # Appliquer l'effet de la potion à l'ennemi
+                health_before = enemy.health
+                enemy.apply_potion_effect(potion)
+                self.stats.record_hit(potion.name, health_before - enemy.health)
+
+                # Ajouter des points au score
+                self.score += 10  # Points pour avoir touché un ennemi
 
         # Vérifier si des ennemis ont atteint le laboratoire
         enemies_reached = self.enemy_manager.check_enemy_reached_lab()
@@ -206,48 +275,56 @@ class DefenseGame:
                 self.game_over()
 
         # Vérifier la fin de la vague
+        self.elapsed_time += dt
         self.wave_timer += dt
         if self.enemy_manager.is_wave_complete() or self.wave_timer >= self.wave_duration:
             self.next_wave()
 
     def draw(self):
         """Affiche tous les éléments du jeu"""
+        if self.headless:
+            return
+
         # Dessiner le fond (simple PNG)
         self.screen.blit(self.background, (0, 0))
 
         # Dessiner le laboratoire
         self.laboratory.draw(self.screen)
 
-        # Dessiner les effets visuels (derrière les ennemis)
-        self.effect_manager.draw(self.screen)
+        with profile_section("draw.effects"):
+            # Dessiner les effets visuels (derrière les ennemis)
+            self.effect_manager.draw(self.screen)
 
-        # Dessiner les ennemis
-        self.enemy_manager.draw(self.screen)
+        with profile_section("draw.enemies"):
+            # Dessiner les ennemis
+            self.enemy_manager.draw(self.screen)
 
-        # Dessiner le lanceur et les projectiles
-        self.launcher.draw(self.screen)
+        with profile_section("draw.launcher"):
+            # Dessiner le lanceur et les projectiles
+            self.launcher.draw(self.screen)
 
-        # Afficher les informations de la vague et le score
-        wave_text = self.font.render(f"Vague: {self.wave}", True, (255, 255, 255))
-        self.screen.blit(wave_text, (220, 15))
+        with profile_section("draw.hud"):
+            # Afficher les informations de la vague et le score
+            wave_text = render_text(self.font, f"Vague: {self.wave}", True, (255, 255, 255))
+            self.screen.blit(wave_text, (220, 15))
 
-        score_text = self.font.render(f"Score: {self.score}", True, (255, 255, 255))
-        self.screen.blit(score_text, (220, 40))
+            score_text = render_text(self.font, f"Score: {self.score}", True, (255, 255, 255))
+            self.screen.blit(score_text, (220, 40))
 
-        # Afficher le temps restant pour la vague
-        time_left = max(0, self.wave_duration - self.wave_timer)
-        time_text = self.font.render(f"Temps: {int(time_left)}s", True, (255, 255, 255))
-        self.screen.blit(time_text, (350, 15))
+            # Afficher le temps restant pour la vague
+            time_left = max(0, self.wave_duration - self.wave_timer)
+            time_text = render_text(self.font, f"Temps: {int(time_left)}s", True, (255, 255, 255))
+            self.screen.blit(time_text, (350, 15))
 
-        # Afficher les potions disponibles
-        self.draw_available_potions()
+            # Afficher les potions disponibles
+            self.draw_available_potions()
 
-        # Si la partie est terminée, afficher le message de fin
-        if self.laboratory.health <= 0:
-            self.draw_game_over()
+            # Si la partie est terminée, afficher le message de fin
+            if self.laboratory.health <= 0:
+                self.draw_game_over()
 
         # Mettre à jour l'affichage
-        pygame.display.flip()
+        present()
 
     def draw_available_potions(self):
         """Affiche les potions disponibles en bas de l'écran"""
@@ -256,7 +333,7 @@ class DefenseGame:
 
         # Si aucune potion n'est disponible
         if not self.available_potions:
-            info_text = self.font.render("Plus de potions ! Utilisez les pierres (clic gauche)", True, (255, 200, 200))
+            info_text = render_text(self.font, "Plus de potions ! Utilisez les pierres (clic gauche)", True, (255, 200, 200))
             self.screen.blit(info_text, (250, 555))
             return
 
@@ -279,14 +356,14 @@ class DefenseGame:
 
                 # Afficher les détails de la potion sélectionnée en haut du panel
                 selected_text = f"{potion.name} - {potion.effect}"
-                details_text = self.font.render(selected_text, True, (255, 255, 255))
+                details_text = render_text(self.font, selected_text, True, (255, 255, 255))
                 self.screen.blit(details_text, (400 - details_text.get_width() // 2, 510))
 
             # Dessiner l'image de la potion
             try:
                 potion_img = potion.image
                 if potion_img.get_width() > potion_size or potion_img.get_height() > potion_size:
-                    potion_img = pygame.transform.scale(potion_img, (potion_size, potion_size))
+                    potion_img = get_scaled_icon(potion_img, (potion_size, potion_size))
                 self.screen.blit(potion_img, (x, y))
             except (AttributeError, pygame.error):
                 # Dessiner un rectangle de couleur si pas d'image
@@ -301,7 +378,7 @@ class DefenseGame:
                 pygame.draw.rect(self.screen, color, (x, y, potion_size, potion_size))
 
         # Instructions pour l'utilisation de la souris
-        instructions = self.font.render(
+        instructions = render_text(self.font, 
             "Molette: Changer de potion | Clic gauche: Viser/Lancer", True, (200, 200, 200))
         self.screen.blit(instructions, (250, 580))
 
@@ -313,22 +390,22 @@ class DefenseGame:
         self.screen.blit(overlay, (0, 0))
 
         # Titre "GAME OVER" en gros et en rouge
-        game_over_text = self.title_font.render("GAME OVER", True, (255, 0, 0))
+        game_over_text = render_text(self.title_font, "GAME OVER", True, (255, 0, 0))
         self.screen.blit(game_over_text, (400 - game_over_text.get_width() // 2, 150))
 
         # Statistiques de la partie
-        font_stats = pygame.font.SysFont('Arial', 22)
+        font_stats = get_font('Arial', 22)
 
         # Score final
-        score_text = font_stats.render(f"Score final : {self.score}", True, (255, 255, 255))
+        score_text = render_text(font_stats, f"Score final : {self.score}", True, (255, 255, 255))
         self.screen.blit(score_text, (400 - score_text.get_width() // 2, 210))
 
         # Vagues survécues
-        wave_text = font_stats.render(f"Vagues survécues : {self.wave - 1}", True, (255, 255, 255))
+        wave_text = render_text(font_stats, f"Vagues survécues : {self.wave - 1}", True, (255, 255, 255))
         self.screen.blit(wave_text, (400 - wave_text.get_width() // 2, 240))
 
         # Générer un conseil utile en fonction de la performance du joueur
-        font_tip = pygame.font.SysFont('Arial', 18)
+        font_tip = get_font('Arial', 18)
         tip_text = self.get_game_over_tip()
 
         # Fond pour le conseil
@@ -337,26 +414,26 @@ class DefenseGame:
         self.screen.blit(tip_bg, (100, 280))
 
         # Titre "Conseil"
-        tip_title = font_tip.render("Conseil pour la prochaine partie :", True, (255, 255, 0))
+        tip_title = render_text(font_tip, "Conseil pour la prochaine partie :", True, (255, 255, 0))
         self.screen.blit(tip_title, (110, 290))
 
         # Le conseil lui-même
-        tip = font_tip.render(tip_text, True, (255, 255, 255))
+        tip = render_text(font_tip, tip_text, True, (255, 255, 255))
         self.screen.blit(tip, (110, 320))
 
         # Options pour le joueur
-        font_options = pygame.font.SysFont('Arial', 24)
+        font_options = get_font('Arial', 24)
 
         # Option de redémarrage
-        restart_text = font_options.render("Appuyez sur R pour recommencer", True, (0, 255, 0))
+        restart_text = render_text(font_options, "Appuyez sur R pour recommencer", True, (0, 255, 0))
         self.screen.blit(restart_text, (400 - restart_text.get_width() // 2, 380))
 
         # Option de retour au laboratoire
-        menu_text = font_options.render("Appuyez sur ENTRÉE pour retourner au laboratoire", True, (200, 200, 200))
+        menu_text = render_text(font_options, "Appuyez sur ENTRÉE pour retourner au laboratoire", True, (200, 200, 200))
         self.screen.blit(menu_text, (400 - menu_text.get_width() // 2, 420))
 
         # Petit message additionnel
-        tip2_text = font_tip.render("N'oubliez pas de créer différents types de potions pour la prochaine défense !",
+        tip2_text = render_text(font_tip, "N'oubliez pas de créer différents types de potions pour la prochaine défense !",
                                     True, (255, 200, 100))
         self.screen.blit(tip2_text, (400 - tip2_text.get_width() // 2, 470))
 
@@ -405,7 +482,7 @@ class DefenseGame:
 
         # Sinon, conseil aléatoire
         else:
-            return random.choice(tips)
+            return self.decor_rng.choice(tips)
 
     def game_over(self):
         """Gère la fin de partie"""
@@ -418,41 +495,94 @@ class DefenseGame:
         # Activer l'état de game over
         self.game_over_state = True
 
+    def handle_frame_events(self):
+        """Traitement des entrées, une fois par image"""
+        self.running = self.handle_events()
+
+        # Le joueur veut recommencer ou retourner au laboratoire après un game over
+        if self.restart_game or self.exit_to_lab:
+            self.running = False
+
+    def step(self, dt):
+        """Avance la simulation d'un pas fixe"""
+        # Ne mettre à jour le jeu que s'il n'est pas en état de game over
+        if not self.game_over_state:
+            self.update(dt)
+
+        # Vérifier si le jeu est terminé
+        if self.laboratory.health <= 0 and not self.game_over_state:
+            # Activer l'état de game over
+            self.game_over()
+
     def run(self):
         """Boucle principale de la phase de défense"""
-        clock = pygame.time.Clock()
-        running = True
+        self.running = True
 
         # Sélectionner la première potion si disponible
         if self.available_potions:
             self.launcher.select_potion(self.available_potions[0])
 
-        while running:
-            # Gérer les événements
-            running = self.handle_events()
+        GameLoop(input_source=self.input).run(lambda: self.running, self.handle_frame_events, self.step, self.draw,
+                       section_names=("handle_events", "update", "draw"))
 
-            # Si le joueur veut recommencer, indiquer qu'il faut redémarrer le jeu
-            if self.restart_game:
-                return "restart", self.score, self.wave
-
-            # Si le joueur veut retourner au laboratoire après un game over
-            if self.exit_to_lab:
-                return self.score, self.wave
-
-            # Calculer le delta temps
-            dt = clock.tick(60) / 1000.0
-
-            # Ne mettre à jour le jeu que s'il n'est pas en état de game over
-            if not self.game_over_state:
-                self.update(dt)
-
-            # Dessiner tous les éléments
-            self.draw()
-
-            # Vérifier si le jeu est terminé
-            if self.laboratory.health <= 0 and not self.game_over_state:
-                # Activer l'état de game over
-                self.game_over()
+        # Si le joueur veut recommencer, indiquer qu'il faut redémarrer le jeu
+        if self.restart_game:
+            return "restart", self.score, self.wave
 
         # Retourner le score et la vague pour l'utilisation ultérieure
-        return self.score, self.wave
\ No newline at end of file
+        return self.score, self.wave
+
+    def run_headless(self, commands, dt=SIMULATION_STEP, max_time=600.0, max_waves=None):
+        """
+        Simule la partie sans affichage ni événements, aussi vite que possible
+        :param commands: Liste de lancers (temps en secondes, angle, puissance, nom de la potion ou None)
+        :param dt: Pas de simulation fixe en secondes
+        :param max_time: Durée maximale simulée en secondes
+        :param max_waves: Arrête la simulation après cette vague (None = pas de limite)
+        :return: Dictionnaire de résultats (voir get_result)
+        """
+        self.headless = True
+        commands = sorted(commands, key=lambda command: command[0])
+        next_command = 0
+        steps = 0
+        max_steps = int(max_time / dt)
+
+        while not self.game_over_state and steps < max_steps:
+            # Exécuter les lancers prévus à cet instant
+            while next_command < len(commands) and commands[next_command][0] <= steps * dt:
+                _, angle, power, potion_name = commands[next_command]
+                self.launch_potion(angle, power, potion_name)
+                next_command += 1
+
+            self.step(dt)
+            steps += 1
+
+            if max_waves is not None and self.wave > max_waves:
+                break
+
+        return self.get_result()
+
+    def get_result(self):
+        """Retourne le résultat structuré de la partie"""
+        result = {
+            "seed": self.random_streams.seed,
+            "score": self.score,
+            "wave": self.wave,
+            "lab_health": self.laboratory.health,
+            "game_over": self.game_over_state,
+            "time": round(self.elapsed_time, 3),
+            "launches": self.launcher.launches,
+            "enemies_killed": self.enemy_manager.enemies_killed,
+            "enemies_reached_lab": self.enemy_manager.enemies_reached_lab,
+        }
+        result.update(self.stats.to_dict())
+        result["pools"] = self.get_pool_stats()
+        return result
+
+    def get_pool_stats(self):
+        """Retourne les compteurs des réserves d'objets (taux de réutilisation, pic d'objets vivants)"""
+        return {
+            "projectiles": self.launcher.projectile_pool.stats(),
+            "enemies": self.enemy_manager.enemy_pool.stats(),
+            "effects": self.effect_manager.get_pool_stats(),
+        }
\ No newline at end of file
@@ -0,0 +1,40 @@
+class DefenseStats:
+    """Statistiques d'une partie de défense (touches et dégâts par potion)"""
+
+    def __init__(self):
+        self.hits = 0
+        self.hits_by_potion = {}
+        self.damage_by_potion = {}
+
+        # Santé des ennemis en feu avant la mise à jour (pour attribuer la brûlure)
+        self._burning = []
+
+    def record_hit(self, potion_name, damage):
+        """Compte une touche directe et ses dégâts immédiats"""
+        self.hits += 1
+        self.hits_by_potion[potion_name] = self.hits_by_potion.get(potion_name, 0) + 1
+        self.record_damage(potion_name, damage)
+
+    def record_damage(self, potion_name, damage):
+        """Ajoute des dégâts attribués à une potion"""
+        if damage > 0:
+            self.damage_by_potion[potion_name] = self.damage_by_potion.get(potion_name, 0) + damage
+
+    def snapshot_burns(self, enemies):
+        """Mémorise la santé des ennemis en feu avant leur mise à jour"""
+        self._burning = [(enemy, enemy.health, enemy.burn_source) for enemy in enemies if enemy.is_burning]
+
+    def record_burns(self):
+        """Attribue aux potions les dégâts de brûlure subis depuis snapshot_burns()"""
+        for enemy, health, source in self._burning:
+            if source is not None:
+                self.record_damage(source, health - enemy.health)
+        self._burning = []
+
+    def to_dict(self):
+        """Retourne les statistiques sous forme de dictionnaire"""
+        return {
+            "hits": self.hits,
+            "hits_by_potion": dict(self.hits_by_potion),
+            "damage_by_potion": {name: round(damage, 2) for name, damage in self.damage_by_potion.items()},
+        }
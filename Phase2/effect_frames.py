@@ -0,0 +1,99 @@
+import os
+
+from constants import EFFECT_FRAME_VARIANTS
+from texture_cache import load_texture
+
+# Dossier des images d'effets (relatif au dossier de lancement du jeu)
+EFFECTS_DIR = os.path.join("Assets", "Art", "Effects")
+
+
+class EffectFrameBank:
+    """
+    Banque d'images d'animation des effets, partagée par toutes les instances.
+    Les images d'un effet sont chargées (ou générées si les fichiers n'existent pas)
+    une seule fois par clé (type d'effet, couleur, taille) au lieu d'une fois par impact.
+    Les images générées étant aléatoires, on garde quelques variantes par clé pour
+    que deux effets identiques ne soient pas parfaitement superposables.
+    Les surfaces retournées sont partagées : ne pas les modifier.
+    """
+
+    def __init__(self, variants=EFFECT_FRAME_VARIANTS):
+        """
+        :param variants: nombre de variantes générées gardées par clé
+        """
+        self.variants = max(1, variants)
+        self.loaded = {}  # (type, nom du fichier, nombre d'images) -> liste d'images ou None si absentes
+        self.generated = {}  # (type, couleur, taille) -> liste de variantes
+        self.next_variant = {}  # (type, couleur, taille) -> indice de la prochaine variante distribuée
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, effect_type, file_pattern, frame_count, generate, color=None, size=None):
+        """
+        Retourne les images d'animation d'un effet
+        :param effect_type: nom du type d'effet (ex: "explosion")
+        :param file_pattern: nom des fichiers, avec {} pour le numéro de l'image (à partir de 1)
+        :param frame_count: nombre d'images de l'animation
+        :param generate: fonction sans argument retournant des images générées, utilisée si les fichiers manquent
+        :param color: couleur de l'effet (fait partie de la clé des images générées)
+        :param size: taille de l'effet (fait partie de la clé des images générées)
+        :return: liste d'images partagée
+        """
+        frames = self._load(effect_type, file_pattern, frame_count)
+        if frames is not None:
+            return frames
+
+        key = (effect_type, tuple(color) if color is not None else None, size)
+        pool = self.generated.setdefault(key, [])
+
+        # Les premières demandes remplissent la réserve de variantes, les suivantes la parcourent
+        if len(pool) < self.variants:
+            self.misses += 1
+            frames = list(generate())
+            pool.append(frames)
+            return frames
+
+        self.hits += 1
+        index = self.next_variant.get(key, 0)
+        self.next_variant[key] = (index + 1) % len(pool)
+        return pool[index]
+
+    def _load(self, effect_type, file_pattern, frame_count):
+        """Charge les images depuis les fichiers (une seule fois, absence comprise)"""
+        key = (effect_type, file_pattern, frame_count)
+        if key not in self.loaded:
+            try:
+                self.loaded[key] = [load_texture(os.path.join(EFFECTS_DIR, file_pattern.format(i)))
+                                    for i in range(1, frame_count + 1)]
+            except FileNotFoundError:
+                self.loaded[key] = None
+        return self.loaded[key]
+
+    def clear(self):
+        """Vide la banque (par exemple après un changement de mode vidéo)"""
+        self.loaded.clear()
+        self.generated.clear()
+        self.next_variant.clear()
+
+    def stats(self):
+        """Retourne les compteurs de la banque"""
+        requests = self.hits + self.misses
+        return {
+            "loaded": sum(1 for frames in self.loaded.values() if frames is not None),
+            "generated_keys": len(self.generated),
+            "generated_variants": sum(len(pool) for pool in self.generated.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+
+# Banque partagée par tous les effets
+effect_frames = EffectFrameBank()
+
+
+def get_effect_frames(effect_type, file_pattern, frame_count, generate, color=None, size=None):
+    """Raccourci vers la banque d'images d'effets partagée"""
+    return effect_frames.get(effect_type, file_pattern, frame_count, generate, color, size)
@@ -1,23 +1,46 @@
 import pygame
 import math
-import random
 import os
 
+import numpy as np
+
+from Phase2.effect_frames import get_effect_frames
+from Phase2.object_pool import ObjectPool
+from Phase2.particles import ParticleSystem
+from constants import EFFECT_POOL_SIZE
+from quality import quality
+from rng import EFFECTS_STREAM, EFFECT_FRAMES_STREAM, random_streams
+
 # Assurez-vous que le dossier d'effets existe
 os.makedirs("Assets/Art/Effects", exist_ok=True)
 
+# Flux des images générées : la banque d'images étant partagée par toutes les parties,
+# son flux l'est aussi (les particules utilisent le flux de leur EffectManager, self.rng)
+frame_rng = random_streams.stream(EFFECT_FRAMES_STREAM)
+
 
 class Effect(pygame.sprite.Sprite):
     """Classe de base pour les effets visuels et fonctionnels des potions"""
 
-    def __init__(self, x, y, duration=1.0):
+    def __init__(self, *args, **kwargs):
         super().__init__()
+        self.reset(*args, **kwargs)
+
+    def reset(self, x, y, duration=1.0, particle_system=None):
+        """
+        (Ré)initialise l'effet (réutilisation par les réserves d'EffectManager)
+        :param particle_system: ParticleSystem partagé (fourni par EffectManager) ; si None,
+                                l'effet utilise son propre système et le met à jour lui-même
+        """
         self.x = x
         self.y = y
         self.duration = duration
         self.elapsed_time = 0
         self.is_finished = False
 
+        # Nom de la potion à l'origine de l'effet (statistiques)
+        self.source_name = None
+
         # Position et taille
         self.rect = pygame.Rect(x - 50, y - 50, 100, 100)
 
@@ -35,10 +58,31 @@ class Effect(pygame.sprite.Sprite):
         self.max_frames = 1
         self.frames = []
 
+        # Particules
+        self.owns_particle_system = particle_system is None
+        self.particle_system = ParticleSystem() if particle_system is None else particle_system
+        self.rng = self.particle_system.rng
+        self.emitters = []
+
+    def add_emitter(self, update_hook=None, visible=True, fade=True, color_shift=None):
+        """Crée un émetteur de particules appartenant à l'effet"""
+        emitter = self.particle_system.add_emitter(update_hook, visible, fade, color_shift)
+        self.emitters.append(emitter)
+        return emitter
+
+    def release(self):
+        """Libère les particules de l'effet (appelé quand l'effet est retiré)"""
+        for emitter in self.emitters:
+            emitter.release()
+        self.emitters = []
+
     def update(self, dt):
         """Met à jour l'effet"""
         self.elapsed_time += dt
 
+        if self.owns_particle_system:
+            self.particle_system.update(dt)
+
         # Animation
         self.frame = min(int(self.elapsed_time / self.duration * self.max_frames), self.max_frames - 1)
 
@@ -50,16 +94,22 @@ class Effect(pygame.sprite.Sprite):
         return min(1.0, self.elapsed_time / self.duration)
 
     def affect_enemy(self, enemy, dt):
-        """Applique les effets aux ennemis dans la zone"""
+        """
+        Applique les effets aux ennemis dans la zone
+        :return: dégâts infligés à l'ennemi
+        """
+        damage = 0
         if not self.is_zone_effect:
-            return
+            return damage
 
-        # Vérifier si l'ennemi est dans la zone d'effet
-        distance = math.sqrt((enemy.rect.centerx - self.x) ** 2 + (enemy.rect.centery - self.y) ** 2)
-        if distance <= self.zone_radius:
+        # Vérifier si l'ennemi est dans la zone d'effet (distances au carré, sans racine)
+        dx = enemy.rect.centerx - self.x
+        dy = enemy.rect.centery - self.y
+        if dx * dx + dy * dy <= self.zone_radius * self.zone_radius:
             # Appliquer les dégâts
             if self.damage_per_second > 0:
-                enemy.health -= self.damage_per_second * dt
+                damage = self.damage_per_second * dt
+                enemy.health -= damage
 
             # Appliquer le ralentissement
             if self.slow_factor < 1.0:
@@ -89,15 +139,16 @@ class Effect(pygame.sprite.Sprite):
                 enemy.rect.x += (dx / distance) * self.repel_force
                 enemy.rect.y += (dy / distance) * self.repel_force
 
+        return damage
+
 
 class ExplosionEffect(Effect):
     """Effet d'explosion pour les potions d'attaque"""
 
-    def __init__(self, x, y, size=50, color=(255, 100, 0), duration=0.8):
-        super().__init__(x, y, duration)
+    def reset(self, x, y, size=50, color=(255, 100, 0), duration=0.8, particle_system=None):
+        super().reset(x, y, duration, particle_system)
         self.size = size
         self.color = color
-        self.particles = []
         self.max_frames = 7
 
         # Paramètres d'effet
@@ -105,37 +156,25 @@ class ExplosionEffect(Effect):
         self.zone_radius = size * 1.5
         self.damage_per_second = 30  # Dégâts de base
 
-        # Générer des particules pour l'explosion
-        for _ in range(20):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 5)
-            size = random.randint(2, 6)
-            lifetime = random.uniform(0.3, self.duration)
-            particle = {
-                'x': self.x,
-                'y': self.y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'size': size,
-                'lifetime': lifetime,
-                'elapsed': 0,
-                'color': self.color
-            }
-            self.particles.append(particle)
+        # Générer des particules pour l'explosion (avec une légère gravité)
+        count = quality.particle_count(20)
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        speed = self.rng.uniform(1, 5, count)
+        self.emitter = self.add_emitter()
+        self.emitter.emit(count, x=self.x, y=self.y,
+                          vx=np.cos(angle) * speed, vy=np.sin(angle) * speed,
+                          size=self.rng.integers(2, 7, count),
+                          lifetime=self.rng.uniform(0.3, self.duration, count),
+                          gravity=0.1, color=self.color)
 
         # Chargement des images d'explosion
-        self.frames = []
-        try:
-            for i in range(1, 8):  # Supposant 7 images nommées explosion1.png à explosion7.png
-                img = pygame.image.load(f'Assets/Art/Effects/explosion{i}.png').convert_alpha()
-                self.frames.append(img)
-        except FileNotFoundError:
-            # Images par défaut si les fichiers n'existent pas
-            self._generate_default_frames()
+        # (partagées entre les instances, générées par défaut si les fichiers n'existent pas)
+        self.frames = get_effect_frames("explosion", "explosion{}.png", 7,
+                                        self._generate_default_frames, self.color, self.size)
 
     def _generate_default_frames(self):
         """Génère des images d'explosion par défaut"""
-        self.frames = []
+        frames = []
         for i in range(7):  # 7 frames d'animation
             scale = 0.3 + i * 0.1  # Commence petit et grossit
             surf = pygame.Surface((int(self.size * 2 * scale), int(self.size * 2 * scale)), pygame.SRCALPHA)
@@ -148,28 +187,17 @@ class ExplosionEffect(Effect):
 
             # Éclats qui s'éloignent du centre
             for _ in range(5 + i * 3):
-                angle = random.uniform(0, 2 * math.pi)
+                angle = frame_rng.uniform(0, 2 * math.pi)
                 dist = (0.5 + i * 0.1) * self.size * scale
                 px = int(self.size * scale + math.cos(angle) * dist)
                 py = int(self.size * scale + math.sin(angle) * dist)
-                p_size = random.randint(3, 8)
-                p_alpha = random.randint(100, 230)
+                p_size = frame_rng.randint(3, 8)
+                p_alpha = frame_rng.randint(100, 230)
                 pygame.draw.circle(surf, (*self.color, p_alpha), (px, py), p_size)
 
-            self.frames.append(surf)
-
-    def update(self, dt):
-        """Met à jour l'explosion"""
-        super().update(dt)
-
-        # Mettre à jour les particules
-        for particle in self.particles:
-            particle['elapsed'] += dt
-            particle['x'] += particle['vx'] * dt * 60
-            particle['y'] += particle['vy'] * dt * 60
+            frames.append(surf)
 
-            # Appliquer une légère gravité
-            particle['vy'] += 0.1
+        return frames
 
     def draw(self, surface):
         """Dessine l'explosion"""
@@ -189,7 +217,7 @@ class ExplosionEffect(Effect):
             pygame.draw.circle(explosion_surface, (*self.color, alpha), (radius, radius), radius)
 
             # Appliquer un flou (simplifié)
-            blur_amount = int(radius * 0.1)
+            blur_amount = quality.blur_steps(int(radius * 0.1))
             for i in range(blur_amount):
                 factor = 1 - (i / blur_amount)
                 pygame.draw.circle(explosion_surface, (*self.color, int(alpha * factor)),
@@ -198,21 +226,15 @@ class ExplosionEffect(Effect):
             surface.blit(explosion_surface, (self.x - radius, self.y - radius))
 
         # Dessiner les particules
-        for particle in self.particles:
-            # Calculer l'opacité en fonction du temps de vie
-            p_alpha = 255 * (1 - particle['elapsed'] / particle['lifetime'])
-            if p_alpha > 0:
-                pygame.draw.circle(surface, (*particle['color'], int(p_alpha)),
-                                   (int(particle['x']), int(particle['y'])), particle['size'])
+        self.emitter.draw(surface)
 
 
 class SmokeEffect(Effect):
     """Effet de fumée pour les potions de statut"""
 
-    def __init__(self, x, y, color=(150, 150, 150), duration=3.0):
-        super().__init__(x, y, duration)
+    def reset(self, x, y, color=(150, 150, 150), duration=3.0, particle_system=None):
+        super().reset(x, y, duration, particle_system)
         self.color = color
-        self.particles = []
         self.max_frames = 10
 
         # Paramètres d'effet
@@ -221,38 +243,30 @@ class SmokeEffect(Effect):
         self.slow_factor = 0.7  # Ralentissement
         self.blind_duration = 1.0  # Durée de l'aveuglement
 
-        # Générer des particules de fumée
-        for i in range(15):
-            delay = random.uniform(0, self.duration * 0.5)
-            size = random.randint(5, 15)
-            lifetime = random.uniform(1.0, self.duration)
-            speed = random.uniform(0.5, 2)
-            particle = {
-                'x': self.x + random.uniform(-10, 10),
-                'y': self.y + random.uniform(-5, 5),
-                'vx': random.uniform(-0.5, 0.5),
-                'vy': -speed,  # Monter
-                'size': size,
-                'lifetime': lifetime,
-                'elapsed': 0,
-                'delay': delay,
-                'color': self.color
-            }
-            self.particles.append(particle)
+        # Générer des particules de fumée : elles montent en ralentissant et grossissent légèrement
+        count = quality.particle_count(15)
+        self.emitter = self.add_emitter()
+        self.emitter.emit(count,
+                          x=self.x + self.rng.uniform(-10, 10, count),
+                          y=self.y + self.rng.uniform(-5, 5, count),
+                          vx=self.rng.uniform(-0.5, 0.5, count),
+                          vy=-self.rng.uniform(0.5, 2, count),
+                          size=self.rng.integers(5, 16, count),
+                          lifetime=self.rng.uniform(1.0, self.duration, count),
+                          delay=self.rng.uniform(0, self.duration * 0.5, count),
+                          drag=0.98, growth=0.1, color=self.color)
 
         # Chargement des images de fumée
-        self.frames = []
-        try:
-            for i in range(1, 11):  # Supposant 10 images nommées smoke1.png à smoke10.png
-                img = pygame.image.load(f'Assets/Art/Effects/smoke{i}.png').convert_alpha()
-                self.frames.append(img)
-        except FileNotFoundError:
-            # Images par défaut si les fichiers n'existent pas
-            self._generate_default_frames()
+        # (partagées entre les instances, générées par défaut si les fichiers n'existent pas)
+        self.frames = get_effect_frames("smoke", "smoke{}.png", 10,
+                                        self._generate_default_frames, self.color)
+
+        # Les particules ne sont dessinées qu'en l'absence d'images
+        self.emitter.visible = not self.frames
 
     def _generate_default_frames(self):
         """Génère des images de fumée par défaut"""
-        self.frames = []
+        frames = []
         base_size = 40
 
         for i in range(10):  # 10 frames d'animation
@@ -264,35 +278,15 @@ class SmokeEffect(Effect):
 
             # Dessiner plusieurs cercles pour créer un nuage
             for _ in range(8 + i):
-                cx = size + random.uniform(-size / 2, size / 2)
-                cy = size + random.uniform(-size / 2, size / 2)
-                r = (size / 3) * random.uniform(0.7, 1.3)
-                c_alpha = min(255, alpha + random.randint(-30, 30))
+                cx = size + frame_rng.uniform(-size / 2, size / 2)
+                cy = size + frame_rng.uniform(-size / 2, size / 2)
+                r = (size / 3) * frame_rng.uniform(0.7, 1.3)
+                c_alpha = min(255, alpha + frame_rng.randint(-30, 30))
                 pygame.draw.circle(surf, (*self.color, c_alpha), (int(cx), int(cy)), int(r))
 
-            self.frames.append(surf)
+            frames.append(surf)
 
-    def update(self, dt):
-        """Met à jour la fumée"""
-        super().update(dt)
-
-        # Mettre à jour les particules
-        for particle in self.particles:
-            if particle['delay'] > 0:
-                particle['delay'] -= dt
-                continue
-
-            particle['elapsed'] += dt
-            if particle['elapsed'] < particle['lifetime']:
-                particle['x'] += particle['vx'] * dt * 60
-                particle['y'] += particle['vy'] * dt * 60
-
-                # Ralentir verticalement
-                particle['vy'] *= 0.98
-
-                # Grossir légèrement
-                if particle['elapsed'] < particle['lifetime'] * 0.5:
-                    particle['size'] += 0.1
+        return frames
 
     def draw(self, surface):
         """Dessine la fumée"""
@@ -303,34 +297,15 @@ class SmokeEffect(Effect):
             surface.blit(img, img_rect)
         else:
             # Fallback si pas d'images disponibles
-            for particle in self.particles:
-                if particle['delay'] > 0 or particle['elapsed'] >= particle['lifetime']:
-                    continue
-
-                # Calculer l'opacité
-                alpha = 255 * (1 - particle['elapsed'] / particle['lifetime'])
-
-                # Dessiner la particule de fumée
-                if alpha > 0:
-                    smoke_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-                    pygame.draw.circle(smoke_surface, (*particle['color'], int(alpha)),
-                                       (particle['size'], particle['size']), particle['size'])
-
-                    # Appliquer un flou simple
-                    pygame.draw.circle(smoke_surface, (*particle['color'], int(alpha * 0.7)),
-                                       (particle['size'], particle['size']), particle['size'] * 0.8)
-
-                    surface.blit(smoke_surface,
-                                 (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
+            self.emitter.draw(surface)
 
 
 class WaterEffect(Effect):
     """Effet d'éclaboussure d'eau pour les potions à base d'eau"""
 
-    def __init__(self, x, y, color=(0, 100, 255), duration=0.8):
-        super().__init__(x, y, duration)
+    def reset(self, x, y, color=(0, 100, 255), duration=0.8, particle_system=None):
+        super().reset(x, y, duration, particle_system)
         self.color = color
-        self.droplets = []
         self.max_frames = 8
 
         # Paramètres d'effet
@@ -338,36 +313,28 @@ class WaterEffect(Effect):
         self.zone_radius = 60
         self.slow_factor = 0.5  # Ralentissement important
 
-        # Générer des gouttelettes
-        for _ in range(30):
-            angle = random.uniform(-math.pi * 0.8, 0)  # Vers le haut principalement
-            speed = random.uniform(3, 8)
-            size = random.uniform(2, 5)
-            lifetime = random.uniform(0.3, 0.8)
-            droplet = {
-                'x': self.x,
-                'y': self.y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'size': size,
-                'lifetime': lifetime,
-                'elapsed': 0
-            }
-            self.droplets.append(droplet)
+        # Générer des gouttelettes (soumises à la gravité)
+        count = quality.particle_count(30)
+        angle = self.rng.uniform(-math.pi * 0.8, 0, count)  # Vers le haut principalement
+        speed = self.rng.uniform(3, 8, count)
+        self.droplets = self.add_emitter()
+        self.droplets.emit(count, x=self.x, y=self.y,
+                           vx=np.cos(angle) * speed, vy=np.sin(angle) * speed,
+                           size=self.rng.uniform(2, 5, count),
+                           lifetime=self.rng.uniform(0.3, 0.8, count),
+                           gravity=0.2, color=self.color)
 
         # Chargement des images d'eau
-        self.frames = []
-        try:
-            for i in range(1, 9):  # Supposant 8 images nommées water1.png à water8.png
-                img = pygame.image.load(f'Assets/Art/Effects/water{i}.png').convert_alpha()
-                self.frames.append(img)
-        except FileNotFoundError:
-            # Images par défaut si les fichiers n'existent pas
-            self._generate_default_frames()
+        # (partagées entre les instances, générées par défaut si les fichiers n'existent pas)
+        self.frames = get_effect_frames("water", "water{}.png", 8,
+                                        self._generate_default_frames, self.color)
+
+        # Les gouttelettes ne sont dessinées qu'en l'absence d'images
+        self.droplets.visible = not self.frames
 
     def _generate_default_frames(self):
         """Génère des images d'éclaboussure d'eau par défaut"""
-        self.frames = []
+        frames = []
         size = 60
 
         for i in range(8):  # 8 frames d'animation
@@ -376,11 +343,11 @@ class WaterEffect(Effect):
             # Animation d'éclaboussure
             if i < 3:  # Début: flux vers le haut
                 for _ in range(10 + i * 5):
-                    angle = random.uniform(-math.pi, 0)  # Vers le haut
+                    angle = frame_rng.uniform(-math.pi, 0)  # Vers le haut
                     dist = 10 + i * 15
                     px = size + math.cos(angle) * dist
                     py = size + math.sin(angle) * dist
-                    p_size = random.randint(3, 7)
+                    p_size = frame_rng.randint(3, 7)
                     alpha = 200 - i * 20
                     pygame.draw.circle(surf, (*self.color, alpha), (int(px), int(py)), p_size)
             else:  # Suite: étalement et formation de flaque
@@ -392,28 +359,15 @@ class WaterEffect(Effect):
 
                 # Gouttes qui retombent
                 for _ in range(15 - i):
-                    px = size + random.uniform(-flaque_size, flaque_size)
-                    py = size + random.uniform(-40, 20)
-                    p_size = random.randint(2, 5)
-                    p_alpha = alpha + random.randint(-40, 40)
+                    px = size + frame_rng.uniform(-flaque_size, flaque_size)
+                    py = size + frame_rng.uniform(-40, 20)
+                    p_size = frame_rng.randint(2, 5)
+                    p_alpha = alpha + frame_rng.randint(-40, 40)
                     pygame.draw.circle(surf, (*self.color, p_alpha), (int(px), int(py)), p_size)
 
-            self.frames.append(surf)
-
-    def update(self, dt):
-        """Met à jour l'éclaboussure"""
-        super().update(dt)
+            frames.append(surf)
 
-        # Mettre à jour les gouttelettes
-        for droplet in self.droplets:
-            droplet['elapsed'] += dt
-
-            if droplet['elapsed'] < droplet['lifetime']:
-                droplet['x'] += droplet['vx'] * dt * 60
-                droplet['y'] += droplet['vy'] * dt * 60
-
-                # Appliquer la gravité
-                droplet['vy'] += 0.2
+        return frames
 
     def draw(self, surface):
         """Dessine l'éclaboussure d'eau"""
@@ -424,26 +378,15 @@ class WaterEffect(Effect):
             surface.blit(img, img_rect)
         else:
             # Fallback si pas d'images disponibles
-            for droplet in self.droplets:
-                if droplet['elapsed'] >= droplet['lifetime']:
-                    continue
-
-                # Calculer l'opacité
-                alpha = 255 * (1 - droplet['elapsed'] / droplet['lifetime'])
-
-                # Dessiner la gouttelette
-                if alpha > 0:
-                    pygame.draw.circle(surface, (*self.color, int(alpha)),
-                                       (int(droplet['x']), int(droplet['y'])), droplet['size'])
+            self.droplets.draw(surface)
 
 
 class FirePuddleEffect(Effect):
     """Effet de flaque de feu persistante"""
 
-    def __init__(self, x, y, color=(255, 100, 0), duration=5.0):
-        super().__init__(x, y, duration)
+    def reset(self, x, y, color=(255, 100, 0), duration=5.0, particle_system=None):
+        super().reset(x, y, duration, particle_system)
         self.color = color
-        self.particles = []
         self.max_frames = 12
 
         # Paramètres d'effet
@@ -454,42 +397,38 @@ class FirePuddleEffect(Effect):
         # Génération de la flaque
         self.puddle_radius = 40
 
-        # Flammes qui s'élèvent
-        for _ in range(40):
-            px = self.x + random.uniform(-self.puddle_radius, self.puddle_radius)
-            py = self.y + random.uniform(-self.puddle_radius / 2, self.puddle_radius / 2)
+        # Flammes qui s'élèvent (l'opacité baisse et la couleur vire au rouge en montant)
+        self.flames = self.add_emitter(self._update_flames, color_shift=(0, -100, 0))
 
-            # S'assurer que le point est dans une ellipse
-            if ((px - self.x) / self.puddle_radius) ** 2 + ((py - self.y) / (self.puddle_radius / 2)) ** 2 > 1:
-                continue
+        candidates = quality.particle_count(40)
+        px = self.x + self.rng.uniform(-self.puddle_radius, self.puddle_radius, candidates)
+        py = self.y + self.rng.uniform(-self.puddle_radius / 2, self.puddle_radius / 2, candidates)
+
+        # S'assurer que les points sont dans une ellipse
+        inside = ((px - self.x) / self.puddle_radius) ** 2 + ((py - self.y) / (self.puddle_radius / 2)) ** 2 <= 1
+        px, py = px[inside], py[inside]
+        count = px.size
 
-            lifetime = random.uniform(0.5, 1.5)  # Chaque flamme est de courte durée mais se régénère
-            self.particles.append({
-                'x': px,
-                'y': py,
-                'base_x': px,  # Position de base pour l'oscillation
-                'base_y': py,
-                'size': random.uniform(3, 8),
-                'speed': random.uniform(0.5, 2),
-                'lifetime': lifetime,
-                'elapsed': random.uniform(0, lifetime),  # Départ décalé
-                'color': self.color,
-                'phase': random.uniform(0, math.pi * 2)  # Phase pour l'oscillation
-            })
+        lifetime = self.rng.uniform(0.5, 1.5, count)  # Chaque flamme est de courte durée mais se régénère
+        # Valeurs libres : position de base (x, y), vitesse de montée et phase de l'oscillation
+        aux = np.column_stack((px, py, self.rng.uniform(0.5, 2, count), self.rng.uniform(0, math.pi * 2, count)))
+        self.flames.emit(count, x=px, y=py,
+                         size=self.rng.uniform(3, 8, count),
+                         lifetime=lifetime,
+                         age=self.rng.uniform(0, 1, count) * lifetime,  # Départ décalé
+                         alpha=200, color=(self.color[0], self.color[1], 0), aux=aux)
 
         # Chargement des images de flaque de feu
-        self.frames = []
-        try:
-            for i in range(1, 13):  # Supposant 12 images nommées fire_puddle1.png à fire_puddle12.png
-                img = pygame.image.load(f'Assets/Art/Effects/fire_puddle{i}.png').convert_alpha()
-                self.frames.append(img)
-        except FileNotFoundError:
-            # Images par défaut si les fichiers n'existent pas
-            self._generate_default_frames()
+        # (partagées entre les instances, générées par défaut si les fichiers n'existent pas)
+        self.frames = get_effect_frames("fire_puddle", "fire_puddle{}.png", 12,
+                                        self._generate_default_frames, self.color)
+
+        # Les flammes ne sont dessinées qu'en l'absence d'images
+        self.flames.visible = not self.frames
 
     def _generate_default_frames(self):
         """Génère des images de flaque de feu par défaut"""
-        self.frames = []
+        frames = []
         size = 100
 
         for i in range(12):  # Animation cyclique
@@ -501,13 +440,13 @@ class FirePuddleEffect(Effect):
             # Ajouter des flammes qui dansent
             cycle = (i % 4)  # Cycle de 4 frames
             for _ in range(20):
-                angle = random.uniform(0, math.pi * 2)
-                dist = random.uniform(10, size // 2 - 10)
+                angle = frame_rng.uniform(0, math.pi * 2)
+                dist = frame_rng.uniform(10, size // 2 - 10)
                 px = size // 2 + math.cos(angle) * dist
                 py = size // 2 + math.sin(angle) * dist
 
                 # Variations de hauteur selon le cycle
-                height = 5 + (cycle + random.uniform(-1, 1)) * 3
+                height = 5 + (cycle + frame_rng.uniform(-1, 1)) * 3
 
                 # Dessiner une flamme (triangle)
                 pygame.draw.polygon(surf, (*self.color, 180), [
@@ -516,28 +455,28 @@ class FirePuddleEffect(Effect):
                     (px, py - height)
                 ])
 
-            self.frames.append(surf)
+            frames.append(surf)
 
-    def update(self, dt):
-        """Met à jour la flaque de feu"""
-        super().update(dt)
+        return frames
+
+    def _update_flames(self, idx, dt):
+        """Met à jour les particules de flamme"""
+        system = self.particle_system
+        age, lifetime, aux = system.age, system.lifetime, system.aux
 
-        # Mise à jour des particules de flamme
-        for p in self.particles:
-            p['elapsed'] += dt
-            if p['elapsed'] >= p['lifetime']:
-                # Réinitialiser la flamme plutôt que de la supprimer
-                p['elapsed'] = 0
-                p['size'] = random.uniform(3, 8)
-                p['speed'] = random.uniform(0.5, 2)
+        # Réinitialiser les flammes terminées plutôt que de les supprimer
+        done = idx[age[idx] >= lifetime[idx]]
+        if done.size:
+            age[done] = 0
+            system.size[done] = self.rng.uniform(3, 8, done.size)
+            aux[done, 2] = self.rng.uniform(0.5, 2, done.size)
 
-            # Oscillation horizontale et montée
-            time = pygame.time.get_ticks() * 0.001
-            p['x'] = p['base_x'] + math.sin(time * 2 + p['phase']) * 3
-            p['y'] = p['base_y'] - p['speed'] * p['elapsed'] * 20
+        # Oscillation horizontale (sur le temps de l'effet) et montée
+        system.x[idx] = aux[idx, 0] + np.sin(self.elapsed_time * 2 + aux[idx, 3]) * 3
+        system.y[idx] = aux[idx, 1] - aux[idx, 2] * age[idx] * 20
 
-            # Réduire la taille en montant
-            p['size'] *= (1 - p['elapsed'] / p['lifetime'] * 0.5)
+        # Réduire la taille en montant
+        system.size[idx] *= 1 - age[idx] / lifetime[idx] * 0.5
 
     def draw(self, surface):
         """Dessine la flaque de feu"""
@@ -557,18 +496,14 @@ class FirePuddleEffect(Effect):
             surface.blit(puddle_surf, (self.x - self.puddle_radius, self.y - self.puddle_radius // 2))
 
             # Dessiner les flammes
-            for p in self.particles:
-                if p['elapsed'] < p['lifetime']:
-                    alpha = int(200 * (1 - p['elapsed'] / p['lifetime']))
-                    color = (self.color[0], max(0, self.color[1] - int(p['elapsed'] / p['lifetime'] * 100)), 0, alpha)
-                    pygame.draw.circle(surface, color, (int(p['x']), int(p['y'])), int(p['size']))
+            self.flames.draw(surface)
 
 
 class MudPuddleEffect(Effect):
     """Effet de flaque de boue ralentissante"""
 
-    def __init__(self, x, y, color=(139, 69, 19), duration=4.0):
-        super().__init__(x, y, duration)
+    def reset(self, x, y, color=(139, 69, 19), duration=4.0, particle_system=None):
+        super().reset(x, y, duration, particle_system)
         self.color = color
         self.max_frames = 6
 
@@ -579,31 +514,28 @@ class MudPuddleEffect(Effect):
 
         # Propriétés visuelles
         self.puddle_radius = 60
-        self.bubbles = []
-
-        # Générer quelques bulles de boue
-        for _ in range(10):
-            self.bubbles.append({
-                'x': self.x + random.uniform(-self.puddle_radius * 0.7, self.puddle_radius * 0.7),
-                'y': self.y + random.uniform(-self.puddle_radius * 0.4, self.puddle_radius * 0.4),
-                'size': random.uniform(3, 8),
-                'pop_time': random.uniform(0.5, self.duration * 0.8),
-                'popped': False
-            })
+
+        # Générer quelques bulles de boue : une bulle vit jusqu'à ce qu'elle éclate
+        count = quality.particle_count(10)
+        self.bubbles = self.add_emitter(self._update_bubbles, fade=False)
+        self.bubbles.emit(count,
+                          x=self.x + self.rng.uniform(-self.puddle_radius * 0.7, self.puddle_radius * 0.7, count),
+                          y=self.y + self.rng.uniform(-self.puddle_radius * 0.4, self.puddle_radius * 0.4, count),
+                          size=self.rng.uniform(3, 8, count),
+                          lifetime=self.rng.uniform(0.5, self.duration * 0.8, count),
+                          alpha=200, color=self.color)
 
         # Chargement des images de flaque de boue
-        self.frames = []
-        try:
-            for i in range(1, 7):  # Supposant 6 images nommées mud1.png à mud6.png
-                img = pygame.image.load(f'Assets/Art/Effects/mud{i}.png').convert_alpha()
-                self.frames.append(img)
-        except FileNotFoundError:
-            # Images par défaut si les fichiers n'existent pas
-            self._generate_default_frames()
+        # (partagées entre les instances, générées par défaut si les fichiers n'existent pas)
+        self.frames = get_effect_frames("mud", "mud{}.png", 6,
+                                        self._generate_default_frames, self.color)
+
+        # Les bulles ne sont dessinées qu'en l'absence d'images
+        self.bubbles.visible = not self.frames
 
     def _generate_default_frames(self):
         """Génère des images de flaque de boue par défaut"""
-        self.frames = []
+        frames = []
         size = 140
 
         for i in range(6):  # 6 frames d'animation
@@ -616,40 +548,41 @@ class MudPuddleEffect(Effect):
             # Texture de la boue (petites taches plus sombres)
             darker_color = (max(0, self.color[0] - 40), max(0, self.color[1] - 40), max(0, self.color[2] - 40))
             for _ in range(20):
-                px = random.randint(10, size - 10)
-                py = random.randint(5, size // 2 - 5)
-                p_size = random.randint(3, 8)
+                px = frame_rng.randint(10, size - 10)
+                py = frame_rng.randint(5, size // 2 - 5)
+                p_size = frame_rng.randint(3, 8)
                 pygame.draw.circle(surf, (*darker_color, alpha), (px, py), p_size)
 
             # Ajouter quelques bulles
             for j in range(3):
-                if random.random() > 0.3:  # 70% de chance d'avoir une bulle
-                    px = random.randint(20, size - 20)
-                    py = random.randint(10, size // 2 - 10)
-                    p_size = random.randint(4, 10)
+                if frame_rng.random() > 0.3:  # 70% de chance d'avoir une bulle
+                    px = frame_rng.randint(20, size - 20)
+                    py = frame_rng.randint(10, size // 2 - 10)
+                    p_size = frame_rng.randint(4, 10)
                     lighter_color = (
                     min(255, self.color[0] + 20), min(255, self.color[1] + 20), min(255, self.color[2] + 20))
                     pygame.draw.circle(surf, (*lighter_color, alpha - 40), (px, py), p_size)
                     # Reflet sur la bulle
                     pygame.draw.circle(surf, (255, 255, 255, 100), (px - p_size // 3, py - p_size // 3), p_size // 3)
 
-            self.frames.append(surf)
+            frames.append(surf)
 
-    def update(self, dt):
-        """Met à jour la flaque de boue"""
-        super().update(dt)
+        return frames
+
+    def _update_bubbles(self, idx, dt):
+        """Met à jour les bulles : celles qui éclatent sont supprimées ou recréées ailleurs"""
+        system = self.particle_system
+        popped = idx[system.age[idx] >= system.lifetime[idx]]
 
-        # Mettre à jour les bulles
-        for bubble in self.bubbles:
-            if not bubble['popped'] and self.elapsed_time >= bubble['pop_time']:
-                bubble['popped'] = True
-                # Créer une nouvelle bulle ailleurs
-                if random.random() > 0.3:  # 70% de chance de remplacer
-                    bubble['x'] = self.x + random.uniform(-self.puddle_radius * 0.7, self.puddle_radius * 0.7)
-                    bubble['y'] = self.y + random.uniform(-self.puddle_radius * 0.4, self.puddle_radius * 0.4)
-                    bubble['size'] = random.uniform(3, 8)
-                    bubble['pop_time'] = self.elapsed_time + random.uniform(0.5, 2.0)
-                    bubble['popped'] = False
+        # 70% de chance de remplacer la bulle éclatée (les autres sont supprimées)
+        replaced = popped[self.rng.random(popped.size) > 0.3]
+        count = replaced.size
+        if count:
+            system.x[replaced] = self.x + self.rng.uniform(-self.puddle_radius * 0.7, self.puddle_radius * 0.7, count)
+            system.y[replaced] = self.y + self.rng.uniform(-self.puddle_radius * 0.4, self.puddle_radius * 0.4, count)
+            system.size[replaced] = self.rng.uniform(3, 8, count)
+            system.lifetime[replaced] = self.rng.uniform(0.5, 2.0, count)
+            system.age[replaced] = 0
 
     def draw(self, surface):
         """Dessine la flaque de boue"""
@@ -669,23 +602,21 @@ class MudPuddleEffect(Effect):
             surface.blit(puddle_surf, (self.x - self.puddle_radius, self.y - self.puddle_radius // 2))
 
             # Dessiner les bulles
-            for bubble in self.bubbles:
-                if not bubble['popped']:
-                    # Bulle principale
-                    pygame.draw.circle(surface, (*self.color, 200),
-                                       (int(bubble['x']), int(bubble['y'])),
-                                       int(bubble['size']))
-                    # Reflet (petit cercle blanc)
-                    pygame.draw.circle(surface, (255, 255, 255, 100),
-                                       (int(bubble['x'] - bubble['size'] / 3), int(bubble['y'] - bubble['size'] / 3)),
-                                       int(bubble['size'] / 3))
+            self.bubbles.draw(surface)
+
+            # Reflets (petits cercles blancs)
+            system = self.particle_system
+            for i in self.bubbles.indices():
+                size = system.size[i]
+                pygame.draw.circle(surface, (255, 255, 255, 100),
+                                   (int(system.x[i] - size / 3), int(system.y[i] - size / 3)), int(size / 3))
 
 
 class TornadoEffect(Effect):
     """Effet de tornade tournoyante"""
 
-    def __init__(self, x, y, color=(200, 200, 200), duration=4.0):
-        super().__init__(x, y, duration)
+    def reset(self, x, y, color=(200, 200, 200), duration=4.0, particle_system=None):
+        super().reset(x, y, duration, particle_system)
         self.color = color
         self.max_frames = 10
 
@@ -701,32 +632,30 @@ class TornadoEffect(Effect):
         self.rotation_speed = 720  # Degrés par seconde
         self.current_angle = 0
 
-        # Particules pour l'effet
-        self.particles = []
-        for _ in range(50):
-            self.particles.append({
-                'x': self.x + random.uniform(-self.width / 2, self.width / 2),
-                'y': self.y - random.uniform(0, self.height),
-                'size': random.uniform(2, 6),
-                'angle': random.uniform(0, 360),
-                'dist': random.uniform(5, self.width / 2),
-                'speed': random.uniform(1, 3),
-                'color': self.color
-            })
+        # Particules pour l'effet, qui tournent autour de l'axe jusqu'à la fin de l'effet
+        # (valeurs libres : angle, distance à l'axe, vitesse)
+        count = quality.particle_count(50)
+        self.debris = self.add_emitter(self._update_debris, fade=False)
+        self.debris.emit(count,
+                         x=self.x + self.rng.uniform(-self.width / 2, self.width / 2, count),
+                         y=self.y - self.rng.uniform(0, self.height, count),
+                         size=self.rng.uniform(2, 6, count),
+                         alpha=200, color=self.color,
+                         aux=np.column_stack((self.rng.uniform(0, 360, count),
+                                              self.rng.uniform(5, self.width / 2, count),
+                                              self.rng.uniform(1, 3, count))))
 
         # Chargement des images de tornade
-        self.frames = []
-        try:
-            for i in range(1, 11):  # Supposant 10 images nommées tornado1.png à tornado10.png
-                img = pygame.image.load(f'Assets/Art/Effects/tornado{i}.png').convert_alpha()
-                self.frames.append(img)
-        except FileNotFoundError:
-            # Images par défaut si les fichiers n'existent pas
-            self._generate_default_frames()
+        # (partagées entre les instances, générées par défaut si les fichiers n'existent pas)
+        self.frames = get_effect_frames("tornado", "tornado{}.png", 10,
+                                        self._generate_default_frames, self.color)
+
+        # Les particules ne sont dessinées qu'en l'absence d'images
+        self.debris.visible = not self.frames
 
     def _generate_default_frames(self):
         """Génère des images de tornade par défaut"""
-        self.frames = []
+        frames = []
         width, height = 80, 160
 
         for i in range(10):  # 10 frames pour l'animation de rotation
@@ -770,19 +699,21 @@ class TornadoEffect(Effect):
 
                 # Ajouter des débris qui tournent
                 for _ in range(10):
-                    h_pct = random.random()  # Position verticale
+                    h_pct = frame_rng.random()  # Position verticale
                     curr_width = base_width * (1 - h_pct * 0.7) * 0.8
 
                     # Décalage horizontal basé sur l'angle
                     h_offset = math.sin(math.radians(angle + h_pct * 360)) * curr_width / 2
 
-                    x = width / 2 + h_offset + random.uniform(-curr_width / 2, curr_width / 2)
+                    x = width / 2 + h_offset + frame_rng.uniform(-curr_width / 2, curr_width / 2)
                     y = height - 30 - h_pct * (height - 40)
-                    size = random.randint(2, 5)
+                    size = frame_rng.randint(2, 5)
 
                     pygame.draw.circle(surf, (*self.color, 220), (x, y), size)
 
-            self.frames.append(surf)
+            frames.append(surf)
+
+        return frames
 
     def update(self, dt):
         """Met à jour la tornade"""
@@ -793,27 +724,34 @@ class TornadoEffect(Effect):
         if self.current_angle >= 360:
             self.current_angle -= 360
 
-        # Mise à jour des particules
-        for p in self.particles:
-            # Faire monter les particules
-            p['y'] -= p['speed'] * dt * 60
+    def _update_debris(self, idx, dt):
+        """Met à jour les particules de la tornade"""
+        system = self.particle_system
+        aux = system.aux
+        speed = aux[idx, 2]
+
+        # Faire monter les particules
+        y = system.y[idx] - speed * dt * 60
+
+        # Quand elles atteignent le haut, les replacer en bas
+        top = idx[y < self.y - self.height]
+        y[y < self.y - self.height] = self.y
+        if top.size:
+            aux[top, 1] = self.rng.uniform(5, self.width / 2, top.size)
+            system.size[top] = self.rng.uniform(2, 6, top.size)
+        system.y[idx] = y
 
-            # Quand elles atteignent le haut, les replacer en bas
-            if p['y'] < self.y - self.height:
-                p['y'] = self.y
-                p['x'] = self.x + random.uniform(-self.width / 2, self.width / 2)
-                p['dist'] = random.uniform(5, self.width / 2)
-                p['size'] = random.uniform(2, 6)
+        # Rotation autour de l'axe central
+        angle = (aux[idx, 0] + speed * 30 * dt) % 360
+        aux[idx, 0] = angle
 
-            # Rotation autour de l'axe central
-            p['angle'] += p['speed'] * 30 * dt
-            if p['angle'] >= 360:
-                p['angle'] -= 360
+        # Calcul de la position sur le cercle
+        radial_pct = (self.y - y) / self.height  # 0 en bas, 1 en haut
+        current_radius = self.width / 2 * (1 - radial_pct * 0.7)  # Rétréci vers le haut
+        system.x[idx] = self.x + np.cos(np.radians(angle)) * current_radius * self.rng.uniform(0.7, 1.0, idx.size)
 
-            # Calcul de la position sur le cercle
-            radial_pct = (self.y - p['y']) / self.height  # 0 en bas, 1 en haut
-            current_radius = self.width / 2 * (1 - radial_pct * 0.7)  # Rétréci vers le haut
-            p['x'] = self.x + math.cos(math.radians(p['angle'])) * current_radius * random.uniform(0.7, 1.0)
+        # Particules plus transparentes en haut de la tornade
+        system.alpha[idx] = np.where(y < self.y - self.height * 0.8, 150, 200)
 
     def draw(self, surface):
         """Dessine la tornade"""
@@ -826,16 +764,14 @@ class TornadoEffect(Effect):
             surface.blit(img, img_rect)
         else:
             # Fallback: dessiner les particules
-            for p in self.particles:
-                alpha = 150 if p['y'] < self.y - self.height * 0.8 else 200
-                pygame.draw.circle(surface, (*p['color'], alpha), (int(p['x']), int(p['y'])), int(p['size']))
+            self.debris.draw(surface)
 
 
 class CrystalEffect(Effect):
     """Effet de cristal gelant"""
 
-    def __init__(self, x, y, color=(200, 220, 255), duration=3.0):
-        super().__init__(x, y, duration)
+    def reset(self, x, y, color=(200, 220, 255), duration=3.0, particle_system=None):
+        super().reset(x, y, duration, particle_system)
         self.color = color
         self.max_frames = 8
 
@@ -850,25 +786,20 @@ class CrystalEffect(Effect):
         self.crystal_points = []
 
         # Générer les points du cristal
-        num_spikes = random.randint(6, 10)
+        num_spikes = int(self.rng.integers(6, 11))
         for i in range(num_spikes):
             angle = i * (360 / num_spikes)
-            length = self.crystal_size * random.uniform(0.8, 1.2)
+            length = self.crystal_size * float(self.rng.uniform(0.8, 1.2))
             self.crystal_points.append((angle, length))
 
         # Chargement des images de cristal
-        self.frames = []
-        try:
-            for i in range(1, 9):  # Supposant 8 images nommées crystal1.png à crystal8.png
-                img = pygame.image.load(f'Assets/Art/Effects/crystal{i}.png').convert_alpha()
-                self.frames.append(img)
-        except FileNotFoundError:
-            # Images par défaut si les fichiers n'existent pas
-            self._generate_default_frames()
+        # (partagées entre les instances, générées par défaut si les fichiers n'existent pas)
+        self.frames = get_effect_frames("crystal", "crystal{}.png", 8,
+                                        self._generate_default_frames, self.color)
 
     def _generate_default_frames(self):
         """Génère des images de cristal par défaut"""
-        self.frames = []
+        frames = []
         size = 100
 
         for i in range(8):  # 8 frames pour l'animation
@@ -917,7 +848,9 @@ class CrystalEffect(Effect):
 
                 pygame.draw.polygon(surf, color, points)
 
-            self.frames.append(surf)
+            frames.append(surf)
+
+        return frames
 
     def update(self, dt):
         """Met à jour le cristal"""
@@ -979,57 +912,93 @@ class CrystalEffect(Effect):
 class EffectManager:
     """Gestionnaire des effets visuels et fonctionnels"""
 
-    def __init__(self):
+    def __init__(self, streams=None):
+        """
+        :param streams: flux aléatoires de la partie (RandomStreams, par défaut les flux partagés)
+        """
         self.effects = []
 
+        # Particules de tous les effets, mises à jour ensemble ; leur flux aléatoire (visuel)
+        # est transmis aux effets par le système de particules (Effect.rng)
+        streams = streams if streams is not None else random_streams
+        self.particles = ParticleSystem(rng=streams.numpy_stream(EFFECTS_STREAM))
+
+        # Réserves d'effets réutilisés d'un impact à l'autre (une par type d'effet)
+        self.pools = {}
+
     def add_effect(self, effect):
         """Ajoute un effet au gestionnaire"""
         self.effects.append(effect)
 
+    def acquire_effect(self, effect_class, *args, **kwargs):
+        """Crée un effet, en réutilisant si possible un effet terminé du même type"""
+        pool = self.pools.get(effect_class)
+        if pool is None:
+            pool = ObjectPool(effect_class, max_size=EFFECT_POOL_SIZE)
+            self.pools[effect_class] = pool
+        return pool.acquire(*args, particle_system=self.particles, **kwargs)
+
+    def release_effect(self, effect):
+        """Libère les particules d'un effet terminé et le rend à sa réserve"""
+        effect.release()
+        pool = self.pools.get(type(effect))
+        if pool is not None:
+            pool.release(effect)
+
+    def get_pool_stats(self):
+        """Retourne les compteurs des réserves d'effets, par type d'effet"""
+        return {effect_class.__name__: pool.stats() for effect_class, pool in self.pools.items()}
+
     def create_explosion(self, x, y, size=50, color=(255, 100, 0)):
         """Crée et ajoute un effet d'explosion"""
-        effect = ExplosionEffect(x, y, size, color)
+        effect = self.acquire_effect(ExplosionEffect, x, y, size, color)
         self.add_effect(effect)
         return effect
 
     def create_smoke(self, x, y, color=(150, 150, 150)):
         """Crée et ajoute un effet de fumée"""
-        effect = SmokeEffect(x, y, color)
+        effect = self.acquire_effect(SmokeEffect, x, y, color)
         self.add_effect(effect)
         return effect
 
     def create_water_splash(self, x, y, color=(0, 100, 255)):
         """Crée et ajoute un effet d'éclaboussure d'eau"""
-        effect = WaterEffect(x, y, color)
+        effect = self.acquire_effect(WaterEffect, x, y, color)
         self.add_effect(effect)
         return effect
 
     def create_fire_puddle(self, x, y, color=(255, 100, 0)):
         """Crée et ajoute un effet de flaque de feu"""
-        effect = FirePuddleEffect(x, y, color)
+        effect = self.acquire_effect(FirePuddleEffect, x, y, color)
         self.add_effect(effect)
         return effect
 
     def create_mud_puddle(self, x, y, color=(139, 69, 19)):
         """Crée et ajoute un effet de flaque de boue"""
-        effect = MudPuddleEffect(x, y, color)
+        effect = self.acquire_effect(MudPuddleEffect, x, y, color)
         self.add_effect(effect)
         return effect
 
     def create_tornado(self, x, y, color=(200, 200, 200)):
         """Crée et ajoute un effet de tornade"""
-        effect = TornadoEffect(x, y, color)
+        effect = self.acquire_effect(TornadoEffect, x, y, color)
         self.add_effect(effect)
         return effect
 
     def create_crystal(self, x, y, color=(200, 220, 255)):
         """Crée et ajoute un effet de cristal"""
-        effect = CrystalEffect(x, y, color)
+        effect = self.acquire_effect(CrystalEffect, x, y, color)
         self.add_effect(effect)
         return effect
 
     def create_effect_for_potion(self, potion, x, y):
         """Crée l'effet approprié en fonction du type de potion"""
+        effect = self._create_effect_for_potion(potion, x, y)
+        effect.source_name = potion.name
+        return effect
+
+    def _create_effect_for_potion(self, potion, x, y):
+        """Choisit et crée l'effet correspondant à la potion"""
         effect_name = potion.name.lower()
         effect_description = potion.effect.lower()
 
@@ -1073,18 +1042,44 @@ class EffectManager:
     def update(self, dt):
         """Met à jour tous les effets"""
         # Mettre à jour et supprimer les effets terminés
+        for effect in self.effects:
+            if effect.is_finished:
+                self.release_effect(effect)
         self.effects = [effect for effect in self.effects if not effect.is_finished]
 
         for effect in self.effects:
             effect.update(dt)
 
+        self.particles.update(dt)
+
     def draw(self, surface):
         """Dessine tous les effets"""
         for effect in self.effects:
             effect.draw(surface)
 
-    def affect_enemies(self, enemies, dt):
-        """Applique les effets aux ennemis"""
+    def affect_enemies(self, enemies, dt, spatial_hash=None):
+        """
+        Applique les effets aux ennemis
+        :param spatial_hash: SpatialHash des ennemis (optionnel), pour ne tester que les ennemis proches
+        :return: dictionnaire nom de la potion source -> dégâts infligés pendant ce pas
+        """
+        damage_by_source = {}
         for effect in self.effects:
-            for enemy in enemies:
-                effect.affect_enemy(enemy, dt)
\ No newline at end of file
+            if not effect.is_zone_effect:
+                continue
+
+            if spatial_hash is not None:
+                candidates = spatial_hash.query_radius(effect.x, effect.y, effect.zone_radius)
+            else:
+                candidates = enemies
+
+            for enemy in candidates:
+                damage = effect.affect_enemy(enemy, dt)
+
+                # La répulsion déplace l'ennemi : garder l'index à jour pour les effets suivants
+                if effect.repel_force > 0 and spatial_hash is not None:
+                    spatial_hash.update(enemy, enemy.rect)
+
+                if damage and effect.source_name is not None:
+                    damage_by_source[effect.source_name] = damage_by_source.get(effect.source_name, 0) + damage
+        return damage_by_source
\ No newline at end of file
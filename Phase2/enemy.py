@@ -1,33 +1,53 @@
 import pygame
-import random
 import math
+from texture_cache import load_texture
+from Phase2.object_pool import ObjectPool
+from Phase2.enemy_skins import enemy_skins
+from Phase2.wave_scheduler import WaveScheduler
+from constants import ENEMY_POOL_SIZE
+from rng import ENEMY_STREAM, SPAWN_STREAM, random_streams
 
 
 class Enemy(pygame.sprite.Sprite):
     """Classe représentant un ennemi dans la phase de défense"""
 
-    def __init__(self, x, y, speed=1, health=100, flying=False, floor_level=550):
+    # Images par défaut (si les fichiers n'existent pas), partagées par tous les ennemis
+    default_images = {}
+
+    def __init__(self, x, y, speed=1, health=100, flying=False, floor_level=550, rng=None):
         super().__init__()
+        self.reset(x, y, speed, health, flying, floor_level, rng)
 
+    def reset(self, x, y, speed=1, health=100, flying=False, floor_level=550, rng=None):
+        """
+        (Ré)initialise l'ennemi pour une nouvelle apparition (réutilisation par la réserve d'EnemyManager)
+        :param rng: flux random.Random du comportement des ennemis (fourni par EnemyManager)
+        """
         # Type d'ennemi (pour l'instant un seul type, mais préparé pour l'extension)
         self.flying = flying
         self.floor_level = floor_level
+        self.rng = rng if rng is not None else random_streams.stream(ENEMY_STREAM)
+        self.flight_time = 0  # Temps de vol (s), phase du mouvement sinusoïdal des ennemis volants
 
         # Chargement de l'image
         try:
             if flying:
-                self.image = pygame.image.load('Assets/Art/Enemies/flying_enemy.png').convert_alpha()
+                self.image = load_texture('Assets/Art/Enemies/flying_enemy.png')
             else:
-                self.image = pygame.image.load('Assets/Art/Enemies/ground_enemy.png').convert_alpha()
+                self.image = load_texture('Assets/Art/Enemies/ground_enemy.png')
         except FileNotFoundError:
             # Image par défaut si l'image n'existe pas
-            self.image = pygame.Surface((30, 30))
-            color = (255, 0, 0) if flying else (139, 69, 19)  # Rouge pour volant, marron pour terrestre
-            self.image.fill(color)
+            self.image = Enemy.default_images.get(flying)
+            if self.image is None:
+                self.image = pygame.Surface((30, 30))
+                color = (255, 0, 0) if flying else (139, 69, 19)  # Rouge pour volant, marron pour terrestre
+                self.image.fill(color)
+                Enemy.default_images[flying] = self.image
 
         self.rect = self.image.get_rect(topleft=(x, y))
 
-
+        # Variantes teintées de l'image selon l'état (calculées une seule fois par image)
+        enemy_skins.prepare(self.image)
 
         # Attributs de l'ennemi
         self.speed = speed
@@ -52,6 +72,7 @@ class Enemy(pygame.sprite.Sprite):
         self.freeze_duration = 0
         self.is_blinded = False
         self.blind_duration = 0
+        self.burn_source = None  # Nom de la potion responsable de la brûlure (statistiques)
         self.was_hit = False  # Pour les effets visuels
         self.hit_flash_time = 0
 
@@ -77,6 +98,7 @@ class Enemy(pygame.sprite.Sprite):
             # Effet de brûlure (dégâts sur la durée)
             if "brûlure" in effect:
                 self.is_burning = True
+                self.burn_source = potion.name
                 self.burn_damage = power * 5  # 5 points de dégâts par tick
                 self.burn_duration = duration * 3  # 3 secondes par niveau de durée
 
@@ -132,73 +154,40 @@ class Enemy(pygame.sprite.Sprite):
             effective_speed = self.speed * self.slow_factor
 
             # Si l'ennemi est aveugle, il peut aller dans une direction aléatoire
-            if self.is_blinded and random.random() < 0.1:  # 10% de chance de changer de direction
+            if self.is_blinded and self.rng.random() < 0.1:  # 10% de chance de changer de direction
                 self.direction = -self.direction
 
             self.rect.x += self.direction * effective_speed
 
             # Si l'ennemi vole, ajouter un mouvement vertical sinusoïdal
+            # (temps de simulation et non horloge murale, pour que la partie soit reproductible)
             if self.flying:
-                self.rect.y += math.sin(pygame.time.get_ticks() * 0.001) * 2
+                self.flight_time += dt
+                self.rect.y += math.sin(self.flight_time) * 2
 
         # Vérifier si l'ennemi est mort
         if self.health <= 0:
             self.kill()
 
+    def get_health_bar(self):
+        """Retourne la barre de vie de l'ennemi et sa position (au-dessus de l'ennemi)"""
+        fill_width = int(self.rect.width * (self.health / self.max_health))
+        return enemy_skins.get_health_bar(self.rect.width, fill_width), (self.rect.x, self.rect.y - 10)
+
     def draw_health_bar(self, surface):
         """Dessine la barre de vie de l'ennemi"""
-        bar_width = self.rect.width
-        bar_height = 5
+        bar, position = self.get_health_bar()
+        surface.blit(bar, position)
 
-        # Position de la barre (au-dessus de l'ennemi)
-        x = self.rect.x
-        y = self.rect.y - 10
-
-        # Fond de la barre (rouge)
-        pygame.draw.rect(surface, (255, 0, 0), (x, y, bar_width, bar_height))
-
-        # Partie remplie de la barre (vert)
-        fill_width = int(bar_width * (self.health / self.max_health))
-        pygame.draw.rect(surface, (0, 255, 0), (x, y, fill_width, bar_height))
+    def get_skin(self):
+        """Retourne l'image de l'ennemi teintée selon ses effets visuels"""
+        # Les particules de feu alternent entre plusieurs variantes pendant la brûlure
+        variant = int(self.burn_duration * 10) if self.is_burning else 0
+        return enemy_skins.get(self.image, self.was_hit, self.is_burning, self.is_frozen, self.is_slowed, variant)
 
     def draw(self, surface):
         """Dessine l'ennemi avec ses effets visuels"""
-        # Dessiner l'image de base de l'ennemi
-        img = self.image.copy()  # Copier pour ne pas modifier l'original
-
-        # Ajouter des effets visuels selon l'état
-        if self.was_hit:
-            # Flash blanc quand touché
-            white_overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
-            white_overlay.fill((255, 255, 255, 150))
-            img.blit(white_overlay, (0, 0))
-
-        if self.is_burning:
-            # Teinte rouge pour le feu
-            fire_overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
-            fire_overlay.fill((255, 0, 0, 100))
-            img.blit(fire_overlay, (0, 0))
-
-            # Particules de feu (option)
-            for _ in range(2):
-                x = random.randint(0, img.get_width())
-                y = random.randint(0, img.get_height())
-                pygame.draw.circle(img, (255, 100, 0, 200), (x, y), 2)
-
-        if self.is_frozen:
-            # Teinte bleue pour le gel
-            ice_overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
-            ice_overlay.fill((0, 100, 255, 150))
-            img.blit(ice_overlay, (0, 0))
-
-        if self.is_slowed:
-            # Teinte marron pour la boue
-            mud_overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
-            mud_overlay.fill((139, 69, 19, 100))
-            img.blit(mud_overlay, (0, 0))
-
-        # Afficher l'ennemi avec ses effets
-        surface.blit(img, self.rect)
+        surface.blit(self.get_skin(), self.rect)
 
         # Dessiner la barre de vie
         self.draw_health_bar(surface)
@@ -207,84 +196,96 @@ class Enemy(pygame.sprite.Sprite):
 class EnemyManager:
     """Gestionnaire des ennemis pour la phase de défense"""
 
-    def __init__(self, screen_width, screen_height, floor_level=550):
+    def __init__(self, screen_width, screen_height, waves, floor_level=550, streams=None):
+        """
+        :param waves: description des vagues (GameData.waves, chargée depuis Data/waves.json)
+        :param streams: flux aléatoires de la partie (RandomStreams, par défaut les flux partagés)
+        """
         self.enemies = pygame.sprite.Group()
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.floor_level = floor_level
 
-        # Paramètres de spawn
-        self.spawn_timer = 0
-        self.spawn_interval = 3.0  # Intervalle en secondes entre les spawns
-        self.max_enemies = 10  # Nombre maximum d'ennemis simultanés
-        self.wave_size = 20  # Nombre total d'ennemis dans une vague
-        self.enemies_spawned = 0  # Compteur d'ennemis générés
-
-        # Difficulté
-        self.difficulty = 1  # Niveau de difficulté (augmente avec les vagues)
+        # Statistiques de la partie
+        self.enemies_killed = 0
+        self.enemies_reached_lab = 0
 
-    def spawn_enemy(self):
-        """Génère un nouvel ennemi"""
-        if len(self.enemies) >= self.max_enemies or self.enemies_spawned >= self.wave_size:
-            return
+        # Flux aléatoires : apparitions et comportement des ennemis, indépendants des effets visuels
+        streams = streams if streams is not None else random_streams
+        self.spawn_rng = streams.stream(SPAWN_STREAM)
+        self.behavior_rng = streams.stream(ENEMY_STREAM)
 
-        # Décider si l'ennemi vole ou est au sol
-        flying = random.random() > 0.7  # 30% de chance d'avoir un ennemi volant
+        # Vagues décrites dans Data/waves.json, compilées en chronologies d'apparition
+        self.scheduler = WaveScheduler(waves, self.spawn_rng)
 
-        # Position de départ (toujours à droite de l'écran)
-        x = self.screen_width + 50
+        # Réserve d'ennemis réutilisés d'une apparition à l'autre
+        self.enemy_pool = ObjectPool(Enemy, max_size=ENEMY_POOL_SIZE)
 
-        # La hauteur dépend du type d'ennemi
-        if flying:
-            # Les ennemis volants apparaissent en hauteur
-            y = random.randint(100, 280)  # Au-dessus du sol
-        else:
-            # Les ennemis au sol apparaissent au niveau du sol
-            y = self.floor_level - 30  # 30 pixels au-dessus du sol
+        self.wave = 0
+        self.start_wave(1)
 
-        # Paramètres de l'ennemi en fonction de la difficulté
-        speed = 0.5 + (0.2 * self.difficulty)
-        health = 80 + (20 * self.difficulty)
+    def start_wave(self, wave):
+        """Compile la chronologie d'apparition d'une vague et la démarre"""
+        self.wave = wave
+        self.wave_time = 0.0  # Horloge de la chronologie (arrêtée quand le maximum d'ennemis est atteint)
+        self.timeline = self.scheduler.compile(wave, self.screen_width + 50, self.floor_level)
+        self.difficulty = self.scheduler.difficulty(wave)  # Niveau de difficulté (augmente avec les vagues)
+        self.max_enemies = self.scheduler.max_enemies_for(wave)  # Nombre maximum d'ennemis simultanés
+        self.wave_size = len(self.timeline)  # Nombre total d'ennemis dans la vague
+        self.enemies_spawned = 0  # Compteur d'ennemis générés
 
-        # Créer et ajouter l'ennemi
-        enemy = Enemy(x, y, speed, health, flying, self.floor_level)
+    def spawn(self, entry):
+        """Fait apparaître l'ennemi d'une entrée de chronologie (instant, volant, x, y, vitesse, vie)"""
+        _, flying, x, y, speed, health = entry
+        # Créer (ou réutiliser) et ajouter l'ennemi
+        enemy = self.enemy_pool.acquire(x, y, speed, health, flying, self.floor_level, self.behavior_rng)
         self.enemies.add(enemy)
         self.enemies_spawned += 1
 
+    def spawn_enemy(self):
+        """Fait apparaître un ennemi immédiatement, hors chronologie (scripts, bancs d'essai)"""
+        if len(self.enemies) >= self.max_enemies:
+            return
+        self.spawn(self.scheduler.make_entry(self.wave, self.screen_width + 50, self.floor_level))
+
     def update(self, dt):
         """Mise à jour du gestionnaire et des ennemis"""
-        # Gestion du spawn
-        self.spawn_timer += dt
-        if self.spawn_timer >= self.spawn_interval and self.enemies_spawned < self.wave_size:
-            self.spawn_enemy()
-            self.spawn_timer = 0
+        # Apparitions dues à ce pas. La chronologie est suspendue tant que le nombre maximum
+        # d'ennemis est atteint : les apparitions suivantes sont décalées du temps d'attente
+        # et gardent leur espacement, au lieu de sortir toutes ensemble au même endroit
+        if len(self.enemies) < self.max_enemies:
+            self.wave_time += dt
+        while len(self.enemies) < self.max_enemies:
+            entry = self.timeline.next_due(self.wave_time)
+            if entry is None:
+                break
+            self.spawn(entry)
 
         # Mise à jour des ennemis
+        enemies = self.enemies.sprites()
         self.enemies.update(dt)
+        self.enemies_killed += len(enemies) - len(self.enemies)
+
+        # Rendre à la réserve les ennemis morts
+        for enemy in enemies:
+            if not enemy.alive():
+                self.enemy_pool.release(enemy)
 
     def draw(self, surface):
-        """Dessine tous les ennemis"""
+        """Dessine tous les ennemis et leurs barres de vie en un seul appel à blits()"""
+        batch = []
         for enemy in self.enemies:
-            surface.blit(enemy.image, enemy.rect)
-            enemy.draw_health_bar(surface)
+            batch.append((enemy.get_skin(), enemy.rect))
+            batch.append(enemy.get_health_bar())
+        surface.blits(batch, False)
 
     def is_wave_complete(self):
         """Vérifie si la vague d'ennemis est terminée"""
-        return self.enemies_spawned >= self.wave_size and len(self.enemies) == 0
+        return self.timeline.is_finished() and len(self.enemies) == 0
 
     def reset_for_new_wave(self):
-        """Réinitialise le gestionnaire pour une nouvelle vague"""
-        self.enemies_spawned = 0
-        self.spawn_timer = 0
-        self.difficulty += 0.5  # Augmentation de la difficulté
-        self.spawn_interval *= 0.9  # Réduction de l'intervalle de spawn
-        if self.spawn_interval < 0.5:
-            self.spawn_interval = 0.5  # Limite minimale
-
-        # Augmentation du nombre d'ennemis par vague
-        self.wave_size = int(self.wave_size * 1.2)
-        if self.wave_size > 50:
-            self.wave_size = 50  # Limite maximale
+        """Passe à la vague suivante (difficulté, taille et rythme viennent de Data/waves.json)"""
+        self.start_wave(self.wave + 1)
 
     def check_enemy_reached_lab(self):
         """Vérifie si un ennemi a atteint le laboratoire et retourne le nombre d'ennemis qui l'ont atteint"""
@@ -292,5 +293,7 @@ class EnemyManager:
         for enemy in list(self.enemies):
             if enemy.rect.x <= 0:
                 enemy.kill()
+                self.enemy_pool.release(enemy)
                 count += 1
+        self.enemies_reached_lab += count
         return count
\ No newline at end of file
@@ -0,0 +1,109 @@
+import weakref
+
+import pygame
+
+from rng import EFFECT_FRAMES_STREAM, get_stream
+
+# Teintes appliquées selon l'état de l'ennemi, dans l'ordre de superposition
+HIT_TINT = (255, 255, 255, 150)  # Flash blanc quand touché
+BURN_TINT = (255, 0, 0, 100)  # Teinte rouge pour le feu
+FROZEN_TINT = (0, 100, 255, 150)  # Teinte bleue pour le gel
+SLOWED_TINT = (139, 69, 19, 100)  # Teinte marron pour la boue
+
+# Nombre de variantes des particules de feu (alternées pour faire scintiller la brûlure)
+BURN_VARIANTS = 3
+
+HEALTH_BAR_HEIGHT = 5
+
+
+class EnemySkinCache:
+    """
+    Variantes teintées des images d'ennemis, calculées une seule fois par image.
+    Chaque combinaison d'états (touché, en feu, gelé, ralenti) a son image prête
+    à être affichée : dessiner un ennemi se résume à une recherche et un blit,
+    sans copie ni surface temporaire à chaque image.
+    Les barres de vie sont mises en cache de la même façon (une par largeur remplie).
+    """
+
+    def __init__(self):
+        self.skins = weakref.WeakKeyDictionary()  # image -> {(touché, feu, gelé, ralenti, variante): surface}
+        self.health_bars = {}  # (largeur, largeur remplie) -> surface
+
+    def prepare(self, image):
+        """Calcule toutes les variantes d'une image (sans effet si c'est déjà fait)"""
+        if image in self.skins:
+            return self.skins[image]
+
+        variants = {}
+        for hit in (False, True):
+            for burning in (False, True):
+                for frozen in (False, True):
+                    for slowed in (False, True):
+                        for variant in range(BURN_VARIANTS if burning else 1):
+                            variants[(hit, burning, frozen, slowed, variant)] = \
+                                self._make_skin(image, hit, burning, frozen, slowed)
+        self.skins[image] = variants
+        return variants
+
+    def get(self, image, hit=False, burning=False, frozen=False, slowed=False, variant=0):
+        """
+        Retourne l'image teintée correspondant aux états donnés (partagée, ne pas la modifier)
+        :param variant: numéro de la variante des particules de feu (utilisé si burning)
+        """
+        variants = self.skins.get(image)
+        if variants is None:
+            variants = self.prepare(image)
+        return variants[(hit, burning, frozen, slowed, variant % BURN_VARIANTS if burning else 0)]
+
+    def get_health_bar(self, width, fill_width):
+        """Retourne la barre de vie d'une largeur donnée, remplie sur fill_width pixels"""
+        fill_width = max(0, min(width, fill_width))
+        key = (width, fill_width)
+        bar = self.health_bars.get(key)
+        if bar is None:
+            bar = pygame.Surface((width, HEALTH_BAR_HEIGHT))
+            # Fond rouge, partie remplie verte
+            bar.fill((255, 0, 0))
+            bar.fill((0, 255, 0), (0, 0, fill_width, HEALTH_BAR_HEIGHT))
+            self.health_bars[key] = bar
+        return bar
+
+    def clear(self):
+        """Vide le cache (par exemple après un changement de mode vidéo)"""
+        self.skins.clear()
+        self.health_bars.clear()
+
+    @staticmethod
+    def _make_skin(image, hit, burning, frozen, slowed):
+        """Compose une variante en superposant les teintes des états actifs"""
+        img = image.copy()
+
+        def tint(color):
+            overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+            overlay.fill(color)
+            img.blit(overlay, (0, 0))
+
+        if hit:
+            tint(HIT_TINT)
+
+        if burning:
+            tint(BURN_TINT)
+
+            # Particules de feu
+            rng = get_stream(EFFECT_FRAMES_STREAM)
+            for _ in range(2):
+                x = rng.randint(0, img.get_width())
+                y = rng.randint(0, img.get_height())
+                pygame.draw.circle(img, (255, 100, 0, 200), (x, y), 2)
+
+        if frozen:
+            tint(FROZEN_TINT)
+
+        if slowed:
+            tint(SLOWED_TINT)
+
+        return img
+
+
+# Cache partagé par tous les ennemis
+enemy_skins = EnemySkinCache()
@@ -1,4 +1,5 @@
 import pygame
+from texture_cache import load_texture
 
 
 class Laboratory:
@@ -17,7 +18,7 @@ class Laboratory:
 
         # Chargement des images
         try:
-            self.image = pygame.image.load('Assets/Art/Buildings/laboratory.png').convert_alpha()
+            self.image = load_texture('Assets/Art/Buildings/laboratory.png')
         except FileNotFoundError:
             # Image par défaut
             self.image = pygame.Surface((width, height))
@@ -1,12 +1,23 @@
 import pygame
 import math
 
+from Phase2.object_pool import ObjectPool
+from texture_atlas import get_scaled_icon
+from render_target import to_internal
+from quality import quality
+from constants import PROJECTILE_POOL_SIZE
+
 
 class PotionProjectile(pygame.sprite.Sprite):
     """Classe représentant une potion lancée comme projectile"""
 
     def __init__(self, x, y, angle, power, potion, floor_level=320):
         super().__init__()
+        self.trail = []
+        self.reset(x, y, angle, power, potion, floor_level)
+
+    def reset(self, x, y, angle, power, potion, floor_level=320):
+        """(Ré)initialise le projectile pour un nouveau lancer (réutilisation par la réserve du lanceur)"""
         # Référence à la potion
         self.potion = potion
         self.floor_level = floor_level
@@ -14,12 +25,12 @@ class PotionProjectile(pygame.sprite.Sprite):
         # Déterminer si c'est une pierre ou une potion
         self.is_stone = potion.name == "Pierre"
 
-        # Chargement de l'image
+        # Chargement de l'image (partagée avec la potion, redimensionnée une seule fois)
         try:
-            self.image = potion.image.copy()
+            self.image = potion.image
             if self.image.get_width() > 20 or self.image.get_height() > 20:
                 size = 15 if self.is_stone else 20
-                self.image = pygame.transform.scale(self.image, (size, size))
+                self.image = get_scaled_icon(self.image, (size, size))
         except (AttributeError, pygame.error):
             size = 8 if self.is_stone else 10
             self.image = pygame.Surface((size, size))
@@ -48,8 +59,8 @@ class PotionProjectile(pygame.sprite.Sprite):
         self.gravity = 25.0
 
         # Effet de traînée (pour l'animation)
-        self.trail = []
-        self.max_trail_length = 5 if self.is_stone else 10
+        self.trail.clear()
+        self.max_trail_length = quality.trail_length(5 if self.is_stone else 10)
 
     def update(self, dt):
         """Mise à jour de la position du projectile"""
@@ -109,10 +120,17 @@ class Launcher:
         # Projectiles actifs
         self.projectiles = pygame.sprite.Group()
 
+        # Réserve de projectiles réutilisés d'un lancer à l'autre
+        self.projectile_pool = ObjectPool(PotionProjectile, on_release=self.on_projectile_released,
+                                          max_size=PROJECTILE_POOL_SIZE)
+
         # État
         self.is_aiming = False
         self.selected_potion = None
 
+        # Nombre de lancers (potions et pierres)
+        self.launches = 0
+
     def set_angle(self, angle):
         """Définit l'angle du lanceur"""
         self.angle = max(0, min(90, angle))
@@ -142,9 +160,10 @@ class Launcher:
         launch_x, launch_y = self.get_end_position()
 
         # Créer un projectile
-        projectile = PotionProjectile(launch_x, launch_y, self.angle, self.power, self.selected_potion,
-                                      self.floor_level)
+        projectile = self.projectile_pool.acquire(launch_x, launch_y, self.angle, self.power,
+                                                  self.selected_potion, self.floor_level)
         self.projectiles.add(projectile)
+        self.launches += 1
 
         # Retourner la potion lancée pour la retirer de l'inventaire
         potion = self.selected_potion
@@ -171,8 +190,10 @@ class Launcher:
         launch_x, launch_y = self.get_end_position()
 
         # Créer le projectile
-        projectile = PotionProjectile(launch_x, launch_y, self.angle, self.power, stone, self.floor_level)
+        projectile = self.projectile_pool.acquire(launch_x, launch_y, self.angle, self.power, stone,
+                                                  self.floor_level)
         self.projectiles.add(projectile)
+        self.launches += 1
 
         self.is_aiming = False
         return None
@@ -193,7 +214,7 @@ class Launcher:
         elif event.type == pygame.MOUSEMOTION:
             if self.is_aiming:
                 # Calculer l'angle en fonction de la position de la souris
-                mouse_x, mouse_y = event.pos
+                mouse_x, mouse_y = to_internal(event.pos)
                 dx = mouse_x - self.x
                 dy = self.y - mouse_y
 
@@ -211,8 +232,21 @@ class Launcher:
 
     def update(self, dt):
         """Mise à jour du lanceur et des projectiles"""
+        projectiles = self.projectiles.sprites()
         self.projectiles.update(dt)
 
+        # Rendre à la réserve les projectiles sortis de l'écran
+        for projectile in projectiles:
+            if not projectile.alive():
+                self.projectile_pool.release(projectile)
+
+    @staticmethod
+    def on_projectile_released(projectile):
+        """Libère les références d'un projectile rendu à la réserve"""
+        projectile.potion = None
+        projectile.image = None
+        projectile.trail.clear()
+
     def draw(self, surface):
         """Dessine le lanceur et sa trajectoire prévue"""
         # Calculer les coordonnées de fin du lanceur
@@ -255,8 +289,10 @@ class Launcher:
 
         pos_x, pos_y = start_x, start_y
 
-        dt = 0.05
-        for i in range(40):
+        # Aperçu sur 2 secondes, plus ou moins dense selon la qualité graphique
+        point_count = quality.trajectory_points
+        dt = 2.0 / point_count
+        for i in range(point_count):
             vel_y += gravity * dt
             pos_x += vel_x * dt
             pos_y += vel_y * dt
@@ -275,10 +311,11 @@ class Launcher:
             pygame.draw.circle(point_surface, color, (2, 2), 2)
             surface.blit(point_surface, (x - 2, y - 2))
 
-    def check_collision_with_enemies(self, enemies, effect_manager=None):
+    def check_collision_with_enemies(self, enemies, effect_manager=None, spatial_hash=None):
         """
         Vérifie les collisions entre les projectiles et les ennemis
         Si un effect_manager est fourni, crée aussi des effets au sol
+        Si un spatial_hash (SpatialHash des ennemis) est fourni, seuls les ennemis proches sont testés
         """
         hits = []
 
@@ -292,20 +329,26 @@ class Launcher:
 
                 # Effet de zone pour certaines potions
                 if hasattr(projectile.potion, 'category') and projectile.potion.category == "Zone":
-                    for enemy in enemies:
-                        distance = math.sqrt((enemy.rect.centerx - projectile.rect.centerx) ** 2 +
-                                             (enemy.rect.centery - projectile.rect.centery) ** 2)
-                        if distance < 100:
-                            hits.append((enemy, projectile.potion))
-                            # Marquer l'ennemi comme touché pour l'effet visuel
-                            enemy.was_hit = True
-                            enemy.hit_flash_time = 0.1  # Durée du flash en secondes
+                    center_x, center_y = projectile.rect.center
+                    if spatial_hash is not None:
+                        targets = spatial_hash.query_radius(center_x, center_y, 100, inclusive=False)
+                    else:
+                        targets = [enemy for enemy in enemies
+                                   if (enemy.rect.centerx - center_x) ** 2 + (enemy.rect.centery - center_y) ** 2
+                                   < 100 ** 2]
+                    for enemy in targets:
+                        hits.append((enemy, projectile.potion))
+                        # Marquer l'ennemi comme touché pour l'effet visuel
+                        enemy.was_hit = True
+                        enemy.hit_flash_time = 0.1  # Durée du flash en secondes
 
                 projectile.kill()
+                self.projectile_pool.release(projectile)
                 continue
 
-                # Collision directe avec un ennemi
-            for enemy in enemies:
+            # Collision directe avec un ennemi
+            candidates = spatial_hash.query_rect(projectile.rect) if spatial_hash is not None else enemies
+            for enemy in candidates:
                 if projectile.rect.colliderect(enemy.rect):
                     hits.append((enemy, projectile.potion))
                     # Marquer l'ennemi comme touché pour l'effet visuel
@@ -318,6 +361,7 @@ class Launcher:
                                                                     projectile.rect.centery)
 
                     projectile.kill()
+                    self.projectile_pool.release(projectile)
                     break
 
         return hits
\ No newline at end of file
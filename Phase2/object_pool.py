@@ -0,0 +1,84 @@
+class ObjectPool:
+    """
+    Réserve d'objets réutilisables (projectiles, ennemis, effets).
+    Au lieu de créer un nouvel objet à chaque lancer, apparition ou impact, acquire()
+    réinitialise un objet rendu par release() ; on évite ainsi les allocations en rafale
+    (et les pauses du ramasse-miettes) pendant les grosses vagues.
+    """
+
+    def __init__(self, factory, reset=None, on_release=None, max_size=None):
+        """
+        :param factory: fonction créant un nouvel objet à partir des arguments d'acquire()
+        :param reset: fonction (objet, *args, **kwargs) réinitialisant un objet réutilisé
+                      (par défaut : objet.reset(*args, **kwargs))
+        :param on_release: fonction (objet) appelée quand l'objet est rendu (libérer ses références...)
+        :param max_size: nombre maximum d'objets libres gardés en réserve (None = pas de limite)
+        """
+        self.factory = factory
+        self.reset = reset
+        self.on_release = on_release
+        self.max_size = max_size
+
+        self.free = []
+        self.live = set()
+
+        # Compteurs
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.peak_live = 0
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, *args, **kwargs):
+        """Retourne un objet initialisé avec les arguments donnés (réutilisé si possible)"""
+        if self.free:
+            obj = self.free.pop()
+            if self.reset is not None:
+                self.reset(obj, *args, **kwargs)
+            else:
+                obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+
+        self.live.add(obj)
+        self.peak_live = max(self.peak_live, len(self.live))
+        return obj
+
+    def release(self, obj):
+        """
+        Rend un objet à la réserve (sans effet s'il a déjà été rendu ou ne vient pas de la réserve)
+        :return: True si l'objet a été rendu
+        """
+        if obj not in self.live:
+            return False
+        self.live.remove(obj)
+
+        if self.on_release is not None:
+            self.on_release(obj)
+
+        if self.max_size is None or len(self.free) < self.max_size:
+            self.free.append(obj)
+        else:
+            self.discarded += 1
+        return True
+
+    def clear(self):
+        """Vide la réserve d'objets libres"""
+        self.free.clear()
+
+    def stats(self):
+        """Retourne les compteurs de la réserve"""
+        acquired = self.created + self.reused
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "reuse_rate": self.reused / acquired if acquired else 0.0,
+            "live": len(self.live),
+            "peak_live": self.peak_live,
+            "free": len(self.free),
+            "discarded": self.discarded,
+        }
@@ -0,0 +1,282 @@
+import numpy as np
+import pygame
+
+from constants import PARTICLE_CAPACITY
+from rng import EFFECTS_STREAM, random_streams
+
+# Nombre de niveaux d'opacité distincts pour les sprites de particules en cache
+ALPHA_LEVELS = 16
+
+
+class Emitter:
+    """
+    Émetteur de particules appartenant à un effet.
+    Ses particules sont stockées dans le ParticleSystem partagé ; l'effet peut
+    fournir un update_hook pour leur appliquer un comportement particulier.
+    """
+
+    def __init__(self, system, emitter_id, update_hook=None, visible=True, fade=True, color_shift=None):
+        """
+        :param system: ParticleSystem qui stocke les particules
+        :param emitter_id: identifiant de l'émetteur dans le système
+        :param update_hook: fonction (indices, dt) appelée à chaque mise à jour avec les
+                            indices des particules actives de l'émetteur
+        :param visible: False pour mettre à jour les particules sans les dessiner
+        :param fade: True pour que l'opacité diminue avec l'âge de la particule
+        :param color_shift: variation (r, g, b) de la couleur entre la naissance et la mort
+        """
+        self.system = system
+        self.id = emitter_id
+        self.update_hook = update_hook
+        self.visible = visible
+        self.fade = fade
+        self.color_shift = None if color_shift is None else np.asarray(color_shift, dtype=np.float32)
+
+    def emit(self, count, **fields):
+        """Ajoute des particules (voir ParticleSystem.emit)"""
+        return self.system.emit(self, count, **fields)
+
+    def indices(self):
+        """Indices des particules de cet émetteur"""
+        return self.system.indices_of(self)
+
+    def draw(self, surface):
+        """Dessine les particules de cet émetteur"""
+        self.system.draw_emitter(surface, self)
+
+    def release(self):
+        """Supprime l'émetteur et toutes ses particules"""
+        self.system.remove_emitter(self)
+
+
+class ParticleSystem:
+    """
+    Moteur de particules partagé par les effets de la phase 2.
+    Position, vitesse, durée de vie, taille et couleur sont stockées dans des
+    tableaux NumPy contigus, mis à jour par opérations vectorisées. Les particules
+    mortes sont supprimées par compactage et l'affichage se fait par lots (blits)
+    avec des sprites de cercles mis en cache.
+
+    Les vitesses, la gravité et la croissance sont exprimées par pas de 1/60 s,
+    comme dans les anciens effets.
+    """
+
+    # Champs flottants d'une particule et leur valeur par défaut
+    FLOAT_FIELDS = {
+        "x": 0.0, "y": 0.0,
+        "vx": 0.0, "vy": 0.0,
+        "age": 0.0, "lifetime": np.inf, "delay": 0.0,
+        "size": 1.0, "growth": 0.0,
+        "gravity": 0.0, "drag": 1.0,
+        "alpha": 255.0,
+    }
+    # Nombre de valeurs libres par particule, à la disposition des émetteurs
+    AUX_SIZE = 4
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, rng=None):
+        """
+        :param capacity: nombre de particules alloué au départ (doublé si nécessaire)
+        :param rng: générateur numpy.random.Generator pour les comportements aléatoires
+        """
+        self.rng = rng if rng is not None else random_streams.numpy_stream(EFFECTS_STREAM)
+        self.capacity = capacity
+        self.count = 0
+
+        self.fields = {name: np.full(capacity, default, dtype=np.float32)
+                       for name, default in self.FLOAT_FIELDS.items()}
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.aux = np.zeros((capacity, self.AUX_SIZE), dtype=np.float32)
+        self.emitter = np.full(capacity, -1, dtype=np.int32)
+
+        self.emitters = {}
+        self.next_emitter_id = 0
+
+        # Sprites de cercles déjà dessinés : (rayon, r, g, b, opacité) -> Surface
+        self.sprites = {}
+
+    def __len__(self):
+        return self.count
+
+    def __getattr__(self, name):
+        # Accès direct aux champs : system.x, system.vy... (vues sur les particules vivantes)
+        fields = self.__dict__.get("fields")
+        if fields is not None and name in fields:
+            return fields[name][:self.count]
+        raise AttributeError(name)
+
+    def add_emitter(self, update_hook=None, visible=True, fade=True, color_shift=None):
+        """Crée un émetteur (voir Emitter)"""
+        emitter = Emitter(self, self.next_emitter_id, update_hook, visible, fade, color_shift)
+        self.emitters[emitter.id] = emitter
+        self.next_emitter_id += 1
+        return emitter
+
+    def remove_emitter(self, emitter):
+        """Supprime un émetteur et ses particules"""
+        if self.emitters.pop(emitter.id, None) is None:
+            return
+        self._compact(self.emitter[:self.count] != emitter.id)
+
+    def emit(self, emitter, count, color=(255, 255, 255), aux=None, **fields):
+        """
+        Ajoute des particules à un émetteur
+        :param count: nombre de particules
+        :param color: couleur (r, g, b), commune ou tableau (count, 3)
+        :param aux: valeurs libres, tableau (count, n) avec n <= AUX_SIZE
+        :param fields: valeurs des champs (x, y, vx, vy, lifetime...), scalaires ou tableaux de taille count
+        :return: tranche des indices des nouvelles particules
+        """
+        if count <= 0:
+            return slice(self.count, self.count)
+
+        unknown = set(fields) - set(self.FLOAT_FIELDS)
+        if unknown:
+            raise ValueError(f"Erreur : champs de particule inconnus : {', '.join(sorted(unknown))}")
+
+        self._reserve(self.count + count)
+        new = slice(self.count, self.count + count)
+
+        for name, default in self.FLOAT_FIELDS.items():
+            self.fields[name][new] = fields.get(name, default)
+        self.color[new] = color
+        self.aux[new] = 0.0
+        if aux is not None:
+            aux = np.asarray(aux, dtype=np.float32).reshape(count, -1)
+            self.aux[new, :aux.shape[1]] = aux
+        self.emitter[new] = emitter.id
+
+        self.count += count
+        return new
+
+    def indices_of(self, emitter):
+        """Indices des particules d'un émetteur"""
+        return np.flatnonzero(self.emitter[:self.count] == emitter.id)
+
+    def update(self, dt):
+        """Fait avancer toutes les particules"""
+        n = self.count
+        if n == 0:
+            return
+
+        f = {name: array[:n] for name, array in self.fields.items()}
+        step = dt * 60
+
+        # Les particules en attente ne bougent pas et ne vieillissent pas
+        waiting = f["delay"] > 0
+        f["delay"][waiting] -= dt
+        active = ~waiting
+        f["age"][active] += dt
+
+        moving = active & (f["age"] < f["lifetime"])
+        f["x"][moving] += f["vx"][moving] * step
+        f["y"][moving] += f["vy"][moving] * step
+        f["vy"][moving] += f["gravity"][moving] * step
+        f["vy"][moving] *= f["drag"][moving] ** step
+
+        # Croissance pendant la première moitié de la vie
+        growing = moving & (f["age"] < f["lifetime"] * 0.5)
+        f["size"][growing] += f["growth"][growing] * step
+
+        # Comportements propres à chaque émetteur
+        for emitter in list(self.emitters.values()):
+            if emitter.update_hook is not None:
+                indices = np.flatnonzero((self.emitter[:n] == emitter.id) & active)
+                if indices.size:
+                    emitter.update_hook(indices, dt)
+
+        # Compactage : on retire les particules arrivées en fin de vie
+        self._compact(self.fields["age"][:n] < self.fields["lifetime"][:n])
+
+    def draw_emitter(self, surface, emitter):
+        """Dessine les particules visibles d'un émetteur en un seul appel à blits()"""
+        if not emitter.visible:
+            return
+
+        n = self.count
+        age = self.fields["age"][:n]
+        lifetime = self.fields["lifetime"][:n]
+        mask = (self.emitter[:n] == emitter.id) & (self.fields["delay"][:n] <= 0) & (age < lifetime)
+        indices = np.flatnonzero(mask)
+        if not indices.size:
+            return
+
+        life = np.where(np.isfinite(lifetime[indices]), age[indices] / lifetime[indices], 0.0)
+
+        alpha = self.fields["alpha"][:n][indices]
+        if emitter.fade:
+            alpha = alpha * (1 - life)
+        alpha_level = np.clip((alpha * ALPHA_LEVELS / 256).astype(np.int32), 0, ALPHA_LEVELS - 1)
+
+        color = self.color[indices]
+        if emitter.color_shift is not None:
+            color = color + life[:, None] * emitter.color_shift
+        color = np.clip(color, 0, 255).astype(np.int32)
+
+        radius = np.maximum(self.fields["size"][:n][indices].astype(np.int32), 1)
+        x = self.fields["x"][:n][indices].astype(np.int32) - radius
+        y = self.fields["y"][:n][indices].astype(np.int32) - radius
+
+        batch = []
+        visible = alpha > 0
+        for r, (cr, cg, cb), level, px, py, shown in zip(radius.tolist(), color.tolist(), alpha_level.tolist(),
+                                                       x.tolist(), y.tolist(), visible.tolist()):
+            if shown:
+                batch.append((self._sprite(r, cr, cg, cb, level), (px, py)))
+        surface.blits(batch, False)
+
+    def clear(self):
+        """Supprime toutes les particules et tous les émetteurs"""
+        self.count = 0
+        self.emitters.clear()
+
+    def _sprite(self, radius, r, g, b, level):
+        """Retourne (en le créant au besoin) le sprite d'un cercle coloré"""
+        key = (radius, r, g, b, level)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            alpha = min(255, (level + 1) * 256 // ALPHA_LEVELS)
+            pygame.draw.circle(sprite, (r, g, b, alpha), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+
+    def _reserve(self, needed):
+        """Agrandit les tableaux (capacité doublée) si nécessaire"""
+        if needed <= self.capacity:
+            return
+
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+
+        for name, default in self.FLOAT_FIELDS.items():
+            grown = np.full(capacity, default, dtype=np.float32)
+            grown[:self.count] = self.fields[name][:self.count]
+            self.fields[name] = grown
+
+        grown_color = np.zeros((capacity, 3), dtype=np.float32)
+        grown_color[:self.count] = self.color[:self.count]
+        self.color = grown_color
+
+        grown_aux = np.zeros((capacity, self.AUX_SIZE), dtype=np.float32)
+        grown_aux[:self.count] = self.aux[:self.count]
+        self.aux = grown_aux
+
+        grown_emitter = np.full(capacity, -1, dtype=np.int32)
+        grown_emitter[:self.count] = self.emitter[:self.count]
+        self.emitter = grown_emitter
+
+        self.capacity = capacity
+
+    def _compact(self, keep):
+        """Ne garde que les particules indiquées (masque sur les particules vivantes)"""
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return
+
+        for array in self.fields.values():
+            array[:kept] = array[:self.count][keep]
+        self.color[:kept] = self.color[:self.count][keep]
+        self.aux[:kept] = self.aux[:self.count][keep]
+        self.emitter[:kept] = self.emitter[:self.count][keep]
+        self.count = kept
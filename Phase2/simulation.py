@@ -0,0 +1,126 @@
+"""
+Simulation de la phase de défense sans affichage, plus rapide que le temps réel.
+Sert à équilibrer les courbes de difficulté d'EnemyManager sur un grand nombre de parties.
+
+Exemple :
+    python -m Phase2.simulation --runs 1000 --output resultats.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+
+import pygame
+
+from constants import SIMULATION_STEP
+from Phase1.data_loader import load_game_data
+from Phase2.defense_game import DefenseGame
+
+
+class SimulatedPotion:
+    """Potion sans image, avec les seuls attributs utilisés par la phase de défense"""
+
+    def __init__(self, name, effect, category, power=1, duration=1):
+        self.name = name
+        self.effect = effect
+        self.category = category
+        self.power = power
+        self.duration = duration
+        self.image = None  # Le projectile utilise alors son image par défaut
+
+    @classmethod
+    def from_data(cls, potion_data, power=1, duration=1):
+        """Crée une potion simulée à partir des données JSON d'une potion"""
+        return cls(potion_data["name"], potion_data["effect"], potion_data["category"], power, duration)
+
+
+class SimulatedPlayer:
+    """Joueur minimal recevant le score et l'expérience en fin de partie"""
+
+    def __init__(self):
+        self.score = 0
+        self.experience = 0
+
+    def gain_experience(self, amount):
+        self.experience += amount
+
+
+def init_headless():
+    """
+    Initialise pygame avec le pilote vidéo factice de SDL (aucune fenêtre)
+    :return: la surface d'affichage factice
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    # Une surface d'affichage est nécessaire pour convert() / convert_alpha()
+    return pygame.display.set_mode((1, 1))
+
+
+def run_headless(potions, waves, commands, dt=SIMULATION_STEP, max_time=600.0, max_waves=None, screen=None, seed=None):
+    """
+    Simule une partie de défense complète
+    :param potions: Potions disponibles au départ
+    :param waves: Description des vagues (GameData.waves)
+    :param commands: Liste de lancers (temps en secondes, angle, puissance, nom de la potion ou None)
+    :param dt: Pas de simulation fixe en secondes
+    :param max_time: Durée maximale simulée en secondes
+    :param max_waves: Arrête la simulation après cette vague (None = pas de limite)
+    :param screen: Surface d'affichage (créée par init_headless si None)
+    :param seed: Graine des flux aléatoires (None pour une graine tirée au hasard, donnée dans le résultat)
+    :return: Dictionnaire de résultats (score, vague, santé du laboratoire, touches, dégâts par potion...)
+    """
+    if screen is None:
+        screen = pygame.display.get_surface() or init_headless()
+
+    game = DefenseGame(screen, SimulatedPlayer(), potions, waves, headless=True, seed=seed)
+    return game.run_headless(commands, dt, max_time, max_waves)
+
+
+def volley_commands(potions, interval=2.0, angle=45, power=7, stones=0):
+    """
+    Script de lancers simple : chaque potion à intervalle régulier, puis des pierres
+    :return: Liste de commandes pour run_headless
+    """
+    commands = [(i * interval, angle, power, potion.name) for i, potion in enumerate(potions)]
+    start = len(commands)
+    commands += [((start + i) * interval, angle, power, None) for i in range(stones)]
+    return commands
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation de la phase de défense sans affichage")
+    parser.add_argument("--runs", type=int, default=1, help="Nombre de parties à simuler")
+    parser.add_argument("--max-time", type=float, default=600.0, help="Durée maximale d'une partie (s)")
+    parser.add_argument("--max-waves", type=int, default=None, help="Dernière vague simulée")
+    parser.add_argument("--interval", type=float, default=2.0, help="Temps entre deux lancers (s)")
+    parser.add_argument("--angle", type=float, default=45, help="Angle des lancers (degrés)")
+    parser.add_argument("--power", type=float, default=7, help="Puissance des lancers (1 à 10)")
+    parser.add_argument("--stones", type=int, default=100, help="Pierres lancées après les potions")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Graine de la première partie (les suivantes utilisent seed+1, seed+2...)")
+    parser.add_argument("--output", default=None, help="Fichier JSON Lines des résultats (sinon la sortie standard)")
+    args = parser.parse_args(argv)
+
+    screen = init_headless()
+    game_data = load_game_data("Data")
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for run in range(args.runs):
+            potions = [SimulatedPotion.from_data(data) for data in game_data.potion_catalog]
+            commands = volley_commands(potions, args.interval, args.angle, args.power, args.stones)
+            seed = None if args.seed is None else args.seed + run
+            result = run_headless(potions, game_data.waves, commands, max_time=args.max_time,
+                                  max_waves=args.max_waves, screen=screen, seed=seed)
+            result["run"] = run
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
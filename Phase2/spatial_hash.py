@@ -0,0 +1,139 @@
+from constants import SPATIAL_HASH_CELL_SIZE
+
+
+class SpatialHash:
+    """
+    Index spatial en grille uniforme pour le terrain de défense.
+    Chaque objet est rangé dans toutes les cellules que couvre son rect ; une requête
+    ne teste que les objets des cellules concernées au lieu de tous les objets.
+    Les résultats sont retournés dans l'ordre d'insertion, comme un parcours du groupe d'origine.
+    """
+
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        """
+        :param cell_size: taille d'une cellule de la grille en pixels
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (colonne, ligne) -> liste d'objets
+        self.entries = {}  # objet -> (ordre d'insertion, rect, cellules)
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def clear(self):
+        """Vide l'index"""
+        self.cells.clear()
+        self.entries.clear()
+        self.next_order = 0
+
+    def rebuild(self, items):
+        """
+        Reconstruit l'index à partir d'objets possédant un attribut rect
+        :param items: objets à indexer (l'ordre de parcours est conservé dans les requêtes)
+        """
+        self.clear()
+        for item in items:
+            self.insert(item, item.rect)
+
+    def insert(self, item, rect):
+        """Ajoute un objet à l'index"""
+        if item in self.entries:
+            self.remove(item)
+
+        cells = self._cells_for(rect.left, rect.top, rect.right, rect.bottom)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(item)
+
+        self.entries[item] = (self.next_order, (rect.x, rect.y, rect.width, rect.height), cells)
+        self.next_order += 1
+
+    def remove(self, item):
+        """Retire un objet de l'index"""
+        entry = self.entries.pop(item, None)
+        if entry is None:
+            return
+
+        for cell in entry[2]:
+            bucket = self.cells[cell]
+            bucket.remove(item)
+            if not bucket:
+                del self.cells[cell]
+
+    def update(self, item, rect):
+        """
+        Met à jour la position d'un objet déjà indexé (en gardant son ordre d'insertion).
+        Les cellules ne sont modifiées que si l'objet en a changé.
+        """
+        entry = self.entries.get(item)
+        if entry is None:
+            self.insert(item, rect)
+            return
+
+        order, _, old_cells = entry
+        cells = self._cells_for(rect.left, rect.top, rect.right, rect.bottom)
+        if cells != old_cells:
+            for cell in old_cells:
+                bucket = self.cells[cell]
+                bucket.remove(item)
+                if not bucket:
+                    del self.cells[cell]
+            for cell in cells:
+                self.cells.setdefault(cell, []).append(item)
+
+        self.entries[item] = (order, (rect.x, rect.y, rect.width, rect.height), cells)
+
+    def query_rect(self, rect):
+        """
+        Retourne les objets dont le rect chevauche celui donné (même règle que Rect.colliderect)
+        """
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        found = []
+        for item in self._candidates(left, top, right, bottom):
+            x, y, width, height = self.entries[item][1]
+            if x < right and left < x + width and y < bottom and top < y + height:
+                found.append(item)
+        return found
+
+    def query_radius(self, x, y, radius, inclusive=True):
+        """
+        Retourne les objets dont le centre du rect est à une distance du point
+        inférieure (ou égale si inclusive) au rayon donné
+        """
+        radius_squared = radius * radius
+        found = []
+        for item in self._candidates(x - radius, y - radius, x + radius + 1, y + radius + 1):
+            item_x, item_y, width, height = self.entries[item][1]
+            dx = item_x + width // 2 - x
+            dy = item_y + height // 2 - y
+            distance_squared = dx * dx + dy * dy
+            if distance_squared < radius_squared or (inclusive and distance_squared == radius_squared):
+                found.append(item)
+        return found
+
+    def _candidates(self, left, top, right, bottom):
+        """Objets des cellules couvrant la zone, sans doublon, dans l'ordre d'insertion"""
+        seen = set()
+        candidates = []
+        for cell in self._cells_for(left, top, right, bottom):
+            for item in self.cells.get(cell, ()):
+                if item not in seen:
+                    seen.add(item)
+                    candidates.append(item)
+
+        candidates.sort(key=lambda item: self.entries[item][0])
+        return candidates
+
+    def _cells_for(self, left, top, right, bottom):
+        """Cellules couvertes par la zone [left, right[ x [top, bottom["""
+        size = self.cell_size
+        first_col = int(left // size)
+        last_col = int((max(right, left + 1) - 1) // size)
+        first_row = int(top // size)
+        last_row = int((max(bottom, top + 1) - 1) // size)
+        return [(col, row)
+                for col in range(first_col, last_col + 1)
+                for row in range(first_row, last_row + 1)]
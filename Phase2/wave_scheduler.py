@@ -0,0 +1,167 @@
+import math
+from operator import itemgetter
+
+from Phase1.data_loader import SPAWN_CURVE_NAMES
+from rng import SPAWN_STREAM, random_streams
+
+# Écart horizontal (en pixels) entre les ennemis d'une même salve
+BURST_SPACING = 24
+
+# Courbes d'apparition : progression u (0 à 1) du groupe -> fraction de sa durée
+_CURVE_FUNCTIONS = {
+    "linear": lambda u: u,  # Intervalle constant
+    "accelerate": lambda u: 1 - (1 - u) ** 2,  # Apparitions de plus en plus rapprochées
+    "decelerate": lambda u: u ** 2,  # Apparitions de plus en plus espacées
+}
+# Une courbe par nom accepté au chargement de waves.json (erreur à l'import s'il en manque une)
+SPAWN_CURVES = {name: _CURVE_FUNCTIONS[name] for name in SPAWN_CURVE_NAMES}
+
+
+class SpawnTimeline:
+    """
+    Apparitions d'une vague triées par instant, lues par un curseur :
+    chaque pas ne coûte que les apparitions dues à ce pas, quelle que soit la taille de la vague.
+    Une entrée est un tuple (instant, volant, x, y, vitesse, vie).
+    """
+
+    __slots__ = ("entries", "cursor")
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.cursor = 0
+
+    def next_due(self, time):
+        """Retourne la prochaine apparition due à cet instant (en avançant le curseur), ou None"""
+        if self.cursor < len(self.entries) and self.entries[self.cursor][0] <= time:
+            entry = self.entries[self.cursor]
+            self.cursor += 1
+            return entry
+        return None
+
+    def remaining(self):
+        """Nombre d'apparitions encore à venir"""
+        return len(self.entries) - self.cursor
+
+    def is_finished(self):
+        return self.cursor >= len(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class WaveScheduler:
+    """
+    Compile les vagues décrites dans Data/waves.json en chronologies d'apparition.
+    Une vague est une liste de groupes (type ou mélange de types, nombre, instant de départ,
+    intervalle, courbe d'apparition, taille des salves, multiplicateurs de vie et de vitesse) ;
+    les vagues absentes du fichier sont générées à partir de default_wave.
+    """
+
+    def __init__(self, wave_data, rng=None):
+        """
+        :param wave_data: données validées de waves.json (voir data_loader.parse_waves)
+        :param rng: flux random.Random des apparitions (types tirés au hasard, altitude des volants)
+        """
+        self.enemy_types = wave_data["enemy_types"]
+        self.scaling = wave_data["scaling"]
+        self.default_wave = wave_data["default_wave"]
+        self.max_enemies = wave_data["max_enemies"]
+        self.waves = {wave["wave"]: wave for wave in wave_data["waves"]}
+        self.rng = rng if rng is not None else random_streams.stream(SPAWN_STREAM)
+
+    def difficulty(self, wave):
+        """Niveau de difficulté d'une vague (1 pour la première)"""
+        return self.scaling["difficulty_start"] + self.scaling["difficulty_step"] * (wave - 1)
+
+    def max_enemies_for(self, wave):
+        """Nombre maximum d'ennemis simultanés pendant une vague"""
+        return self.waves.get(wave, {}).get("max_enemies", self.max_enemies)
+
+    def groups_for(self, wave):
+        """Groupes d'une vague : ceux du fichier, ou un groupe généré par default_wave"""
+        if wave in self.waves:
+            return self.waves[wave]["groups"]
+
+        default = self.default_wave
+        count = default["count"]
+        for _ in range(wave - 1):
+            count = min(default["count_max"], int(count * default["count_growth"]))
+        interval = max(default["interval_min"], default["interval"] * default["interval_growth"] ** (wave - 1))
+        return [{"count": count, "interval": interval, "mix": default["mix"]}]
+
+    def base_stats(self, wave):
+        """:return: (vitesse, vie) d'un ennemi de base pendant une vague"""
+        difficulty = self.difficulty(wave)
+        scaling = self.scaling
+        return (scaling["speed_base"] + scaling["speed_per_difficulty"] * difficulty,
+                scaling["health_base"] + scaling["health_per_difficulty"] * difficulty)
+
+    def compile(self, wave, spawn_x, floor_level):
+        """
+        Construit la chronologie d'apparition d'une vague (une fois, au début de la vague)
+        :param spawn_x: abscisse d'apparition (à droite de l'écran)
+        :param floor_level: hauteur du sol
+        :return: SpawnTimeline
+        """
+        base_speed, base_health = self.base_stats(wave)
+
+        entries = []
+        for group in self.groups_for(wave):
+            count = group["count"]
+            burst = max(1, group.get("burst", 1))
+            start = group.get("start", 0.0)
+            curve = SPAWN_CURVES[group.get("curve", "linear")]
+            speed = base_speed * group.get("speed_scale", 1.0)
+            health = base_health * group.get("health_scale", 1.0)
+            mix = self._cumulative_mix(group.get("mix") or self.default_wave["mix"])
+
+            # Une salve par point de la courbe ; en linéaire, un point toutes les `interval` secondes
+            points = math.ceil(count / burst)
+            duration = group.get("interval", 1.0) * points
+            for point in range(points):
+                time = start + duration * curve((point + 1) / points)
+                for member in range(min(burst, count - point * burst)):
+                    type_name = group.get("type") or self._pick(mix)
+                    entries.append(self._make_entry(time, type_name, spawn_x + member * BURST_SPACING,
+                                                    floor_level, speed, health))
+
+        # Tri stable : à instant égal, l'ordre des groupes est conservé
+        entries.sort(key=itemgetter(0))
+        return SpawnTimeline(entries)
+
+    def make_entry(self, wave, spawn_x, floor_level):
+        """Une apparition immédiate, tirée selon le mélange par défaut (scripts, bancs d'essai)"""
+        speed, health = self.base_stats(wave)
+        type_name = self._pick(self._cumulative_mix(self.default_wave["mix"]))
+        return self._make_entry(0.0, type_name, spawn_x, floor_level, speed, health)
+
+    def _make_entry(self, time, type_name, x, floor_level, speed, health):
+        enemy_type = self.enemy_types[type_name]
+        flying = enemy_type["flying"]
+        if flying:
+            # Les ennemis volants apparaissent en hauteur, dans leur plage d'altitude
+            y = self.rng.randint(*enemy_type["altitude"])
+        else:
+            # Les ennemis au sol apparaissent juste au-dessus du sol
+            y = floor_level - enemy_type.get("ground_offset", 30)
+        return (time, flying, x, y, speed * enemy_type.get("speed_scale", 1.0),
+                health * enemy_type.get("health_scale", 1.0))
+
+    @staticmethod
+    def _cumulative_mix(mix):
+        """Proportions {type: poids} -> liste (seuil cumulé, type) normalisée"""
+        total = sum(mix.values())
+        cumulative = []
+        threshold = 0.0
+        for type_name, weight in mix.items():
+            threshold += weight / total
+            cumulative.append((threshold, type_name))
+        return cumulative
+
+    def _pick(self, cumulative):
+        """Tire un type d'ennemi selon les proportions du mélange"""
+        roll = self.rng.random()
+        for threshold, type_name in cumulative:
+            if roll < threshold:
+                return type_name
+        return cumulative[-1][1]
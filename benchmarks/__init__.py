@@ -0,0 +1,7 @@
+"""
+Bancs d'essai de performance, exécutés sans fenêtre (pilote vidéo factice de SDL).
+
+Exemples (depuis la racine du projet) :
+    python -m benchmarks run --output benchmarks/results.json
+    python -m benchmarks compare benchmarks/baseline.json benchmarks/results.json --threshold 0.15
+"""
@@ -0,0 +1,93 @@
+import argparse
+import os
+import sys
+
+import pygame
+
+from benchmarks.harness import (DEFAULT_THRESHOLD, SCENARIOS, compare_results, load_results,
+                                run_scenarios, save_results)
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results.json")
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+
+def run(args):
+    from Phase2.simulation import init_headless
+    import benchmarks.scenarios as scenarios  # Enregistre les scénarios
+
+    init_headless()
+    screen = scenarios.create_screen()
+
+    names = args.scenarios.split(",") if args.scenarios else None
+    unknown = [name for name in names or () if name not in SCENARIOS]
+    if unknown:
+        print(f"Scénarios inconnus : {', '.join(unknown)} (disponibles : {', '.join(SCENARIOS)})")
+        return 2
+
+    results = run_scenarios(names, screen, args.frames, args.seed, not args.no_allocations)
+    pygame.quit()
+
+    for name, result in results["results"].items():
+        line = (f"{name:20} update {result['update_ms']['mean']:8.3f} ms (p95 {result['update_ms']['p95']:8.3f})"
+                f"  draw {result['draw_ms']['mean']:8.3f} ms (p95 {result['draw_ms']['p95']:8.3f})")
+        if "allocations" in result:
+            line += f"  pic {result['allocations']['peak_kb']:9.1f} Ko"
+        print(line)
+
+    save_results(results, args.output)
+    print(f"Résultats écrits dans {args.output}")
+    return 0
+
+
+def compare(args):
+    if not os.path.exists(args.baseline):
+        print(f"Référence introuvable : {args.baseline}\n"
+              f"Créez-la sur la machine de référence avec :\n"
+              f"    python -m benchmarks run --output {DEFAULT_BASELINE}\n"
+              f"puis ajoutez le fichier au dépôt.")
+        return 2
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    rows = compare_results(baseline, current, args.threshold)
+
+    regressions = 0
+    print(f"{'scénario':20} {'mesure':22} {'référence':>10} {'actuel':>10} {'écart':>8}")
+    for name, metric, before, after, change, regression in rows:
+        regressions += regression
+        flag = "  RÉGRESSION" if regression else ""
+        print(f"{name:20} {metric:22} {before:10.3f} {after:10.3f} {change:+8.1%}{flag}")
+
+    if baseline["meta"].get("machine") != current["meta"].get("machine"):
+        print("Attention : les résultats viennent de machines différentes")
+
+    if regressions:
+        print(f"{regressions} régression(s) au-delà de {args.threshold:.0%}")
+        return 1
+    print("Aucune régression")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Bancs d'essai de performance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Exécute les scénarios et écrit les résultats en JSON")
+    run_parser.add_argument("--scenarios", default=None, help="Scénarios à exécuter, séparés par des virgules")
+    run_parser.add_argument("--frames", type=int, default=None, help="Images mesurées par scénario")
+    run_parser.add_argument("--seed", type=int, default=0, help="Graine des générateurs aléatoires")
+    run_parser.add_argument("--no-allocations", action="store_true", help="Ne pas mesurer la mémoire")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Fichier JSON des résultats")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare des résultats à une référence")
+    compare_parser.add_argument("baseline", nargs="?", default=DEFAULT_BASELINE, help="Résultats de référence")
+    compare_parser.add_argument("current", nargs="?", default=DEFAULT_OUTPUT, help="Résultats à comparer")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Hausse relative tolérée (0.10 = 10 %%)")
+
+    args = parser.parse_args(argv)
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pygame
+
+from constants import SIMULATION_STEP
+from rng import random_streams
+
+# Seuil par défaut de comparaison : une mesure plus lente de 10 % que la référence est une régression
+DEFAULT_THRESHOLD = 0.10
+
+# Écart absolu minimum (en ms, ou en Ko pour la mémoire) pour signaler une régression :
+# en dessous, c'est du bruit de mesure
+MIN_DELTA = 0.05
+
+# Mesures comparées : (catégorie, statistique)
+COMPARED_METRICS = (
+    ("update_ms", "mean"),
+    ("update_ms", "p95"),
+    ("draw_ms", "mean"),
+    ("draw_ms", "p95"),
+    ("allocations", "peak_kb"),
+)
+
+
+class Scenario:
+    """
+    Scénario de banc d'essai : prépare un état de jeu puis l'avance image par image.
+    Les sous-classes définissent setup(), update(dt) et draw(surface) ;
+    frames et warmup_frames peuvent être redéfinis par scénario.
+    """
+
+    name = None
+    description = ""
+    frames = 600  # Images mesurées
+    warmup_frames = 60  # Images exécutées avant la mesure (caches, réserves d'objets)
+
+    def __init__(self, screen, seed=0):
+        """
+        :param screen: surface de dessin (hors écran, à la taille de la fenêtre du jeu)
+        :param seed: graine des générateurs aléatoires (scénarios reproductibles)
+        """
+        self.screen = screen
+        self.seed = seed
+
+    def setup(self):
+        """Prépare l'état de départ"""
+
+    def update(self, dt):
+        """Avance la simulation d'un pas"""
+
+    def draw(self, surface):
+        """Dessine une image"""
+
+
+# Scénarios enregistrés, par nom (voir benchmarks/scenarios.py)
+SCENARIOS = {}
+
+
+def register(scenario_class):
+    """Décorateur : enregistre un scénario sous son nom"""
+    SCENARIOS[scenario_class.name] = scenario_class
+    return scenario_class
+
+
+def seed_everything(seed):
+    """Fixe les graines (flux partagés, random et numpy) pour que les scénarios soient reproductibles"""
+    random_streams.reseed(seed)
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def summarize(samples):
+    """Statistiques (en ms) d'une liste de durées en secondes"""
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    values = sorted(sample * 1000 for sample in samples)
+
+    def percentile(percent):
+        return values[max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))]
+
+    return {
+        "mean": round(sum(values) / len(values), 4),
+        "p50": round(percentile(50), 4),
+        "p95": round(percentile(95), 4),
+        "max": round(values[-1], 4),
+    }
+
+
+def _make_scenario(scenario_class, screen, seed):
+    seed_everything(seed)
+    scenario = scenario_class(screen, seed)
+    scenario.setup()
+    for _ in range(scenario.warmup_frames):
+        scenario.update(SIMULATION_STEP)
+        scenario.draw(screen)
+    return scenario
+
+
+def measure_times(scenario_class, screen, frames, seed=0):
+    """
+    Mesure les temps de mise à jour et de dessin, image par image
+    :return: (durées de mise à jour, durées de dessin) en secondes
+    """
+    scenario = _make_scenario(scenario_class, screen, seed)
+    update_samples = []
+    draw_samples = []
+
+    for _ in range(frames):
+        start = time.perf_counter()
+        scenario.update(SIMULATION_STEP)
+        middle = time.perf_counter()
+        scenario.draw(screen)
+        end = time.perf_counter()
+
+        update_samples.append(middle - start)
+        draw_samples.append(end - middle)
+
+    return update_samples, draw_samples
+
+
+def measure_allocations(scenario_class, screen, frames, seed=0):
+    """
+    Mesure la mémoire allouée par les images d'un scénario (passe séparée :
+    le suivi des allocations ralentit trop l'exécution pour mesurer les temps en même temps)
+    :return: dictionnaire (mémoire de pointe, mémoire conservée, blocs conservés par image)
+    """
+    scenario = _make_scenario(scenario_class, screen, seed)
+
+    tracemalloc.start()
+    start_memory, _ = tracemalloc.get_traced_memory()
+    start_blocks = sys.getallocatedblocks()
+
+    for _ in range(frames):
+        scenario.update(SIMULATION_STEP)
+        scenario.draw(screen)
+
+    end_memory, peak_memory = tracemalloc.get_traced_memory()
+    end_blocks = sys.getallocatedblocks()
+    tracemalloc.stop()
+
+    return {
+        "peak_kb": round((peak_memory - start_memory) / 1024, 2),
+        "retained_kb": round((end_memory - start_memory) / 1024, 2),
+        "retained_blocks_per_frame": round((end_blocks - start_blocks) / max(1, frames), 3),
+    }
+
+
+def run_scenarios(names, screen, frames=None, seed=0, allocations=True):
+    """
+    Exécute des scénarios enregistrés
+    :param names: noms des scénarios (None pour tous)
+    :param frames: nombre d'images mesurées (None pour la valeur de chaque scénario)
+    :param allocations: False pour ne pas mesurer la mémoire
+    :return: dictionnaire des résultats, prêt à être écrit en JSON
+    """
+    names = list(SCENARIOS) if names is None else names
+    results = {}
+
+    for name in names:
+        scenario_class = SCENARIOS[name]
+        count = frames or scenario_class.frames
+
+        update_samples, draw_samples = measure_times(scenario_class, screen, count, seed)
+        result = {
+            "description": scenario_class.description,
+            "frames": count,
+            "update_ms": summarize(update_samples),
+            "draw_ms": summarize(draw_samples),
+        }
+        if allocations:
+            result["allocations"] = measure_allocations(scenario_class, screen, count, seed)
+        results[name] = result
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def save_results(results, path):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta=MIN_DELTA):
+    """
+    Compare des résultats à une référence
+    :param threshold: hausse relative tolérée (0.10 = 10 %)
+    :param min_delta: hausse absolue minimum pour signaler une régression
+    :return: liste de (scénario, mesure, référence, actuel, variation relative, régression ?)
+    """
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+
+        for category, statistic in COMPARED_METRICS:
+            before = reference.get(category, {}).get(statistic)
+            after = result.get(category, {}).get(statistic)
+            if before is None or after is None:
+                continue
+
+            change = (after - before) / before if before else 0.0
+            regression = after - before > min_delta and change > threshold
+            rows.append((name, f"{category}.{statistic}", before, after, change, regression))
+    return rows
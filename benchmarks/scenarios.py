@@ -0,0 +1,173 @@
+import pygame
+
+from benchmarks.harness import Scenario, register
+from Phase1.data_loader import load_game_data
+from Phase1.elements import Element
+from Phase2.effects import EffectManager
+from Phase2.enemy import EnemyManager
+from Phase2.launcher import Launcher
+from Phase2.simulation import SimulatedPotion
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from rng import RandomStreams
+
+
+def load_simulated_potions():
+    """Une potion simulée (sans image) par potion du catalogue"""
+    return [SimulatedPotion.from_data(data) for data in load_game_data("Data").potion_catalog]
+
+
+@register
+class EnemyMarch(Scenario):
+    """N ennemis qui avancent vers le laboratoire, remplacés dès qu'ils l'atteignent"""
+
+    name = "enemy_march"
+    description = "50 ennemis en marche dans EnemyManager (mise à jour et dessin groupé)"
+    enemy_count = 50
+
+    def setup(self):
+        self.manager = EnemyManager(WINDOW_WIDTH, WINDOW_HEIGHT, load_game_data("Data").waves,
+                                    streams=RandomStreams(self.seed))
+        self.manager.max_enemies = self.enemy_count
+        self._refill()
+
+    def _refill(self):
+        # Garder le nombre d'ennemis constant : ceux arrivés au laboratoire sont remplacés
+        self.manager.check_enemy_reached_lab()
+        while len(self.manager.enemies) < self.enemy_count:
+            self.manager.spawn_enemy()
+
+    def update(self, dt):
+        self.manager.update(dt)
+        self._refill()
+
+    def draw(self, surface):
+        self.manager.draw(surface)
+
+
+@register
+class ConcurrentEffects(Scenario):
+    """M effets de potions actifs en même temps, recréés dès qu'ils se terminent"""
+
+    name = "concurrent_effects"
+    description = "30 effets simultanés créés par EffectManager.create_effect_for_potion"
+    effect_count = 30
+
+    def setup(self):
+        self.manager = EffectManager(RandomStreams(self.seed))
+        self.potions = load_simulated_potions()
+        self.created = 0
+        self._refill()
+
+    def _refill(self):
+        while len(self.manager.effects) < self.effect_count:
+            potion = self.potions[self.created % len(self.potions)]
+            x = 100 + (self.created * 97) % (WINDOW_WIDTH - 200)
+            y = 200 + (self.created * 53) % 300
+            self.manager.create_effect_for_potion(potion, x, y)
+            self.created += 1
+
+    def update(self, dt):
+        self.manager.update(dt)
+        self._refill()
+
+    def draw(self, surface):
+        self.manager.draw(surface)
+
+
+@register
+class ProjectileBurst(Scenario):
+    """Salves de projectiles tirées par le lanceur, relancées quand la salve est retombée"""
+
+    name = "projectile_burst"
+    description = "Salves de 20 projectiles tirés par Launcher (trajectoires et traînées)"
+    burst_size = 20
+
+    def setup(self):
+        self.launcher = Launcher()
+        self.potions = load_simulated_potions()
+
+    def _fire_burst(self):
+        for i in range(self.burst_size):
+            self.launcher.set_angle(20 + (i * 7) % 60)
+            self.launcher.set_power(4 + i % 7)
+            self.launcher.select_potion(self.potions[i % len(self.potions)])
+            self.launcher.launch()
+
+    def update(self, dt):
+        if not self.launcher.projectiles:
+            self._fire_burst()
+        self.launcher.update(dt)
+
+    def draw(self, surface):
+        self.launcher.draw(surface)
+
+
+@register
+class CraftLoop(Scenario):
+    """
+    Boucle de crafting de la phase 1 : deux éléments posés sur la table de craft,
+    craft automatique par AutoCraftManager, résultat retiré, et on recommence.
+    """
+
+    name = "craft_loop"
+    description = "Phase 1 complète (Game.update/display) avec un craft AutoCraftManager en boucle"
+
+    def setup(self):
+        from game import Game
+
+        self.game = Game(self.screen)
+        # Première recette à deux ingrédients (la table de craft en a deux)
+        recipe = next(recipe for recipe in self.game.recipe_index.recipes if len(recipe["ingredients"]) == 2)
+        self.ingredients = [self.game.element_catalog.get(element_id) for element_id in recipe["ingredients"]]
+        self.crafts = 0
+
+    def _place_ingredients(self):
+        game = self.game
+        for zone, element_data in zip(game.craft_zones, self.ingredients):
+            element = Element(zone.rect.centerx, zone.rect.centery, element_data)
+            game.elements.add(element)
+            game.zone_occupancy.place(element, zone)
+
+    def update(self, dt):
+        game = self.game
+        occupancy = game.zone_occupancy
+
+        # Retirer le résultat d'un craft terminé
+        for zone in game.end_craft_zones:
+            result = occupancy.clear_zone(zone)
+            if result is not None:
+                game.elements.remove(result)
+                self.crafts += 1
+
+        # Reposer des ingrédients sur une table libre
+        if not game.auto_craft_manager.craft_in_progress and \
+                not any(occupancy.is_occupied(zone) for zone in game.craft_zones):
+            self._place_ingredients()
+
+        game.update(dt)
+
+    def draw(self, surface):
+        self.game.display()
+
+
+@register
+class GameStartup(Scenario):
+    """Démarrage de la phase 1 : chargement des données, des cartes et des ressources"""
+
+    name = "game_startup"
+    description = "Construction de Game (données, cartes TMX, joueur, musique) ; update_ms = durée d'un démarrage"
+    frames = 10
+    warmup_frames = 1
+
+    def update(self, dt):
+        from game import Game
+
+        self.game = Game(self.screen)
+
+    def draw(self, surface):
+        pass
+
+
+def create_screen():
+    """Surface de dessin hors écran, à la taille de la fenêtre du jeu"""
+    return pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
@@ -7,4 +7,57 @@ NATIVE_WIDTH = WINDOW_WIDTH
 NATIVE_HEIGHT = WINDOW_HEIGHT
 
 # Pas de scaling - nous utilisons les dimensions réelles directement
-SCALE = 1
\ No newline at end of file
+SCALE = 1
+
+# Nombre maximum de textures gardées en mémoire par le cache partagé (None = pas de limite)
+TEXTURE_CACHE_MAX_SIZE = None
+
+# Boucle de jeu : la simulation avance par pas fixes, l'affichage est limité séparément
+SIMULATION_HZ = 60
+SIMULATION_STEP = 1 / SIMULATION_HZ
+MAX_FPS = 60  # 0 = pas de limite
+MAX_STEPS_PER_FRAME = 5  # Nombre maximum de pas rattrapés par image
+MAX_FRAME_TIME = 0.25  # Au-delà (en secondes), le retard est abandonné
+
+# Nombre maximum de textes rendus gardés en mémoire par le cache de texte
+TEXT_CACHE_MAX_SIZE = 512
+
+# Rendu de la phase 1 : "full" redessine tout l'écran à chaque image,
+# "dirty" ne redessine que les zones modifiées (machines peu puissantes)
+RENDER_MODE = "full"
+
+# Taille des cellules de l'index spatial de la phase de défense (en pixels)
+SPATIAL_HASH_CELL_SIZE = 64
+
+# Nombre de particules allouées au départ par le moteur de particules (agrandi si nécessaire)
+PARTICLE_CAPACITY = 2048
+
+# Nombre de variantes gardées par type d'effet quand ses images sont générées (banque d'images d'effets)
+EFFECT_FRAME_VARIANTS = 3
+
+# Réserves d'objets réutilisables de la phase de défense : nombre maximum d'objets libres gardés
+PROJECTILE_POOL_SIZE = 32
+ENEMY_POOL_SIZE = 50
+EFFECT_POOL_SIZE = 16  # Par type d'effet
+
+# Qualité graphique : "low", "medium" ou "high" (voir quality.py)
+QUALITY_PRESET = "high"
+
+# Facteur entier d'agrandissement de la fenêtre (le rendu reste en WINDOW_WIDTH x WINDOW_HEIGHT)
+WINDOW_SCALE = 1
+
+# Journalisation (voir log.py) : niveau par défaut, remplaçable par la variable PIXEL_ALCHEMIST_LOG
+LOG_LEVEL = "INFO"
+LOG_BUFFER_SIZE = 1000  # Nombre de messages gardés en mémoire pour la touche F4
+LOG_BUFFER_LEVEL = "INFO"  # Niveau minimum des messages gardés en mémoire (DEBUG via PIXEL_ALCHEMIST_LOG)
+LOG_RATE_LIMIT = 1.0  # Intervalle minimum (en secondes) entre deux messages identiques dans la console
+
+# Taille (en pixels) des cellules de la grille de collision des cartes
+COLLISION_CELL_SIZE = 32
+
+# Profileur de temps d'image (voir profiler.py, touches F2 et F6)
+PROFILER_HISTORY = 600  # Nombre d'images gardées (graphe, percentiles, export CSV)
+PROFILER_REFRESH_FRAMES = 15  # Nombre d'images entre deux recalculs des percentiles affichés
+
+# Graine des générateurs aléatoires (voir rng.py) : None pour une graine différente à chaque partie
+RNG_SEED = None
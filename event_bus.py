@@ -0,0 +1,35 @@
+# Types d'événements publiés par le jeu
+ZONE_OBJECT_PLACED = "zone_object_placed"  # Un objet est posé sur une zone (zone, obj)
+ZONE_OBJECT_REMOVED = "zone_object_removed"  # Un objet quitte une zone : ramassé ou consommé (zone, obj)
+CRAFT_COMPLETED = "craft_completed"  # Un craft d'élément est terminé (recipe, result)
+
+
+class EventBus:
+    """
+    Bus d'événements synchrone : les abonnés d'un type d'événement sont appelés
+    immédiatement, dans l'ordre d'abonnement, avec les données de l'événement
+    en arguments nommés.
+    """
+
+    def __init__(self):
+        self.subscribers = {}  # type d'événement -> liste de fonctions
+
+    def subscribe(self, event_type, callback):
+        """Abonne une fonction à un type d'événement"""
+        self.subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        """Désabonne une fonction (sans effet si elle n'était pas abonnée)"""
+        callbacks = self.subscribers.get(event_type)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, event_type, **data):
+        """Publie un événement auprès de tous ses abonnés"""
+        # Copie de la liste : un abonné peut se désabonner pendant l'appel
+        for callback in list(self.subscribers.get(event_type, ())):
+            callback(**data)
+
+    def clear(self):
+        """Retire tous les abonnés"""
+        self.subscribers.clear()
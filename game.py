@@ -8,19 +8,40 @@ from Phase1.placement_manager import *
 from Phase1.potions import Potion
 from Phase1.enhancement_stones import EnhancementStone
 from Phase1.ui_manager import UIManager
+from Phase1.dirty_renderer import DirtyRenderer
+from Phase1.collision_grid import CollisionGrid
+from event_bus import EventBus
+from profiler import profiler, profile_section
 from constants import *
 from Phase2.defense_game import DefenseGame
+from game_loop import GameLoop
+from replay import LiveInput
+from rng import DEFENSE_STREAM, RandomStreams
+from text_renderer import get_font, render_text
+from render_target import present, get_mouse_pos
 from music_manager import *
 import pygame
 import pyscroll
 import pytmx
+from log import get_logger, dump_log_buffer
+
+logger = get_logger(__name__)
 
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, input_source=None, seed=RNG_SEED):
+        """
+        :param screen: Surface de rendu
+        :param input_source: Source des entrées (voir replay.py, par défaut le clavier et la souris)
+        :param seed: Graine de la partie (None pour une graine tirée au hasard)
+        """
         self.screen = screen
         self.running = True
-        self.clock = pygame.time.Clock()
+        self.input = input_source if input_source is not None else LiveInput()
+        self.loop = GameLoop(input_source=self.input)
+
+        # Flux aléatoires de la partie : chaque phase de défense reçoit une graine tirée de DEFENSE_STREAM
+        self.random_streams = RandomStreams(seed)
 
         self.screen_width = WINDOW_WIDTH
         self.screen_height = WINDOW_HEIGHT
@@ -35,10 +56,19 @@ class Game:
 
         # Chargement de l'UI et du gestionnaire d'animations
         self.ui = UIManager(self.screen_width, self.screen_height)
+
+        # Rendu de la phase 1 (complet ou par rectangles modifiés, voir RENDER_MODE)
+        self.renderer = DirtyRenderer(self.screen)
         self.animation_manager = AnimationManager()
 
         self.debug_collision = False  # Option pour afficher les zones de collision
 
+        # Bus d'événements du jeu (dépôts, ramassages, crafts)
+        self.events = EventBus()
+
+        # Index des objets posés sur les zones, partagé par toutes les cartes
+        self.zone_occupancy = ZoneOccupancy(self.events)
+
         # Initialisation du gestionnaire de crafting automatique
         self.auto_craft_manager = AutoCraftManager(self)
 
@@ -49,10 +79,13 @@ class Game:
         self.music_manager.play_music("laboratory")
 
         # Chargement des données
-        self.elements_data = load_elements("Data/elements.json")
-        self.recipes_data = load_recipes("Data/recipes.json")
-        self.potions_data = load_potions("Data/potion.json")
-        self.enhancement_stones_data = load_enhancement_stones("Data/enhancement_stones.json")
+        game_data = load_game_data("Data")
+        self.element_catalog = game_data.element_catalog
+        self.potion_catalog = game_data.potion_catalog
+        self.stone_catalog = game_data.stone_catalog
+        self.recipe_index = game_data.recipe_index
+        self.data_hashes = game_data.source_hashes
+        self.wave_data = game_data.waves
 
         # Variables pour la pause et la victoire
         self.paused = False
@@ -90,6 +123,7 @@ class Game:
 
         # Initialiser le joueur à une position temporaire, sera mis à jour après le chargement des spawns
         self.player = Player(0, 0)
+        self.player.zone_occupancy = self.zone_occupancy
 
         # Détecter les points de spawn dans les cartes TMX et initialiser le joueur
         self.detect_spawn_points()
@@ -108,7 +142,6 @@ class Game:
         # Variables pour la progression et le gameplay
         self.phase = 1  # 1 = Phase de crafting, 2 = Phase de défense
         self.phase_timer = 120  # 120 secondes (2 minutes) pour la phase 1
-        self.last_time = pygame.time.get_ticks()
         self.show_help = False  # Pour afficher l'aide/tutoriel
 
         # Variables pour les transitions
@@ -146,7 +179,7 @@ class Game:
             }
         }
 
-        print("Points de spawn par défaut:", self.spawn_points)
+        logger.info("Points de spawn par défaut: %s", self.spawn_points)
 
         # Maintenant, cherchons les points définis dans les cartes pour remplacer les valeurs par défaut
         for map_name, map_data in self.maps.items():
@@ -157,13 +190,13 @@ class Game:
                 # Si c'est un point de spawn
                 if obj.type == "Spawn":
                     self.spawn_points[map_name]["default"] = (obj.x, obj.y)
-                    print(f"Point de spawn par défaut trouvé pour {map_name}: ({obj.x}, {obj.y})")
+                    logger.info("Point de spawn par défaut trouvé pour %s: (%s, %s)", map_name, obj.x, obj.y)
                 elif obj.type == "trap_spawn":
                     self.spawn_points["cave"]["from_trap"] = (obj.x, obj.y)
-                    print(f"Point de spawn après trappe trouvé: ({obj.x}, {obj.y})")
+                    logger.info("Point de spawn après trappe trouvé: (%s, %s)", obj.x, obj.y)
                 elif obj.type == "ladder_spawn":
                     self.spawn_points["laboratoire"]["from_ladder"] = (obj.x, obj.y)
-                    print(f"Point de spawn après échelle trouvé: ({obj.x}, {obj.y})")
+                    logger.info("Point de spawn après échelle trouvé: (%s, %s)", obj.x, obj.y)
 
         # Positionner le joueur au point de spawn par défaut de la carte initiale
         spawn = self.spawn_points[self.current_map_name]["default"]
@@ -173,7 +206,7 @@ class Game:
         self.player.feet.midbottom = self.player.rect.midbottom
 
 
-        print(f"Points de spawn finaux: {self.spawn_points}")
+        logger.info("Points de spawn finaux: %s", self.spawn_points)
         # Définir des valeurs par défaut au cas où certains points ne sont pas trouvés
         if "default" not in self.spawn_points["laboratoire"]:
             self.spawn_points["laboratoire"]["default"] = (220, 350)
@@ -189,7 +222,7 @@ class Game:
         self.player.rect.topleft = self.player.position
         self.player.feet.midbottom = self.player.rect.midbottom
 
-        print(f"Points de spawn détectés: {self.spawn_points}")
+        logger.info("Points de spawn détectés: %s", self.spawn_points)
 
     def load_map(self, map_name, map_path):
         """Charge une carte depuis un fichier TMX et l'ajoute au dictionnaire des cartes"""
@@ -277,6 +310,12 @@ class Game:
         # Regrouper toutes les zones pour la détection
         zones = craft_zones + drop_zones + potioncraft_zones + creation_zones + trap_zones + end_craft_zones + quest_zones + map_zones
 
+        # Index des zones (grille de cases, par identifiant et par type) pour les recherches en jeu
+        zone_index = ZoneIndex(zones)
+
+        # Grille de collision statique, pour les déplacements du joueur
+        collision_grid = CollisionGrid(walls)
+
         # Stocker toutes les informations de la carte
         self.maps[map_name] = {
             "tmx_data": tmx_data,
@@ -284,7 +323,9 @@ class Game:
             "map_layer": map_layer,
             "group": group,
             "walls": walls,
+            "collision_grid": collision_grid,
             "zones": zones,
+            "zone_index": zone_index,
             "craft_zones": craft_zones,
             "end_craft_zones": end_craft_zones,  # Nouvelle propriété
             "drop_zones": drop_zones,
@@ -301,7 +342,9 @@ class Game:
 
         # Mettre à jour les propriétés de la classe avec celles de la carte active
         self.walls = current_map["walls"]
+        self.collision_grid = current_map["collision_grid"]
         self.zones = current_map["zones"]
+        self.zone_index = current_map["zone_index"]
         self.craft_zones = current_map["craft_zones"]
         self.end_craft_zones = current_map["end_craft_zones"]
         self.drop_zones = current_map["drop_zones"]
@@ -337,7 +380,7 @@ class Game:
     def change_map(self, target_map, transition_type):
         """Change la carte active et place le joueur au bon endroit"""
         if target_map not in self.maps:
-            print(f"Erreur: Carte {target_map} non trouvée!")
+            logger.error("Carte %s non trouvée!", target_map)
             return
 
         # Sauvegarder l'origine pour l'animation de transition
@@ -359,15 +402,15 @@ class Game:
         if self.transition_type == "trap":
             # Du laboratoire vers la cave via la trappe
             spawn = self.spawn_points["cave"]["from_trap"]
-            print(f"Téléportation vers la cave via trappe: {spawn}")
+            logger.info("Téléportation vers la cave via trappe: %s", spawn)
         elif self.transition_type == "ladder":
             # De la cave vers le laboratoire via l'échelle
             spawn = self.spawn_points["laboratoire"]["from_ladder"]
-            print(f"Téléportation vers le laboratoire via échelle: {spawn}")
+            logger.info("Téléportation vers le laboratoire via échelle: %s", spawn)
         else:
             # Point de spawn par défaut
             spawn = self.spawn_points[self.current_map_name]["default"]
-            print(f"Téléportation vers le point par défaut: {spawn}")
+            logger.info("Téléportation vers le point par défaut: %s", spawn)
 
         self.player.position[0] = spawn[0]
         self.player.position[1] = spawn[1]
@@ -386,10 +429,14 @@ class Game:
         self.ui.show_message(f"Bienvenue dans {self.current_map_name}!", 2.0)
 
     def handling_events(self):
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 self.running = False
 
+            elif event.type == pygame.VIDEOEXPOSE:
+                # La fenêtre a été recouverte : tout redessiner
+                self.renderer.invalidate()
+
             elif event.type == pygame.KEYDOWN:
                 """Action"""
                 # Touche de pause (ESC)
@@ -417,7 +464,7 @@ class Game:
                 # Touche C pour mélanger les potions
                 if event.key == pygame.K_c:
                     # Vérifier si le joueur est devant la zone de mixage (zone 35)
-                    front_zone = get_front_tile(self.player, self.zones)
+                    front_zone = get_front_tile(self.player, self.zone_index)
                     if front_zone and front_zone.type == "potioncraft_zone" and front_zone.id == 35:
                         # Vérifier si un élément est placé sur la zone principale
                         if self.potion_craft_state["element"] is not None and not self.crafting_in_progress:
@@ -444,7 +491,7 @@ class Game:
                 # Touche E pour les interactions
                 if event.key == pygame.K_e:
                     # Vérifier s'il y a une zone devant le joueur
-                    front_zone = get_front_tile(self.player, self.zones)
+                    front_zone = get_front_tile(self.player, self.zone_index)
                     if front_zone:
                         # Traitement spécifique selon le type de zone
 
@@ -481,12 +528,7 @@ class Game:
                                         self.ui.show_message(f"Élément {front_zone.name} créé et récupéré!")
                                 else:
                                     # Récupérer l'élément existant
-                                    game_objects = {
-                                        'elements': self.elements,
-                                        'potions': self.potions,
-                                        'stones': self.enhancement_stones
-                                    }
-                                    obj = get_element_on_tile(front_zone, game_objects, None)
+                                    obj = get_element_on_tile(front_zone, self.zone_occupancy)
                                     if obj:
                                         success = self.player.pick_element(obj)
                                         if success:
@@ -508,20 +550,12 @@ class Game:
                                 obj = objects_on_zone[0]
                                 success = self.player.pick_element(obj)
                                 if success:
-                                    # Marquer explicitement la zone comme non occupée
-                                    front_zone.have_object = False
                                     if isinstance(obj, Element):
                                         msg = f"Élément {obj.name} récupéré de la zone de résultat!"
                                     else:
                                         msg = "Objet récupéré de la zone de résultat!"
                                     self.ui.show_message(msg)
                             else:
-                                # Si la zone est marquée comme occupée mais ne contient pas d'objet réel
-                                if front_zone.have_object:
-                                    print(
-                                        "DEBUG: La zone était marquée comme occupée mais aucun objet n'a été trouvé. État corrigé.")
-                                    front_zone.have_object = False
-
                                 # Les zones end_craft_zone sont spéciales, elles ne permettent pas de déposer
                                 self.ui.show_message("Aucun objet à récupérer sur cette zone.", 1.0)
                             continue
@@ -541,13 +575,7 @@ class Game:
 
                         # Si on ne tient pas d'objet, essayer d'en ramasser un
                         else:
-                            game_objects = {
-                                'elements': self.elements,
-                                'potions': self.potions,
-                                'stones': self.enhancement_stones
-                            }
-
-                            obj = get_element_on_tile(front_zone, game_objects, self.potion_craft_state)
+                            obj = get_element_on_tile(front_zone, self.zone_occupancy, self.potion_craft_state)
                             if obj:
                                 success = self.player.pick_element(obj)
                                 if success:
@@ -571,6 +599,26 @@ class Game:
                     else:
                         self.ui.show_message("Débogage des collisions désactivé", 2.0)
 
+                elif event.key == pygame.K_F2:
+                    # Touche F2 pour afficher/masquer le profileur de temps d'image
+                    if profiler.toggle():
+                        self.ui.show_message("Profileur activé (F6 pour exporter en CSV)", 2.0)
+                    else:
+                        self.ui.show_message("Profileur désactivé", 2.0)
+                    # Effacer l'affichage du profileur au prochain rendu
+                    self.renderer.invalidate()
+
+                elif event.key == pygame.K_F6:  # F6 pour écrire les mesures du profileur dans un fichier CSV
+                    if not profiler.frames:
+                        self.ui.show_message("Aucune mesure : activez le profileur avec F2", 2.0)
+                    else:
+                        try:
+                            path = profiler.export_csv()
+                            self.ui.show_message(f"Mesures écrites dans {path}", 2.0)
+                        except OSError as e:
+                            logger.error("Impossible d'écrire les mesures du profileur : %s", e)
+                            self.ui.show_message("Impossible d'écrire les mesures", 2.0)
+
                 elif event.key == pygame.K_h:
                     # Touche pour afficher/masquer l'aide
                     self.show_help = not self.show_help
@@ -579,6 +627,14 @@ class Game:
                     self.print_map_zones()
                     self.ui.show_message("Informations sur les zones map_zone affichées dans la console", 2.0)
 
+                elif event.key == pygame.K_F4:  # F4 pour écrire les derniers messages du journal dans un fichier
+                    try:
+                        path = dump_log_buffer()
+                        self.ui.show_message(f"Journal écrit dans {path}", 2.0)
+                    except OSError as e:
+                        logger.error("Impossible d'écrire le journal : %s", e)
+                        self.ui.show_message("Impossible d'écrire le journal", 2.0)
+
                 elif event.key == pygame.K_F5:  # Utiliser F5 comme raccourci pour lancer la phase 2
                     self.ui.show_message("Lancement direct de la phase de défense!", 2.0)
                     self.start_defense_phase()
@@ -592,7 +648,7 @@ class Game:
                     self.ui.show_message("Mélange interrompu!", 1.0)
 
         # Vérifier si la touche C est maintenue enfoncée pour le crafting
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         if keys[pygame.K_c] and self.crafting_in_progress:
             pass
         else:
@@ -617,23 +673,23 @@ class Game:
                 else:
                     self.player.velocity[1] = 0
 
-    def update(self):
-        # Calculer le delta temps
-        current_time = pygame.time.get_ticks()
-        dt = (current_time - self.last_time) / 1000.0  # Convertir en secondes
-        self.last_time = current_time
-
+    def update(self, dt):
+        """
+        Avance la simulation d'un pas fixe
+        :param dt: durée du pas en secondes (SIMULATION_STEP)
+        """
         # Mettre à jour l'UI et les animations
         self.ui.update(dt)
         self.animation_manager.update(dt)
 
-        # Gérer la transition de carte si nécessaire
-        if self.transition_in_progress:
-            self.transition_timer += dt
-            # Attendre 1 seconde pour l'animation
-            if self.transition_timer >= 1.0:
-                self.complete_map_change()
-            return  # Ne pas mettre à jour le reste pendant la transition
+        with profile_section("update.transitions"):
+            # Gérer la transition de carte si nécessaire
+            if self.transition_in_progress:
+                self.transition_timer += dt
+                # Attendre 1 seconde pour l'animation
+                if self.transition_timer >= 1.0:
+                    self.complete_map_change()
+                return  # Ne pas mettre à jour le reste pendant la transition
 
         # Gérer le cooldown après téléportation
         if self.just_teleported:
@@ -641,33 +697,33 @@ class Game:
             if self.teleport_timer >= self.teleport_cooldown:
                 self.just_teleported = False
 
-        # Mettre à jour le gestionnaire de crafting automatique
-        self.auto_craft_manager.check_for_crafting()  # Vérifier s'il y a des éléments à crafter
-        self.auto_craft_manager.update(dt)  # Mettre à jour le timer de crafting
-
-        if self.crafting_in_progress:
-            self.crafting_timer += dt
-
-            # Vérifier si le joueur est toujours devant la zone de mixage
-            front_zone = get_front_tile(self.player, self.zones)
-            if not front_zone or front_zone.type != "potioncraft_zone" or front_zone.id != 35:
-                # Le joueur n'est plus devant la zone, annuler le crafting
-                self.crafting_in_progress = False
-                self.crafting_timer = 0
-                self.animation_manager.remove_animation("potion_mixing")
-                self.ui.show_message("Mélange interrompu! Vous avez quitté la zone.", 1.0)
-                return
-
-            # Vérifier si le temps requis est écoulé
-            if self.crafting_timer >= self.crafting_time_required:
-                self.crafting_in_progress = False
-                self.crafting_timer = 0
-                self.animation_manager.remove_animation("potion_mixing")
-
-                # Appeler la fonction de création de potion
-                success = self.create_potion_for_inventory()
-                if not success:
-                    self.ui.show_message("Échec de la création de la potion!", 2.0)
+        with profile_section("update.craft"):
+            # Mettre à jour le gestionnaire de crafting automatique (table réexaminée seulement si elle a changé)
+            self.auto_craft_manager.update(dt)
+
+            if self.crafting_in_progress:
+                self.crafting_timer += dt
+
+                # Vérifier si le joueur est toujours devant la zone de mixage
+                front_zone = get_front_tile(self.player, self.zone_index)
+                if not front_zone or front_zone.type != "potioncraft_zone" or front_zone.id != 35:
+                    # Le joueur n'est plus devant la zone, annuler le crafting
+                    self.crafting_in_progress = False
+                    self.crafting_timer = 0
+                    self.animation_manager.remove_animation("potion_mixing")
+                    self.ui.show_message("Mélange interrompu! Vous avez quitté la zone.", 1.0)
+                    return
+
+                # Vérifier si le temps requis est écoulé
+                if self.crafting_timer >= self.crafting_time_required:
+                    self.crafting_in_progress = False
+                    self.crafting_timer = 0
+                    self.animation_manager.remove_animation("potion_mixing")
+
+                    # Appeler la fonction de création de potion
+                    success = self.create_potion_for_inventory()
+                    if not success:
+                        self.ui.show_message("Échec de la création de la potion!", 2.0)
 
         # Mettre à jour le timer de la phase
         if self.phase == 1:
@@ -680,153 +736,78 @@ class Game:
                 self.phase_timer = 120
                 self.phase = 1  # On reste en phase 1 pour le moment
 
-        # Vérifier les touches pressées et mettre à jour la direction du joueur
-        keys = pygame.key.get_pressed()
-        if not self.transition_in_progress:
-            if keys[pygame.K_LEFT]:
-                self.player.velocity[0] = -1
-                self.player.direction = 'LEFT'
-            elif keys[pygame.K_RIGHT]:
-                self.player.velocity[0] = 1
-                self.player.direction = 'RIGHT'
-            else:
-                self.player.velocity[0] = 0
-
-            if keys[pygame.K_UP]:
-                self.player.velocity[1] = -1
-                self.player.direction = 'UP'
-            elif keys[pygame.K_DOWN]:
-                self.player.velocity[1] = 1
-                self.player.direction = 'DOWN'
-            else:
-                self.player.velocity[1] = 0
-
-        # Sauvegarder la position actuelle du joueur
-        self.player.save_location()
-
+        with profile_section("update.movement"):
+            # Vérifier les touches pressées et mettre à jour la direction du joueur
+            keys = self.input.get_pressed()
+            if not self.transition_in_progress:
+                if keys[pygame.K_LEFT]:
+                    self.player.velocity[0] = -1
+                    self.player.direction = 'LEFT'
+                elif keys[pygame.K_RIGHT]:
+                    self.player.velocity[0] = 1
+                    self.player.direction = 'RIGHT'
+                else:
+                    self.player.velocity[0] = 0
 
-        # Déplacement horizontal
-        if self.player.velocity[0] != 0:
-            # Calculer la nouvelle position horizontale
-            new_x = self.player.position[0] + self.player.velocity[0] * self.player.speed
+                if keys[pygame.K_UP]:
+                    self.player.velocity[1] = -1
+                    self.player.direction = 'UP'
+                elif keys[pygame.K_DOWN]:
+                    self.player.velocity[1] = 1
+                    self.player.direction = 'DOWN'
+                else:
+                    self.player.velocity[1] = 0
 
-            # Mettre à jour temporairement la position horizontale
-            old_x = self.player.position[0]
-            self.player.position[0] = new_x
-            self.player.rect.topleft = self.player.position
-            self.player.feet.midbottom = self.player.rect.midbottom
+            # Sauvegarder la position actuelle du joueur
+            self.player.save_location()
 
-            # Vérifier les collisions
-            collision = False
-            for wall in self.walls:
-                if self.player.feet.colliderect(wall):
-                    collision = True
-                    break
-
-            # Si collision, revenir à l'ancienne position horizontale
-            if collision:
-                self.player.position[0] = old_x
-                self.player.rect.topleft = self.player.position
-                self.player.feet.midbottom = self.player.rect.midbottom
-
-        # Déplacement vertical (même principe)
-        if self.player.velocity[1] != 0:
-            # Calculer la nouvelle position verticale
-            new_y = self.player.position[1] + self.player.velocity[1] * self.player.speed
-
-            # Mettre à jour temporairement la position verticale
-            old_y = self.player.position[1]
-            self.player.position[1] = new_y
+            # La vitesse du joueur est exprimée en pixels par pas de 1/60 s
+            step_distance = self.player.speed * dt * SIMULATION_HZ
+
+            # Position visée, puis déplacement en pixels du rectangle du joueur (et donc de ses pieds)
+            new_x = self.player.position[0] + self.player.velocity[0] * step_distance
+            new_y = self.player.position[1] + self.player.velocity[1] * step_distance
+            target_rect = self.player.rect.copy()
+            target_rect.topleft = (new_x, new_y)
+            move_x = target_rect.x - self.player.rect.x
+            move_y = target_rect.y - self.player.rect.y
+
+            # Déplacement axe par axe contre la grille de collision : un axe bloqué revient à l'ancienne position
+            allowed_x, allowed_y = self.collision_grid.move_and_collide(self.player.feet, move_x, move_y)
+            if self.player.velocity[0] != 0 and allowed_x == move_x:
+                self.player.position[0] = new_x
+            if self.player.velocity[1] != 0 and allowed_y == move_y:
+                self.player.position[1] = new_y
             self.player.rect.topleft = self.player.position
             self.player.feet.midbottom = self.player.rect.midbottom
 
-            # Vérifier les collisions
-            collision = False
-            for wall in self.walls:
-                if self.player.feet.colliderect(wall):
-                    collision = True
-                    break
-
-            # Si collision, revenir à l'ancienne position verticale
-            if collision:
-                self.player.position[1] = old_y
-                self.player.rect.topleft = self.player.position
-                self.player.feet.midbottom = self.player.rect.midbottom
-
-        # Finaliser la mise à jour du joueur
-        self.player.update()
-
-        # Mettre à jour les éléments transportés
-        if self.player.held_item:
-            self.player.held_item.update_position(self.player)
-
-        # Vérifier si le joueur est sur une zone de transition (seulement si pas en cooldown)
-        if not self.just_teleported:
-            for zone in self.trap_zones:
-                if zone.rect.colliderect(self.player.rect):
-                    # Si c'est une trappe, aller vers la cave
-                    if zone.type == "trap_zone" and self.current_map_name == "laboratoire":
-                        self.change_map("cave", "trap")
-                        break
-                    # Si c'est une échelle, remonter vers le laboratoire
-                    elif zone.type == "ladder_zone" and self.current_map_name == "cave":
-                        self.change_map("laboratoire", "ladder")
-                        break
-
-        # Gestion des crafts d'éléments
-        elements_craft = pygame.sprite.Group()
-        craft_zones_used = []
-
-        for zone in self.craft_zones:
-            crafting_element = get_element_on_tile(zone, {'elements': self.elements}, None)
-            if crafting_element:
-                elements_craft.add(crafting_element)
-                craft_zones_used.append(zone)
-
-        recipe = check_block_craft(elements_craft, self.recipes_data)
-
-        # S'il y a exactement 2 éléments et que la zone de résultat est libre
-        if len(elements_craft) == 2 and (
-                not self.end_craft_zones or not any(zone.have_object for zone in self.end_craft_zones)):
-            recipe = check_block_craft(elements_craft, self.recipes_data)
-
-            if recipe:
-                print(f"Craft réussi : {recipe['result_name']}")
-
-                # Supprimer les éléments utilisés
-                for el in elements_craft:
-                    self.elements.remove(el)
-
-                # Libérer les zones de craft
-                for zone in craft_zones_used:
-                    zone.have_object = False
-
-                # Trouver les données de l'élément résultant
-                result_data = next(e for e in self.elements_data if e["id"] == recipe['result'])
-
-                # Placer le nouvel élément dans la zone de résultat si elle existe
-                if self.end_craft_zones:
-                    result_zone = self.end_craft_zones[0]
-                    new_element = Element(result_zone.rect.centerx, result_zone.rect.centery, result_data)
-                    result_zone.have_object = True
-                else:
-                    # Fallback: utiliser le centre des zones de craft
-                    center_x = sum(zone.rect.centerx for zone in craft_zones_used) // len(craft_zones_used)
-                    center_y = sum(zone.rect.centery for zone in craft_zones_used) // len(craft_zones_used)
-                    new_element = Element(center_x, center_y, result_data)
-
-                self.elements.add(new_element)
-
-                # Donner de l'XP pour le craft d'élément
-                self.player.gain_experience(5)
-                self.ui.show_message(f"Élément {recipe['result_name']} créé !")
+            # Finaliser la mise à jour du joueur
+            self.player.update()
+
+            # Mettre à jour les éléments transportés
+            if self.player.held_item:
+                self.player.held_item.update_position(self.player)
+
+        with profile_section("update.transitions"):
+            # Vérifier si le joueur est sur une zone de transition (seulement si pas en cooldown)
+            if not self.just_teleported:
+                for zone in self.trap_zones:
+                    if zone.rect.colliderect(self.player.rect):
+                        # Si c'est une trappe, aller vers la cave
+                        if zone.type == "trap_zone" and self.current_map_name == "laboratoire":
+                            self.change_map("cave", "trap")
+                            break
+                        # Si c'est une échelle, remonter vers le laboratoire
+                        elif zone.type == "ladder_zone" and self.current_map_name == "cave":
+                            self.change_map("laboratoire", "ladder")
+                            break
 
     def display(self):
-        # Effacer l'écran
-        self.screen.fill((100, 100, 100))
-
         # Si nous sommes en transition, afficher uniquement l'animation de transition
         if self.transition_in_progress:
+            # Effacer l'écran
+            self.screen.fill((100, 100, 100))
+
             progress = self.transition_timer / 1.0
             fade_value = int(255 * progress)
             fade_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
@@ -835,68 +816,75 @@ class Game:
 
             # Afficher uniquement l'interface utilisateur pendant la transition
             self.ui.draw_temp_messages(self.screen)
-            pygame.display.flip()
+            present()
+            self.renderer.invalidate()
             return
 
-        # Centrer la carte sur le joueur
-        self.group.center(self.player.rect.center)
+        with profile_section("display.map"):
+            # Centrer la carte sur le joueur
+            self.group.center(self.player.rect.center)
 
-        # Dessiner la carte (sans le joueur pour l'instant)
-        self.group.draw(self.screen)
+            # Fond : la carte (sans le joueur), mise en cache tant que la vue ne bouge pas
+            renderer = self.renderer
+            renderer.begin_frame((self.current_map_name, tuple(self.group.view.topleft)), self.draw_map_background)
 
-        # Dessiner les éléments qui ne sont pas tenus par le joueur
-        for element in self.elements:
-            if not element.held_by_player:
-                self.screen.blit(element.image, element.rect)
+        with profile_section("display.sprites"):
+            # Dessiner les éléments qui ne sont pas tenus par le joueur
+            for element in self.elements:
+                if not element.held_by_player:
+                    renderer.add_sprite(element.image, element.rect)
 
-        for potion in self.potions:
-            if not potion.held_by_player:
-                self.screen.blit(potion.image, potion.rect)
+            for potion in self.potions:
+                if not potion.held_by_player:
+                    renderer.add_sprite(potion.image, potion.rect)
 
-        for stone in self.enhancement_stones:
-            if not stone.held_by_player:
-                self.screen.blit(stone.image, stone.rect)
+            for stone in self.enhancement_stones:
+                if not stone.held_by_player:
+                    renderer.add_sprite(stone.image, stone.rect)
 
-        # Dessiner le joueur par-dessus les éléments au sol
-        self.screen.blit(self.player.image, self.player.rect)
+            # Dessiner le joueur par-dessus les éléments au sol
+            renderer.add_sprite(self.player.image, self.player.rect)
 
-        # Dessiner les éléments tenus par le joueur par-dessus tout le reste
-        if self.player.held_item:
-            self.screen.blit(self.player.held_item.image, self.player.held_item.rect)
+            # Dessiner les éléments tenus par le joueur par-dessus tout le reste
+            if self.player.held_item:
+                renderer.add_sprite(self.player.held_item.image, self.player.held_item.rect)
 
-        # Dessiner les animations
-        self.animation_manager.draw(self.screen)
+            # Dessiner les animations
+            renderer.add_layer(self.animation_manager.draw, self.animation_manager.get_bounds())
 
-        # Dessiner l'interface utilisateur avec l'inventaire
-        self.ui.draw_player_info(self.screen, self.player, self.player_inventory)
+        with profile_section("display.hud"):
+            # Dessiner l'interface utilisateur avec l'inventaire
+            renderer.add_overlay("player_info",
+                                 (self.player.level, self.player.experience, len(self.player_inventory)),
+                                 lambda surface: self.ui.draw_player_info(surface, self.player, self.player_inventory))
 
-        # Afficher les infobulles
-        mouse_pos = pygame.mouse.get_pos()
-        self.ui.draw_tooltip(self.screen, mouse_pos, self.elements, self.potions, self.enhancement_stones)
+        with profile_section("display.tooltip"):
+            # Afficher les infobulles
+            mouse_pos = get_mouse_pos()
+            tooltip_text = self.ui.get_tooltip_text(mouse_pos, self.elements, self.potions, self.enhancement_stones)
+            renderer.add_overlay("tooltip", (tooltip_text, mouse_pos if tooltip_text else None),
+                                 lambda surface: self.ui.draw_tooltip_text(surface, mouse_pos, tooltip_text))
 
-        # Afficher les messages temporaires
-        self.ui.draw_temp_messages(self.screen)
+        with profile_section("display.hud"):
+            # Afficher les messages temporaires
+            renderer.add_overlay("messages", self.ui.get_messages_signature(), self.ui.draw_temp_messages)
 
-        # REMARQUE : Le code d'affichage du timer a été supprimé ici
+            # REMARQUE : Le code d'affichage du timer a été supprimé ici
 
-        # Afficher le nom de la carte actuelle
-        map_text = f"Carte: {self.current_map_name.capitalize()}"
-        map_font = pygame.font.SysFont('Arial', 20)
-        map_surface = map_font.render(map_text, True, (255, 255, 255))
-        self.screen.blit(map_surface, (10, self.screen_height - map_surface.get_height() - 10))
+            # Afficher le nom de la carte actuelle et les contrôles de base
+            renderer.add_overlay("map_name", self.current_map_name, self.draw_map_name)
+            renderer.add_overlay("controls", None, self.draw_controls)
 
-        # Afficher les contrôles de base
-        controls_text = "E: Interagir | C: Mélanger | F1: Debug | H: Aide"
-        controls_font = pygame.font.SysFont('Arial', 20)
-        controls_surface = controls_font.render(controls_text, True, (200, 200, 200))
-        self.screen.blit(controls_surface,
-                         (self.screen_width - controls_surface.get_width() - 10, self.screen_height - 30))
+        with profile_section("display.render"):
+            # Les écrans superposés et le débogage recouvrent tout : rendu complet
+            overlay_screen = self.show_help or self.debug_collision or self.paused
+            renderer.render(full=RENDER_MODE != "dirty" or overlay_screen)
 
         # DEBUG: Afficher la position du joueur et des éléments transportés
         if self.player.held_item and self.debug_collision:
             debug_text = f"Joueur: {self.player.rect.center}, Item: {self.player.held_item.rect.center}"
-            debug_font = pygame.font.SysFont('Arial', 20)
-            debug_surface = debug_font.render(debug_text, True, (255, 255, 0))
+            debug_font = get_font('Arial', 20)
+            debug_surface = render_text(debug_font, debug_text, True, (255, 255, 0))
             self.screen.blit(debug_surface, (10, 40))
 
         # Afficher l'aide si demandé
@@ -907,8 +895,34 @@ class Game:
         if self.debug_collision:
             self.draw_collision_debug()
 
-        # Mettre à jour l'affichage
-        pygame.display.flip()
+        # Ce qui a été dessiné hors du renderer devra être effacé à l'image suivante
+        if overlay_screen:
+            renderer.invalidate()
+
+        with profile_section("display.present"):
+            # Mettre à jour l'affichage
+            renderer.present()
+
+    def draw_map_background(self, surface):
+        """Dessine la carte active (fond du renderer)"""
+        surface.fill((100, 100, 100))
+        self.group.draw(surface)
+
+    def draw_map_name(self, surface):
+        """Affiche le nom de la carte actuelle"""
+        map_text = f"Carte: {self.current_map_name.capitalize()}"
+        map_font = get_font('Arial', 20)
+        map_surface = render_text(map_font, map_text, True, (255, 255, 255))
+        return surface.blit(map_surface, (10, self.screen_height - map_surface.get_height() - 10))
+
+    def draw_controls(self, surface):
+        """Affiche les contrôles de base"""
+        controls_text = "E: Interagir | C: Mélanger | F1: Debug | H: Aide"
+        controls_font = get_font('Arial', 20)
+        controls_surface = render_text(controls_font, controls_text, True, (200, 200, 200))
+        return surface.blit(controls_surface,
+                            (self.screen_width - controls_surface.get_width() - 10, self.screen_height - 30))
+
     # Fonction d'écran de pause à ajouter à la classe Game
     def toggle_pause(self):
         """Active ou désactive la pause"""
@@ -921,39 +935,19 @@ class Game:
     def place_in_potion_craft_zone(self, zone):
         """Place l'objet tenu par le joueur dans la zone de craft de potion avec vérification renforcée"""
         if not self.player.held_item:
-            print("DEBUG: Pas d'objet tenu par le joueur")
+            logger.debug("Pas d'objet tenu par le joueur")
             return False
 
-        # Vérifier si la zone est déjà occupée physiquement (pas juste le flag)
-        objects_on_zone = self.get_objects_on_zone(zone)
-        if objects_on_zone:
-            print(f"DEBUG: Zone {zone.id} déjà occupée par un objet")
-            return False
-
-        # Vérifier si la zone est marquée comme occupée
+        # Vérifier si la zone est déjà occupée
         if zone.have_object:
-            # Double vérification - si elle est marquée comme occupée mais ne contient pas d'objet
-            # alors on corrige l'état
-            if not objects_on_zone:
-                print(f"DEBUG: Zone {zone.id} marquée comme occupée mais ne contient aucun objet. Correction...")
-                zone.have_object = False
-            else:
-                print(f"DEBUG: Zone {zone.id} contient déjà un objet")
-                return False
+            logger.debug("Zone %s déjà occupée par un objet", zone.id)
+            return False
 
-        # Vérifier si l'objet est déjà posé ailleurs (sur une autre zone)
         item = self.player.held_item
-        for other_zone in self.potioncraft_zones:
-            if other_zone != zone:
-                other_objects = self.get_objects_on_zone(other_zone)
-                for obj in other_objects:
-                    if obj == item:
-                        print(f"DEBUG: Cet objet est déjà posé sur la zone {other_zone.id}")
-                        return False
 
         # Utiliser l'ID de la zone
         zone_id = zone.id
-        print(f"DEBUG: Tentative de placement sur la zone ID: {zone_id}, type: {zone.type}")
+        logger.debug("Tentative de placement sur la zone ID: %s, type: %s", zone_id, zone.type)
 
         # Attribuer une fonction à chaque zone en fonction de son ID
         if zone_id == 35:  # Zone principale pour l'élément
@@ -963,8 +957,8 @@ class Game:
                 item.held_by_player = False
                 item.rect.center = zone.rect.center
                 self.player.held_item = None
-                zone.have_object = True
-                print(f"DEBUG: Élément principal {item.name} placé sur la zone de crafting {zone_id}")
+                self.zone_occupancy.place(item, zone)
+                logger.debug("Élément principal %s placé sur la zone de crafting %s", item.name, zone_id)
                 return True
             else:
                 if not isinstance(item, Element):
@@ -979,8 +973,8 @@ class Game:
                 item.held_by_player = False
                 item.rect.center = zone.rect.center
                 self.player.held_item = None
-                zone.have_object = True
-                print(f"DEBUG: Pierre d'amélioration 1 ({item.stone_type}) placée sur zone {zone_id}")
+                self.zone_occupancy.place(item, zone)
+                logger.debug("Pierre d'amélioration 1 (%s) placée sur zone %s", item.stone_type, zone_id)
                 return True
             else:
                 if not isinstance(item, EnhancementStone):
@@ -995,8 +989,8 @@ class Game:
                 item.held_by_player = False
                 item.rect.center = zone.rect.center
                 self.player.held_item = None
-                zone.have_object = True
-                print(f"DEBUG: Pierre d'amélioration 2 ({item.stone_type}) placée sur zone {zone_id}")
+                self.zone_occupancy.place(item, zone)
+                logger.debug("Pierre d'amélioration 2 (%s) placée sur zone %s", item.stone_type, zone_id)
                 return True
             else:
                 if not isinstance(item, EnhancementStone):
@@ -1006,86 +1000,44 @@ class Game:
                 return False
 
         # Si on arrive ici, la zone n'est pas reconnue ou l'objet n'est pas compatible
-        print(f"DEBUG: Zone {zone_id} non reconnue ou objet incompatible")
+        logger.debug("Zone %s non reconnue ou objet incompatible", zone_id)
         return False
 
 
     def get_objects_on_zone(self, zone):
-        """Récupère tous les objets présents sur une zone avec une détection plus précise"""
-        objects_on_zone = []
-
-        # Définir un seuil de recouvrement (pourcentage minimum de l'objet sur la zone)
-        overlap_threshold = 0.5
-
-        # Vérifier chaque groupe d'objets
-        for element in self.elements:
-            if not element.held_by_player:
-                # Calculer la zone de recouvrement
-                overlap_rect = element.rect.clip(zone.rect)
-                if overlap_rect.width > 0 and overlap_rect.height > 0:
-                    # Calculer le pourcentage de recouvrement
-                    element_area = element.rect.width * element.rect.height
-                    overlap_area = overlap_rect.width * overlap_rect.height
-                    if overlap_area / element_area >= overlap_threshold:
-                        objects_on_zone.append(element)
-
-        # Même logique pour les potions et les pierres
-        for potion in self.potions:
-            if not potion.held_by_player:
-                overlap_rect = potion.rect.clip(zone.rect)
-                if overlap_rect.width > 0 and overlap_rect.height > 0:
-                    potion_area = potion.rect.width * potion.rect.height
-                    overlap_area = overlap_rect.width * overlap_rect.height
-                    if overlap_area / potion_area >= overlap_threshold:
-                        objects_on_zone.append(potion)
-
-        for stone in self.enhancement_stones:
-            if not stone.held_by_player:
-                overlap_rect = stone.rect.clip(zone.rect)
-                if overlap_rect.width > 0 and overlap_rect.height > 0:
-                    stone_area = stone.rect.width * stone.rect.height
-                    overlap_area = overlap_rect.width * overlap_rect.height
-                    if overlap_area / stone_area >= overlap_threshold:
-                        objects_on_zone.append(stone)
-
-        print(f"DEBUG: {len(objects_on_zone)} objets trouvés sur la zone {zone.id}")
-        return objects_on_zone
+        """Récupère les objets présents sur une zone (au plus un), d'après l'index d'occupation"""
+        obj = self.zone_occupancy.get(zone)
+        return [obj] if obj is not None else []
 
     def try_craft_potion(self):
         """Essaye de créer une potion avec les éléments placés"""
         if not self.potion_craft_state["element"]:
-            print("Pas d'élément principal pour la potion")
+            logger.info("Pas d'élément principal pour la potion")
             return False
 
         # Récupérer le nom de l'élément principal
         element_name = self.potion_craft_state["element"].name
-        print(f"DEBUG: Tentative de craft avec l'élément {element_name}")
+        logger.debug("Tentative de craft avec l'élément %s", element_name)
 
         # Chercher une potion correspondante
-        matching_potion = None
-        for potion_data in self.potions_data:
-            if element_name in potion_data["ingredients"]:
-                matching_potion = potion_data
-                print(f"DEBUG: Potion trouvée: {potion_data['name']}")
-                break
+        matching_potion = self.potion_catalog.find_by_ingredient(element_name)
+        if matching_potion:
+            logger.debug("Potion trouvée: %s", matching_potion['name'])
 
         if not matching_potion:
-            print(f"Pas de potion possible avec l'élément {element_name}")
+            logger.info("Pas de potion possible avec l'élément %s", element_name)
             return False
 
         # Trouver la zone de résultat par ID
-        result_zone = None
-        for zone in self.potioncraft_zones:
-            if zone.id == 37:  # ID de la zone de résultat
-                result_zone = zone
-                break
+        result_zone = self.zone_index.get_by_id(37, "potioncraft_zone")  # ID de la zone de résultat
 
         if not result_zone:
-            print("Zone de résultat non trouvée")
+            logger.warning("Zone de résultat non trouvée")
             return False
 
-        # Marquer la zone comme libre avant de créer la potion
-        result_zone.have_object = False
+        if result_zone.have_object:
+            logger.info("Zone de résultat occupée")
+            return False
 
         new_potion = Potion(result_zone.rect.centerx, result_zone.rect.centery, matching_potion, element_name)
 
@@ -1093,15 +1045,18 @@ class Game:
         if self.potion_craft_state["stone1"]:
             new_potion.apply_enhancement(self.potion_craft_state["stone1"].stone_type)
             self.enhancement_stones.remove(self.potion_craft_state["stone1"])
+            self.zone_occupancy.remove(self.potion_craft_state["stone1"])
             self.potion_craft_state["stone1"] = None
 
         if self.potion_craft_state["stone2"]:
             new_potion.apply_enhancement(self.potion_craft_state["stone2"].stone_type)
             self.enhancement_stones.remove(self.potion_craft_state["stone2"])
+            self.zone_occupancy.remove(self.potion_craft_state["stone2"])
             self.potion_craft_state["stone2"] = None
 
         # Supprimer l'élément utilisé
         self.elements.remove(self.potion_craft_state["element"])
+        self.zone_occupancy.remove(self.potion_craft_state["element"])
         self.potion_craft_state["element"] = None
 
         # Ajouter la potion aux potions disponibles
@@ -1109,35 +1064,32 @@ class Game:
         self.potion_craft_state["result"] = new_potion
 
         # Marquer la zone de résultat comme occupée
-        result_zone.have_object = True
+        self.zone_occupancy.place(new_potion, result_zone)
 
         # Donner de l'XP au joueur
         self.player.craft_success(new_potion.category)
 
-        print(f"Création réussie d'une potion {new_potion.name} !")
+        logger.info("Création réussie d'une potion %s !", new_potion.name)
         return True
 
     def create_potion_for_inventory(self):
         """Crée une potion et l'ajoute directement à l'inventaire du joueur"""
         if not self.potion_craft_state["element"]:
-            print("DEBUG: Pas d'élément principal pour la potion")
+            logger.debug("Pas d'élément principal pour la potion")
             self.ui.show_message("Élément principal manquant pour créer la potion!", 2.0)
             return False
 
         # Récupérer le nom de l'élément principal
         element_name = self.potion_craft_state["element"].name
-        print(f"DEBUG: Tentative de craft avec l'élément {element_name}")
+        logger.debug("Tentative de craft avec l'élément %s", element_name)
 
         # Chercher une potion correspondante
-        matching_potion = None
-        for potion_data in self.potions_data:
-            if element_name in potion_data["ingredients"]:
-                matching_potion = potion_data
-                print(f"DEBUG: Potion trouvée: {potion_data['name']}")
-                break
+        matching_potion = self.potion_catalog.find_by_ingredient(element_name)
+        if matching_potion:
+            logger.debug("Potion trouvée: %s", matching_potion['name'])
 
         if not matching_potion:
-            print(f"DEBUG: Pas de potion possible avec l'élément {element_name}")
+            logger.debug("Pas de potion possible avec l'élément %s", element_name)
             self.ui.show_message(f"Impossible de créer une potion avec {element_name}!", 2.0)
             return False
 
@@ -1153,12 +1105,9 @@ class Game:
             new_potion.apply_enhancement(stone_type)
             self.enhancement_stones.remove(self.potion_craft_state["stone1"])
             # Libérer la zone de la pierre 1
-            for zone in self.potioncraft_zones:
-                if zone.id == 33:
-                    zone.have_object = False
-                    break
+            self.zone_occupancy.remove(self.potion_craft_state["stone1"])
             self.potion_craft_state["stone1"] = None
-            print("DEBUG: Pierre d'amélioration 1 appliquée et consommée")
+            logger.debug("Pierre d'amélioration 1 appliquée et consommée")
             enhancements.append("puissance" if stone_type == "power" else "durée")
 
         if self.potion_craft_state["stone2"]:
@@ -1166,28 +1115,22 @@ class Game:
             new_potion.apply_enhancement(stone_type)
             self.enhancement_stones.remove(self.potion_craft_state["stone2"])
             # Libérer la zone de la pierre 2
-            for zone in self.potioncraft_zones:
-                if zone.id == 34:
-                    zone.have_object = False
-                    break
+            self.zone_occupancy.remove(self.potion_craft_state["stone2"])
             self.potion_craft_state["stone2"] = None
-            print("DEBUG: Pierre d'amélioration 2 appliquée et consommée")
+            logger.debug("Pierre d'amélioration 2 appliquée et consommée")
             enhancements.append("puissance" if stone_type == "power" else "durée")
 
         # Supprimer l'élément utilisé
         self.elements.remove(self.potion_craft_state["element"])
         # Libérer la zone de l'élément
-        for zone in self.potioncraft_zones:
-            if zone.id == 35:
-                zone.have_object = False
-                break
+        self.zone_occupancy.remove(self.potion_craft_state["element"])
         self.potion_craft_state["element"] = None
-        print("DEBUG: Élément principal consommé")
+        logger.debug("Élément principal consommé")
 
         # Ajouter la potion à l'inventaire du joueur
         if len(self.player_inventory) < self.max_inventory_size:
             self.player_inventory.append(new_potion)
-            print(f"DEBUG: Potion {new_potion.name} ajoutée à l'inventaire")
+            logger.debug("Potion %s ajoutée à l'inventaire", new_potion.name)
 
             # Préparer le message de réussite
             message = f"Potion {new_potion.name} créée"
@@ -1204,12 +1147,12 @@ class Game:
             new_potion.rect.topleft = (self.player.rect.centerx + 20, self.player.rect.centery + 20)
             self.potions.add(new_potion)
             self.ui.show_message("Inventaire plein ! La potion a été déposée près de vous.", 2.0)
-            print("DEBUG: Inventaire plein, potion déposée au sol")
+            logger.debug("Inventaire plein, potion déposée au sol")
 
         # Donner de l'XP au joueur
         self.player.craft_success(new_potion.category)
 
-        print(f"DEBUG: Création réussie d'une potion {new_potion.name}!")
+        logger.debug("Création réussie d'une potion %s!", new_potion.name)
         return True
     def draw_help(self):
         """Affiche l'écran d'aide/tutoriel"""
@@ -1218,8 +1161,8 @@ class Game:
         help_surface.fill((0, 0, 0, 180))
 
         # Titre
-        title_font = pygame.font.SysFont('Arial', 30, bold=True)
-        title_text = title_font.render("AIDE - PIXEL ALCHEMIST", True, (255, 255, 255))
+        title_font = get_font('Arial', 30, bold=True)
+        title_text = render_text(title_font, "AIDE - PIXEL ALCHEMIST", True, (255, 255, 255))
         help_surface.blit(title_text, (self.screen_width // 2 - title_text.get_width() // 2, 50))
 
         # Instructions
@@ -1250,19 +1193,19 @@ class Game:
             "- Pour créer une potion, placez-vous devant la zone de résultat et maintenez E"
         ]
 
-        font = pygame.font.SysFont('Arial', 20)
+        font = get_font('Arial', 20)
         y = 100
         for line in instructions:
             if line == "":
                 y += 20
                 continue
 
-            text = font.render(line, True, (255, 255, 255))
+            text = render_text(font, line, True, (255, 255, 255))
             help_surface.blit(text, (self.screen_width // 2 - 250, y))
             y += 30
 
         # Message de fermeture
-        close_text = font.render("Appuyez sur H pour fermer ce menu", True, (255, 200, 200))
+        close_text = render_text(font, "Appuyez sur H pour fermer ce menu", True, (255, 200, 200))
         help_surface.blit(close_text, (self.screen_width // 2 - close_text.get_width() // 2, self.screen_height - 50))
 
         self.screen.blit(help_surface, (0, 0))
@@ -1274,18 +1217,10 @@ class Game:
 
     def handle_potioncraft_zone_pickup(self, zone):
         """Gère la récupération d'un objet sur une zone de craft de potion"""
-        game_objects = {
-            'elements': self.elements,
-            'potions': self.potions,
-            'stones': self.enhancement_stones
-        }
-
-        obj = get_element_on_tile(zone, game_objects, self.potion_craft_state)
+        obj = get_element_on_tile(zone, self.zone_occupancy, self.potion_craft_state)
         if obj:
             success = self.player.pick_element(obj)
             if success:
-                zone.have_object = False
-
                 # Message adapté au type d'objet récupéré
                 if isinstance(obj, Element):
                     message = f"Élément {obj.name} récupéré!"
@@ -1302,7 +1237,7 @@ class Game:
     def handle_potion_craft_zone(self, zone):
         """Gère l'interaction avec une zone de craft de potion de façon robuste"""
         zone_id = zone.id
-        print(f"DEBUG: Interaction avec zone de craft de potion {zone_id}")
+        logger.debug("Interaction avec zone de craft de potion %s", zone_id)
 
         # Vérifier si le joueur tient un objet
         if self.player.held_item:
@@ -1324,21 +1259,18 @@ class Game:
 
                 # Traiter les références dans potion_craft_state avant de récupérer l'objet
                 if zone_id == 35 and self.potion_craft_state["element"] == obj:
-                    print("DEBUG: Réinitialisation de l'élément principal")
+                    logger.debug("Réinitialisation de l'élément principal")
                     self.potion_craft_state["element"] = None
                 elif zone_id == 33 and self.potion_craft_state["stone1"] == obj:
-                    print("DEBUG: Réinitialisation de la pierre 1")
+                    logger.debug("Réinitialisation de la pierre 1")
                     self.potion_craft_state["stone1"] = None
                 elif zone_id == 34 and self.potion_craft_state["stone2"] == obj:
-                    print("DEBUG: Réinitialisation de la pierre 2")
+                    logger.debug("Réinitialisation de la pierre 2")
                     self.potion_craft_state["stone2"] = None
 
                 # Tenter de récupérer l'objet
                 success = self.player.pick_element(obj)
                 if success:
-                    # Marquer explicitement la zone comme non occupée
-                    zone.have_object = False
-
                     # Message adapté au type d'objet récupéré
                     if isinstance(obj, Element):
                         message = f"Élément {obj.name} récupéré!"
@@ -1350,11 +1282,6 @@ class Game:
                     self.ui.show_message(message, 1.5)
                     return True
             else:
-                # Si la zone est marquée comme occupée mais ne contient pas d'objet
-                if zone.have_object:
-                    print(f"DEBUG: Zone {zone.id} marquée comme occupée mais aucun objet trouvé. État corrigé.")
-                    zone.have_object = False
-
                 self.ui.show_message("Aucun objet à récupérer sur cette zone!", 1.5)
                 return False
 
@@ -1377,44 +1304,44 @@ class Game:
         status_surface.fill((0, 0, 0, 160))  # Fond semi-transparent
 
         # Titre
-        font = pygame.font.SysFont('Arial', 16)
-        title = font.render("État du crafting de potion", True, (255, 255, 255))
+        font = get_font('Arial', 16)
+        title = render_text(font, "État du crafting de potion", True, (255, 255, 255))
         status_surface.blit(title, (10, 5))
 
         # Élément principal
         y_pos = 30
-        status_surface.blit(font.render("Élément:", True, (220, 220, 220)), (10, y_pos))
+        status_surface.blit(render_text(font, "Élément:", True, (220, 220, 220)), (10, y_pos))
         if self.potion_craft_state["element"]:
             element_name = self.potion_craft_state["element"].name
-            element_text = font.render(element_name, True, (100, 255, 100))
+            element_text = render_text(font, element_name, True, (100, 255, 100))
             status_surface.blit(element_text, (100, y_pos))
         else:
-            status_surface.blit(font.render("Non placé", True, (255, 100, 100)), (100, y_pos))
+            status_surface.blit(render_text(font, "Non placé", True, (255, 100, 100)), (100, y_pos))
 
         # Pierre 1
         y_pos += 25
-        status_surface.blit(font.render("Pierre 1:", True, (220, 220, 220)), (10, y_pos))
+        status_surface.blit(render_text(font, "Pierre 1:", True, (220, 220, 220)), (10, y_pos))
         if self.potion_craft_state["stone1"]:
             stone_type = "Puissance" if self.potion_craft_state["stone1"].stone_type == "power" else "Durée"
-            stone_text = font.render(stone_type, True, (100, 255, 100))
+            stone_text = render_text(font, stone_type, True, (100, 255, 100))
             status_surface.blit(stone_text, (100, y_pos))
         else:
-            status_surface.blit(font.render("Non placée", True, (200, 200, 200)), (100, y_pos))
+            status_surface.blit(render_text(font, "Non placée", True, (200, 200, 200)), (100, y_pos))
 
         # Pierre 2
         y_pos += 25
-        status_surface.blit(font.render("Pierre 2:", True, (220, 220, 220)), (10, y_pos))
+        status_surface.blit(render_text(font, "Pierre 2:", True, (220, 220, 220)), (10, y_pos))
         if self.potion_craft_state["stone2"]:
             stone_type = "Puissance" if self.potion_craft_state["stone2"].stone_type == "power" else "Durée"
-            stone_text = font.render(stone_type, True, (100, 255, 100))
+            stone_text = render_text(font, stone_type, True, (100, 255, 100))
             status_surface.blit(stone_text, (100, y_pos))
         else:
-            status_surface.blit(font.render("Non placée", True, (200, 200, 200)), (100, y_pos))
+            status_surface.blit(render_text(font, "Non placée", True, (200, 200, 200)), (100, y_pos))
 
         # Instructions
         y_pos += 30
         if self.potion_craft_state["element"]:
-            instr = font.render("Appuyez sur C pour mélanger", True, (255, 255, 100))
+            instr = render_text(font, "Appuyez sur C pour mélanger", True, (255, 255, 100))
             status_surface.blit(instr, (10, y_pos))
 
         # Afficher sur l'écran
@@ -1445,8 +1372,8 @@ class Game:
 
         # Pourcentage de progression
         percent = int(progress * 100)
-        font = pygame.font.SysFont('Arial', 16)
-        text = font.render(f"Mélange: {percent}%", True, (255, 255, 255))
+        font = get_font('Arial', 16)
+        text = render_text(font, f"Mélange: {percent}%", True, (255, 255, 255))
         text_x = bar_x + (bar_width - text.get_width()) // 2
         text_y = bar_y - 25
         self.screen.blit(text, (text_x, text_y))
@@ -1459,17 +1386,17 @@ class Game:
         guide_surface.fill((20, 20, 50, 230))  # Fond bleu foncé semi-transparent
 
         # Titre
-        title_font = pygame.font.SysFont('Arial', 28, bold=True)
-        title_text = title_font.render("GUIDE DE CRÉATION DES POTIONS", True, (255, 255, 255))
+        title_font = get_font('Arial', 28, bold=True)
+        title_text = render_text(title_font, "GUIDE DE CRÉATION DES POTIONS", True, (255, 255, 255))
         guide_surface.blit(title_text, (guide_width // 2 - title_text.get_width() // 2, 20))
 
         # Sous-titre
-        subtitle_font = pygame.font.SysFont('Arial', 20, bold=True)
-        subtitle_text = subtitle_font.render("Comment créer une potion efficace", True, (200, 200, 255))
+        subtitle_font = get_font('Arial', 20, bold=True)
+        subtitle_text = render_text(subtitle_font, "Comment créer une potion efficace", True, (200, 200, 255))
         guide_surface.blit(subtitle_text, (guide_width // 2 - subtitle_text.get_width() // 2, 60))
 
         # Instructions
-        instruction_font = pygame.font.SysFont('Arial', 18)
+        instruction_font = get_font('Arial', 18)
         instructions = [
             "1. Collectez les éléments de base (Feu, Eau, Terre, Air) dans la cave ou le laboratoire",
             "2. Combinez-les sur la table de craft pour créer des éléments avancés (Tier 2, 3, 4)",
@@ -1494,7 +1421,7 @@ class Game:
 
         y = 100
         for line in instructions:
-            line_text = instruction_font.render(line, True, (255, 255, 255))
+            line_text = render_text(instruction_font, line, True, (255, 255, 255))
             guide_surface.blit(line_text, (30, y))
             y += 25
 
@@ -1504,43 +1431,48 @@ class Game:
 
         # Élément principal (zone supérieure gauche)
         pygame.draw.rect(guide_surface, (255, 100, 100), (460, 160, 40, 40))
-        label = instruction_font.render("Élément", True, (255, 255, 255))
+        label = render_text(instruction_font, "Élément", True, (255, 255, 255))
         guide_surface.blit(label, (450, 130))
 
         # Chaudron (zone supérieure droite)
         pygame.draw.circle(guide_surface, (100, 100, 255), (520, 180), 20)
-        label = instruction_font.render("Mixage (C)", True, (255, 255, 255))
+        label = render_text(instruction_font, "Mixage (C)", True, (255, 255, 255))
         guide_surface.blit(label, (490, 130))
 
         # Pierre 1 (zone inférieure gauche)
         pygame.draw.rect(guide_surface, (255, 0, 0), (460, 210, 40, 40))
-        label = instruction_font.render("Pierre 1", True, (255, 255, 255))
+        label = render_text(instruction_font, "Pierre 1", True, (255, 255, 255))
         guide_surface.blit(label, (450, 250))
 
         # Pierre 2 (zone inférieure droite)
         pygame.draw.rect(guide_surface, (0, 0, 255), (520, 210, 40, 40))
-        label = instruction_font.render("Pierre 2", True, (255, 255, 255))
+        label = render_text(instruction_font, "Pierre 2", True, (255, 255, 255))
         guide_surface.blit(label, (510, 250))
 
         # Message de fermeture
-        close_text = instruction_font.render("Appuyez sur une touche pour fermer", True, (255, 200, 200))
+        close_text = render_text(instruction_font, "Appuyez sur une touche pour fermer", True, (255, 200, 200))
         guide_surface.blit(close_text, (guide_width // 2 - close_text.get_width() // 2, guide_height - 40))
 
         # Afficher le guide sur l'écran
         guide_x = (self.screen_width - guide_width) // 2
         guide_y = (self.screen_height - guide_height) // 2
         self.screen.blit(guide_surface, (guide_x, guide_y))
-        pygame.display.flip()
+        present()
 
         # Attendre une entrée utilisateur pour fermer
         waiting_for_input = True
         while waiting_for_input:
-            for event in pygame.event.get():
+            for event in self.input.get_events():
                 if event.type == pygame.QUIT:
                     self.running = False
                     waiting_for_input = False
                 elif event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
                     waiting_for_input = False
+            self.input.tick(self.loop.clock, MAX_FPS)
+
+        # Ne pas rattraper en simulation le temps passé à lire le guide
+        self.loop.reset()
+        self.renderer.invalidate()
 
     def draw_pause_screen(self):
         """Affiche l'écran de pause"""
@@ -1549,12 +1481,12 @@ class Game:
         pause_surface.fill((0, 0, 0, 150))  # Fond noir semi-transparent
 
         # Titre
-        title_font = pygame.font.SysFont('Arial', 40, bold=True)
-        title_text = title_font.render("PAUSE", True, (255, 255, 255))
+        title_font = get_font('Arial', 40, bold=True)
+        title_text = render_text(title_font, "PAUSE", True, (255, 255, 255))
         pause_surface.blit(title_text, (self.screen_width // 2 - title_text.get_width() // 2, 150))
 
         # Instructions
-        instruction_font = pygame.font.SysFont('Arial', 24)
+        instruction_font = get_font('Arial', 24)
         instructions = [
             "Appuyez sur P pour reprendre le jeu",
             "Appuyez sur H pour l'aide",
@@ -1563,18 +1495,18 @@ class Game:
 
         y = 250
         for line in instructions:
-            line_text = instruction_font.render(line, True, (255, 255, 255))
+            line_text = render_text(instruction_font, line, True, (255, 255, 255))
             pause_surface.blit(line_text, (self.screen_width // 2 - line_text.get_width() // 2, y))
             y += 40
 
         # Informations sur la progression
-        progress_font = pygame.font.SysFont('Arial', 20)
-        progress_text = progress_font.render(f"Vagues complétées: {self.waves_completed}/{self.max_waves}", True,
+        progress_font = get_font('Arial', 20)
+        progress_text = render_text(progress_font, f"Vagues complétées: {self.waves_completed}/{self.max_waves}", True,
                                              (200, 200, 255))
         pause_surface.blit(progress_text, (self.screen_width // 2 - progress_text.get_width() // 2, 380))
 
         # Statistiques du joueur
-        stats_text = progress_font.render(f"Niveau: {self.player.level} | XP: {self.player.experience}", True,
+        stats_text = render_text(progress_font, f"Niveau: {self.player.level} | XP: {self.player.experience}", True,
                                           (200, 255, 200))
         pause_surface.blit(stats_text, (self.screen_width // 2 - stats_text.get_width() // 2, 410))
 
@@ -1612,11 +1544,11 @@ class Game:
 
             # Afficher l'ID et l'état d'occupation
             if self.debug_collision:
-                font = pygame.font.SysFont('Arial', 10)
+                font = get_font('Arial', 10)
                 text = f"{zone.id}"
-                if hasattr(zone, "have_object") and zone.have_object:
+                if zone.have_object:
                     text += " ✓"
-                text_surface = font.render(text, True, (255, 255, 255))
+                text_surface = render_text(font, text, True, (255, 255, 255))
                 self.screen.blit(text_surface, (zone.rect.x + 2, zone.rect.y + 2))
 
     def start_defense_phase(self):
@@ -1629,17 +1561,22 @@ class Game:
         while True:  # Boucle pour permettre de rejouer
             # Créer une instance de DefenseGame avec toutes les potions disponibles
             defense_potions = self.player_inventory.copy()  # Utiliser les potions de l'inventaire plutôt que les potions au sol
-            defense_game = DefenseGame(self.screen, self.player, defense_potions)
+            defense_seed = self.random_streams.stream(DEFENSE_STREAM).randrange(2 ** 32)
+            defense_game = DefenseGame(self.screen, self.player, defense_potions, self.wave_data,
+                                       seed=defense_seed, input_source=self.input)
 
             # Afficher un message de transition
             self.ui.show_message(
                 f"Préparation de la défense du laboratoire (Vague {self.waves_completed + 1}/{self.max_waves})...", 2.0)
             self.display()  # Mettre à jour l'affichage pour voir le message
-            pygame.time.delay(2000)  # Attendre 2 secondes pour la transition
+            self.input.delay(2000)  # Attendre 2 secondes pour la transition
 
             # Lancer la phase de défense
             result = defense_game.run()
 
+            # La phase de défense a dessiné sur tout l'écran
+            self.renderer.invalidate()
+
             # Vérifier si le joueur veut recommencer
             if isinstance(result, tuple) and len(result) == 3 and result[0] == "restart":
                 # Le joueur veut recommencer, extraire le score et la vague
@@ -1651,7 +1588,7 @@ class Game:
                 # Afficher un message pour le redémarrage
                 self.ui.show_message("Redémarrage de la défense du laboratoire...", 2.0)
                 self.display()
-                pygame.time.delay(1500)
+                self.input.delay(1500)
 
                 # La boucle continue, créant une nouvelle partie
                 continue
@@ -1675,7 +1612,7 @@ class Game:
 
                 # Afficher l'écran de victoire et attendre l'entrée utilisateur
                 self.display()  # Cela affichera l'écran de victoire
-                return
+                break
             else:
                 # Afficher les résultats après la défense
                 self.ui.show_message(
@@ -1693,25 +1630,28 @@ class Game:
                 # Sortir de la boucle, retour à la phase 1
                 break
 
+        # Ne pas rattraper en simulation le temps passé en phase de défense
+        self.loop.reset()
+
     def print_map_zones(self):
         """Affiche toutes les zones map_zone disponibles dans chaque carte"""
-        print("\n=== ZONES MAP_ZONE DÉTECTÉES ===")
+        logger.info("=== ZONES MAP_ZONE DÉTECTÉES ===")
 
         for map_name, map_data in self.maps.items():
-            print(f"\n--- Carte: {map_name} ---")
+            logger.info("--- Carte: %s ---", map_name)
 
             # Vérifier si map_zones existe dans le dictionnaire
             if "map_zones" in map_data:
                 map_zones = map_data["map_zones"]
                 if map_zones:
-                    print(f"Nombre de zones map_zone: {len(map_zones)}")
+                    logger.info("Nombre de zones map_zone: %s", len(map_zones))
                     for i, zone in enumerate(map_zones):
                         zone_name = getattr(zone, 'name', 'Sans nom')
-                        print(f"  {i + 1}. ID: {zone.id}, Position: ({zone.rect.x}, {zone.rect.y}), Nom: {zone_name}")
+                        logger.info("%s. ID: %s, Position: (%s, %s), Nom: %s", i + 1, zone.id, zone.rect.x, zone.rect.y, zone_name)
                 else:
-                    print("Aucune zone map_zone trouvée dans cette carte.")
+                    logger.info("Aucune zone map_zone trouvée dans cette carte.")
             else:
-                print("La clé 'map_zones' n'existe pas dans les données de cette carte.")
+                logger.info("La clé 'map_zones' n'existe pas dans les données de cette carte.")
 
     def show_victory_screen(self):
         """Affiche l'écran de victoire finale"""
@@ -1720,18 +1660,18 @@ class Game:
         victory_surface.fill((0, 50, 0, 180))  # Fond vert foncé semi-transparent
 
         # Titre
-        title_font = pygame.font.SysFont('Arial', 50, bold=True)
-        title_text = title_font.render("VICTOIRE !", True, (255, 255, 100))
+        title_font = get_font('Arial', 50, bold=True)
+        title_text = render_text(title_font, "VICTOIRE !", True, (255, 255, 100))
         victory_surface.blit(title_text, (self.screen_width // 2 - title_text.get_width() // 2, 120))
 
         # Message de félicitations
-        subtitle_font = pygame.font.SysFont('Arial', 28)
-        subtitle_text = subtitle_font.render("Félicitations, vous avez défendu le laboratoire avec succès !", True,
+        subtitle_font = get_font('Arial', 28)
+        subtitle_text = render_text(subtitle_font, "Félicitations, vous avez défendu le laboratoire avec succès !", True,
                                              (255, 255, 255))
         victory_surface.blit(subtitle_text, (self.screen_width // 2 - subtitle_text.get_width() // 2, 180))
 
         # Statistiques finales
-        stats_font = pygame.font.SysFont('Arial', 22)
+        stats_font = get_font('Arial', 22)
         stats = [
             f"Vagues complétées: {self.max_waves}/{self.max_waves}",
             f"Niveau final: {self.player.level}",
@@ -1742,18 +1682,18 @@ class Game:
 
         y = 250
         for line in stats:
-            line_text = stats_font.render(line, True, (200, 255, 200))
+            line_text = render_text(stats_font, line, True, (200, 255, 200))
             victory_surface.blit(line_text, (self.screen_width // 2 - line_text.get_width() // 2, y))
             y += 35
 
         # Message de fin
-        conclusion_font = pygame.font.SysFont('Arial', 24)
-        conclusion_text = conclusion_font.render("Vous êtes devenu un véritable maître alchimiste !", True,
+        conclusion_font = get_font('Arial', 24)
+        conclusion_text = render_text(conclusion_font, "Vous êtes devenu un véritable maître alchimiste !", True,
                                                  (255, 255, 150))
         victory_surface.blit(conclusion_text, (self.screen_width // 2 - conclusion_text.get_width() // 2, 400))
 
         # Options
-        options_font = pygame.font.SysFont('Arial', 22)
+        options_font = get_font('Arial', 22)
         options = [
             "Appuyez sur ESPACE pour rejouer",
             "Appuyez sur ESC pour quitter"
@@ -1761,7 +1701,7 @@ class Game:
 
         y = 470
         for line in options:
-            line_text = options_font.render(line, True, (255, 255, 255))
+            line_text = render_text(options_font, line, True, (255, 255, 255))
             victory_surface.blit(line_text, (self.screen_width // 2 - line_text.get_width() // 2, y))
             y += 35
 
@@ -1794,9 +1734,8 @@ class Game:
             self.map_elements[map_name]["enhancement_stones"].empty()
 
         # Réinitialiser l'état des zones
-        for map_name, map_data in self.maps.items():
-            for zone in map_data["zones"]:
-                zone.have_object = False
+        self.zone_occupancy.clear()
+        self.auto_craft_manager.reset()
 
         # Réinitialiser l'état du crafting de potion
         self.potion_craft_state = {
@@ -1818,10 +1757,11 @@ class Game:
         # Afficher un message de bienvenue
         self.ui.show_message("Nouvelle partie commencée ! Préparez vos potions !", 3.0)
 
+    def handle_frame_events(self):
+        """Traitement des entrées, une fois par image"""
+        self.player.save_location()
+        self.handling_events()
+
     def run(self):
-        while self.running:
-            self.player.save_location()
-            self.handling_events()
-            self.update()
-            self.display()
-            self.clock.tick(60)
\ No newline at end of file
+        self.loop.run(lambda: self.running, self.handle_frame_events, self.update, self.display,
+                      section_names=("handling_events", "update", "display"))
\ No newline at end of file
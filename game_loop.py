@@ -0,0 +1,107 @@
+import pygame
+
+from constants import SIMULATION_STEP, MAX_FPS, MAX_STEPS_PER_FRAME, MAX_FRAME_TIME
+from profiler import profiler
+from replay import LiveInput
+
+
+class GameLoop:
+    """
+    Boucle de jeu à pas de simulation fixe.
+    La logique avance toujours par pas de `step` secondes (accumulateur), quel que
+    soit le nombre d'images affichées ; l'affichage est limité à `max_fps`.
+    Partagée par la phase de crafting (Game) et la phase de défense (DefenseGame).
+    """
+
+    def __init__(self, step=SIMULATION_STEP, max_fps=MAX_FPS,
+                 max_steps_per_frame=MAX_STEPS_PER_FRAME, max_frame_time=MAX_FRAME_TIME, input_source=None):
+        """
+        :param step: durée d'un pas de simulation en secondes
+        :param max_fps: nombre maximum d'images par seconde (0 = pas de limite)
+        :param max_steps_per_frame: nombre maximum de pas rattrapés par image
+        :param max_frame_time: durée maximale prise en compte pour une image (en secondes)
+        :param input_source: source des entrées et de l'horloge (voir replay.py, par défaut LiveInput) ;
+                             une relecture impose le nombre de pas de chaque image
+        """
+        self.input = input_source if input_source is not None else LiveInput()
+        self.step = step
+        self.max_fps = max_fps
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_frame_time = max_frame_time
+
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0.0
+
+        # Fraction du pas suivant déjà écoulée (utile pour interpoler l'affichage)
+        self.alpha = 0.0
+
+        # Statistiques
+        self.steps = 0  # Nombre total de pas de simulation
+        self.dropped_time = 0.0  # Temps abandonné par la protection anti-"spirale de la mort"
+
+    def reset(self):
+        """
+        Oublie le temps écoulé depuis la dernière image.
+        À appeler après une opération bloquante (autre phase, écran d'attente...)
+        pour ne pas la rattraper en simulation.
+        """
+        self.clock.tick()
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, frame_time):
+        """
+        Ajoute le temps d'une image à l'accumulateur
+        :param frame_time: temps écoulé depuis l'image précédente (en secondes)
+        :return: nombre de pas de simulation à exécuter pour cette image
+        """
+        # Une image anormalement longue (fenêtre déplacée, point d'arrêt...) est tronquée
+        if frame_time > self.max_frame_time:
+            self.dropped_time += frame_time - self.max_frame_time
+            frame_time = self.max_frame_time
+
+        self.accumulator += frame_time
+        steps = min(int(self.accumulator / self.step), self.max_steps_per_frame)
+        self.accumulator -= steps * self.step
+
+        # Si la machine n'arrive pas à suivre, on abandonne le retard plutôt que
+        # d'exécuter de plus en plus de pas à chaque image
+        if self.accumulator >= self.step:
+            dropped = self.accumulator - self.accumulator % self.step
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+
+        self.alpha = self.accumulator / self.step
+        self.steps += steps
+        return steps
+
+    def run(self, should_continue, handle_events, update, render,
+            section_names=("handle_events", "update", "render")):
+        """
+        Exécute la boucle jusqu'à ce que should_continue() retourne False
+        :param should_continue: fonction sans argument, False pour arrêter la boucle
+        :param handle_events: fonction appelée une fois par image pour traiter les entrées
+        :param update: fonction appelée avec la durée du pas, pour chaque pas de simulation
+        :param render: fonction appelée une fois par image pour l'affichage
+        :param section_names: noms des sections du profileur pour les trois étapes
+        """
+        self.reset()
+        events_section, update_section, render_section = section_names
+
+        while should_continue():
+            frame_time = self.input.tick(self.clock, self.max_fps)
+            profiler.begin_frame()
+
+            with profiler.section(events_section):
+                handle_events()
+            if not should_continue():
+                break
+
+            with profiler.section(update_section):
+                for _ in range(self.input.frame_steps(self.advance(frame_time))):
+                    update(self.step)
+
+            with profiler.section(render_section):
+                render()
+
+            profiler.end_frame()
@@ -0,0 +1,214 @@
+"""
+Journalisation du jeu, basée sur le module logging de la bibliothèque standard.
+
+- Niveau par module, réglable sans toucher au code avec la variable d'environnement
+  PIXEL_ALCHEMIST_LOG, ex : "WARNING,Phase1.craft_manager=DEBUG,game=INFO"
+- Messages formatés seulement s'ils sont émis : logger.debug("Zone %s", zone.id)
+- Dans la console, les messages répétés (même ligne, même texte) sont limités à un par intervalle
+- Tous les derniers messages sont gardés en mémoire et peuvent être écrits dans un
+  fichier à la demande (touche F4 en jeu)
+"""
+import logging
+import os
+import sys
+import time
+from collections import deque
+
+from constants import LOG_LEVEL, LOG_BUFFER_SIZE, LOG_BUFFER_LEVEL, LOG_RATE_LIMIT
+
+LOG_ENV_VAR = "PIXEL_ALCHEMIST_LOG"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+LOG_DUMP_DIR = "logs"
+
+# Logger parent de tous les loggers du jeu
+_root_name = "pixel_alchemist"
+
+
+def parse_levels(spec, default=LOG_LEVEL):
+    """
+    Lit une configuration de niveaux "NIVEAU,module=NIVEAU,..."
+    :return: (niveau par défaut, dictionnaire module -> niveau)
+    :raises ValueError: si un niveau est inconnu
+    """
+    default_level = logging.getLevelName(default.upper())
+    module_levels = {}
+
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level_name = part.rpartition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Erreur : niveau de journalisation inconnu : {level_name}")
+        if name:
+            module_levels[name.strip()] = level
+        else:
+            default_level = level
+
+    return default_level, module_levels
+
+
+class ModuleLevelFilter(logging.Filter):
+    """Ne laisse passer que les messages au moins au niveau configuré pour leur module"""
+
+    def __init__(self, default_level, module_levels):
+        super().__init__()
+        self.default_level = default_level
+        self.module_levels = module_levels
+
+    def level_for(self, name):
+        """Niveau du module, ou de son paquet le plus proche configuré"""
+        while name:
+            if name in self.module_levels:
+                return self.module_levels[name]
+            name = name.rpartition(".")[0]
+        return self.default_level
+
+    def filter(self, record):
+        name = record.name
+        if name.startswith(_root_name + "."):
+            name = name[len(_root_name) + 1:]
+        return record.levelno >= self.level_for(name)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limite les messages répétés : un même message (même ligne de code, même texte)
+    n'est laissé passer qu'une fois par intervalle. Le nombre de répétitions ignorées
+    est gardé dans record.repeats_ignored du message suivant (voir RepeatFormatter).
+    """
+
+    # Au-delà de ce nombre de messages suivis, les plus anciens sont oubliés
+    MAX_TRACKED = 1000
+
+    def __init__(self, interval=LOG_RATE_LIMIT):
+        """
+        :param interval: intervalle minimum (en secondes) entre deux messages identiques
+        """
+        super().__init__()
+        self.interval = interval
+        self.last_emitted = {}  # (module, ligne, texte) -> heure du dernier message émis
+        self.suppressed = {}  # (module, ligne, texte) -> nombre de répétitions ignorées depuis
+
+    def filter(self, record):
+        if not self.interval:
+            return True
+
+        key = (record.name, record.lineno, record.getMessage())
+        now = time.monotonic()
+        last = self.last_emitted.get(key)
+        if last is not None and now - last < self.interval:
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+
+        if len(self.last_emitted) >= self.MAX_TRACKED:
+            self._forget_expired(now)
+        self.last_emitted[key] = now
+        record.repeats_ignored = self.suppressed.pop(key, 0)
+        return True
+
+    def _forget_expired(self, now):
+        """Oublie les messages dont l'intervalle est écoulé et sans répétition en attente"""
+        for key, last in list(self.last_emitted.items()):
+            if now - last >= self.interval and key not in self.suppressed:
+                del self.last_emitted[key]
+
+
+class RepeatFormatter(logging.Formatter):
+    """Formateur de la console : signale les répétitions ignorées par RateLimitFilter"""
+
+    def format(self, record):
+        text = super().format(record)
+        repeats = getattr(record, "repeats_ignored", 0)
+        if repeats:
+            text = f"{text} ({repeats} messages identiques ignorés)"
+        return text
+
+
+class RingBufferHandler(logging.Handler):
+    """Garde les derniers messages en mémoire, pour les écrire à la demande"""
+
+    def __init__(self, capacity=LOG_BUFFER_SIZE, level=logging.DEBUG):
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def clear(self):
+        self.records.clear()
+
+    def dump(self, stream):
+        """Écrit les messages gardés dans un flux texte"""
+        for record in list(self.records):
+            stream.write(self.format(record) + "\n")
+        return len(self.records)
+
+
+# Configuration partagée, appliquée au premier get_logger()
+_buffer_handler = None
+
+
+def configure(spec=None):
+    """
+    (Re)configure la journalisation
+    :param spec: niveaux "NIVEAU,module=NIVEAU" (par défaut : variable PIXEL_ALCHEMIST_LOG, sinon LOG_LEVEL)
+    """
+    global _buffer_handler
+    if spec is None:
+        spec = os.environ.get(LOG_ENV_VAR, "")
+
+    try:
+        default_level, module_levels = parse_levels(spec)
+    except ValueError as e:
+        default_level, module_levels = parse_levels("")
+        sys.stderr.write(f"{e} ({LOG_ENV_VAR} ignorée)\n")
+
+    root = logging.getLogger(_root_name)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.propagate = False
+
+    formatter = logging.Formatter(LOG_FORMAT, "%H:%M:%S")
+
+    console = logging.StreamHandler()
+    console.setFormatter(RepeatFormatter(LOG_FORMAT, "%H:%M:%S"))
+    console.addFilter(ModuleLevelFilter(default_level, module_levels))
+    console.addFilter(RateLimitFilter())
+    root.addHandler(console)
+
+    # Les niveaux demandés par PIXEL_ALCHEMIST_LOG (ex : DEBUG) sont aussi gardés en mémoire
+    buffer_level = min([logging.getLevelName(LOG_BUFFER_LEVEL.upper()), default_level, *module_levels.values()])
+    _buffer_handler = RingBufferHandler(LOG_BUFFER_SIZE, buffer_level)
+    _buffer_handler.setFormatter(formatter)
+    root.addHandler(_buffer_handler)
+
+    # Les messages sous les deux seuils sont écartés dès l'appel, sans créer d'enregistrement :
+    # avec les niveaux par défaut (INFO), les logger.debug des boucles de jeu ne coûtent qu'un test de niveau
+    root.setLevel(buffer_level)
+
+
+def get_logger(name):
+    """Retourne le logger d'un module (ex : get_logger(__name__))"""
+    if _buffer_handler is None:
+        configure()
+    return logging.getLogger(f"{_root_name}.{name}")
+
+
+def dump_log_buffer(path=None):
+    """
+    Écrit les derniers messages gardés en mémoire dans un fichier
+    :param path: chemin du fichier (par défaut : logs/log_<date>.txt)
+    :return: chemin du fichier écrit
+    """
+    if _buffer_handler is None:
+        configure()
+
+    if path is None:
+        os.makedirs(LOG_DUMP_DIR, exist_ok=True)
+        path = os.path.join(LOG_DUMP_DIR, time.strftime("log_%Y%m%d_%H%M%S.txt"))
+
+    with open(path, "w", encoding="utf-8") as file:
+        _buffer_handler.dump(file)
+    return path
@@ -1,12 +1,22 @@
+import argparse
+
 import constants
 import pygame
 import os
 
 # Import de notre classe Game mise à jour
 from game import Game
+from render_target import create_window
+from replay import Recorder
+
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pixel-Alchemist")
+    parser.add_argument("--record", default=None, help="Enregistre les entrées de la partie dans ce fichier")
+    parser.add_argument("--seed", type=int, default=constants.RNG_SEED,
+                        help="Graine de la partie (par défaut RNG_SEED, ou tirée au hasard)")
+    args = parser.parse_args(argv)
 
-def main():
     # S'assurer que tous les dossiers nécessaires existent
     required_dirs = [
         "Assets/Art/Items/Potions",
@@ -20,12 +30,23 @@ def main():
     pygame.init()
     pygame.display.set_caption("Pixel-Alchemist")
 
-    # Utiliser les dimensions de constants.py
-    screen = pygame.display.set_mode((constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT))
+    # Utiliser les dimensions de constants.py (fenêtre agrandie de WINDOW_SCALE)
+    screen = create_window(constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT, constants.WINDOW_SCALE)
 
     # Créer et exécuter le jeu
-    game = Game(screen)
-    game.run()
+    game = Game(screen, seed=args.seed)
+
+    # Enregistrer les entrées de la partie si demandé (avec la graine tirée par le jeu)
+    recorder = None
+    if args.record:
+        recorder = Recorder(args.record, game.random_streams.seed)
+        game.input.recorder = recorder
+
+    try:
+        game.run()
+    finally:
+        if recorder is not None:
+            recorder.save()
 
     # Quitter proprement
     pygame.quit()
@@ -1,5 +1,8 @@
 import pygame
 import os
+from log import get_logger
+
+logger = get_logger(__name__)
 
 # Classe pour gérer la musique du jeu
 class MusicManager:
@@ -33,7 +36,7 @@ class MusicManager:
                 if os.path.exists(path):
                     self.available_music[key] = path
             except:
-                print(f"Musique {key} introuvable: {path}")
+                logger.warning("Musique %s introuvable: %s", key, path)
 
     def play_music(self, music_key, loops=-1):
         """
@@ -43,7 +46,7 @@ class MusicManager:
         """
         # Vérifier si la musique existe
         if music_key not in self.available_music:
-            print(f"Musique {music_key} non disponible")
+            logger.warning("Musique %s non disponible", music_key)
             return False
 
         # Si c'est déjà la musique en cours, ne rien faire
@@ -60,10 +63,10 @@ class MusicManager:
             pygame.mixer.music.play(loops)
             self.current_music = music_key
             self.is_playing = True
-            print(f"Musique '{music_key}' lancée")
+            logger.info("Musique '%s' lancée", music_key)
             return True
         except Exception as e:
-            print(f"Erreur lors du chargement de la musique: {e}")
+            logger.error("Erreur lors du chargement de la musique: %s", e)
             self.is_playing = False
             return False
 
@@ -72,20 +75,20 @@ class MusicManager:
         if self.is_playing:
             pygame.mixer.music.fadeout(fadeout_ms)
             self.is_playing = False
-            print("Musique arrêtée")
+            logger.info("Musique arrêtée")
 
     def pause_music(self):
         """Met en pause la musique"""
         if self.is_playing:
             pygame.mixer.music.pause()
             self.is_playing = False
-            print("Musique en pause")
+            logger.info("Musique en pause")
 
     def unpause_music(self):
         """Reprend la musique mise en pause"""
         pygame.mixer.music.unpause()
         self.is_playing = True
-        print("Musique reprise")
+        logger.info("Musique reprise")
 
     def set_volume(self, volume):
         """
@@ -94,9 +97,9 @@ class MusicManager:
         """
         self.volume = max(0.0, min(1.0, volume))
         pygame.mixer.music.set_volume(self.volume)
-        print(f"Volume réglé à {self.volume}")
+        logger.info("Volume réglé à %s", self.volume)
 
     def create_folder_structure(self):
         """Crée l'arborescence des dossiers pour la musique"""
         os.makedirs("Assets/Audio", exist_ok=True)
-        print("Dossier Audio créé")
+        logger.info("Dossier Audio créé")
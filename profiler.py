@@ -0,0 +1,233 @@
+"""
+Profileur de temps d'image, affiché par-dessus le jeu (touche F2, F6 pour exporter en CSV).
+
+Chaque étape de la boucle est chronométrée dans une section nommée :
+    with profiler.section("update.movement"):
+        ...
+Les sections d'une même image sont additionnées (plusieurs pas de simulation
+par image) ; un point dans le nom indique une sous-section, affichée en retrait.
+Désactivé, profiler.section() retourne un contexte vide partagé : le coût est
+celui d'un appel de fonction.
+"""
+import csv
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+from constants import PROFILER_HISTORY, PROFILER_REFRESH_FRAMES
+from text_renderer import get_font, render_text
+
+PROFILE_DUMP_DIR = "profiles"
+
+# Percentiles affichés et exportés
+PERCENTILES = (50, 95, 99)
+
+# Disposition de l'affichage
+OVERLAY_WIDTH = 330
+GRAPH_HEIGHT = 60
+LINE_HEIGHT = 13
+SUMMARY_COLUMN_WIDTH = 50
+FRAME_BUDGET_MS = 1000.0 / 60  # Ligne repère du graphe (60 images par seconde)
+
+_null_section = nullcontext()
+
+
+def percentile(sorted_values, percent):
+    """Percentile (rang le plus proche) d'une liste déjà triée"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class _Section:
+    """Chronomètre d'une section, additionné au total de l'image en cours"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+class FrameProfiler:
+    """
+    Mesure le temps passé dans chaque section pour les dernières images,
+    dessine un graphe glissant du temps d'image avec les percentiles par section,
+    et écrit les mesures dans un fichier CSV à la demande.
+    """
+
+    def __init__(self, history=PROFILER_HISTORY, refresh_frames=PROFILER_REFRESH_FRAMES):
+        """
+        :param history: nombre d'images gardées
+        :param refresh_frames: nombre d'images entre deux recalculs des percentiles affichés
+        """
+        self.enabled = False
+        self.history = history
+        self.refresh_frames = refresh_frames
+
+        self.frames = deque(maxlen=history)  # (numéro d'image, durée totale, {section: durée}) en secondes
+        self.sections = []  # Noms des sections, dans l'ordre de première apparition
+        self.current = {}  # Section -> durée cumulée dans l'image en cours
+        self.frame_start = None
+        self.frame_count = 0
+
+        self.summary_surface = None  # Tableau des percentiles, recalculé tous les refresh_frames
+
+    def toggle(self):
+        """Active ou désactive le profileur (les mesures sont effacées à l'activation)"""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.clear()
+        return self.enabled
+
+    def clear(self):
+        """Efface les mesures"""
+        self.frames.clear()
+        self.sections.clear()
+        self.current = {}
+        self.frame_start = None
+        self.summary_surface = None
+
+    def section(self, name):
+        """Contexte chronométrant une section de l'image en cours"""
+        if not self.enabled:
+            return _null_section
+        return _Section(self, name)
+
+    def begin_frame(self):
+        """Début d'une image"""
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Fin d'une image : enregistre ses mesures"""
+        if not self.enabled or self.frame_start is None:
+            return
+
+        total = time.perf_counter() - self.frame_start
+        for name in self.current:
+            if name not in self.sections:
+                self.sections.append(name)
+
+        self.frames.append((self.frame_count, total, self.current))
+        self.frame_count += 1
+        self.frame_start = None
+
+        # Le tableau des percentiles est recalculé au prochain dessin
+        if self.frame_count % self.refresh_frames == 0:
+            self.summary_surface = None
+
+    def get_percentiles(self, name=None):
+        """
+        Percentiles (en millisecondes) d'une section sur les images gardées
+        :param name: nom de la section, None pour le temps d'image total
+        :return: dictionnaire percentile -> durée
+        """
+        if name is None:
+            values = sorted(total for _, total, _ in self.frames)
+        else:
+            values = sorted(sections.get(name, 0.0) for _, _, sections in self.frames)
+        return {p: percentile(values, p) * 1000 for p in PERCENTILES}
+
+    def draw(self, surface, position=None):
+        """
+        Dessine le graphe et le tableau des percentiles
+        :param position: coin supérieur gauche (par défaut : en haut à droite de la surface)
+        :return: rect dessiné (à ajouter aux zones à afficher)
+        """
+        if self.summary_surface is None:
+            self.summary_surface = self._render_summary()
+
+        height = GRAPH_HEIGHT + self.summary_surface.get_height() + 6
+        if position is None:
+            position = (surface.get_width() - OVERLAY_WIDTH - 5, 5)
+        rect = pygame.Rect(position, (OVERLAY_WIDTH, height))
+
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+
+        # Graphe glissant : une barre par image, échelle fixe jusqu'à 2 fois le budget
+        scale = GRAPH_HEIGHT / (FRAME_BUDGET_MS * 2)
+        frames = list(self.frames)[-OVERLAY_WIDTH:]
+        x = OVERLAY_WIDTH - len(frames)
+        for _, total, _ in frames:
+            total_ms = total * 1000
+            bar = min(GRAPH_HEIGHT, int(total_ms * scale))
+            color = (80, 220, 80) if total_ms <= FRAME_BUDGET_MS else (230, 80, 60)
+            pygame.draw.line(panel, color, (x, GRAPH_HEIGHT), (x, GRAPH_HEIGHT - bar))
+            x += 1
+
+        budget_y = GRAPH_HEIGHT - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(panel, (255, 255, 0), (0, budget_y), (OVERLAY_WIDTH, budget_y))
+
+        panel.blit(self.summary_surface, (4, GRAPH_HEIGHT + 4))
+        surface.blit(panel, rect)
+        return rect
+
+    def _render_summary(self):
+        """Tableau des percentiles par section (libellés à gauche, valeurs en colonnes)"""
+        font = get_font('Arial', 11)
+        rows = [("section (ms)", [f"p{p}" for p in PERCENTILES], (255, 255, 0)),
+                ("image", self._format_values(self.get_percentiles()), (255, 255, 255))]
+        for name in self.sections:
+            label = "  " * name.count(".") + name.rsplit(".", 1)[-1]
+            rows.append((label, self._format_values(self.get_percentiles(name)), (200, 200, 200)))
+
+        width = OVERLAY_WIDTH - 8
+        summary = pygame.Surface((width, LINE_HEIGHT * len(rows)), pygame.SRCALPHA)
+        for i, (label, values, color) in enumerate(rows):
+            y = i * LINE_HEIGHT
+            summary.blit(render_text(font, label, True, color), (0, y))
+            for column, value in enumerate(values):
+                text = render_text(font, value, True, color)
+                # Valeurs alignées à droite dans leur colonne
+                right = width - (len(values) - 1 - column) * SUMMARY_COLUMN_WIDTH
+                summary.blit(text, (right - text.get_width(), y))
+        return summary
+
+    @staticmethod
+    def _format_values(values):
+        return [f"{values[p]:.2f}" for p in PERCENTILES]
+
+    def export_csv(self, path=None):
+        """
+        Écrit les mesures des images gardées dans un fichier CSV (une ligne par image, en millisecondes)
+        :param path: chemin du fichier (par défaut : profiles/profile_<date>.csv)
+        :return: chemin du fichier écrit
+        """
+        if path is None:
+            os.makedirs(PROFILE_DUMP_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DUMP_DIR, time.strftime("profile_%Y%m%d_%H%M%S.csv"))
+
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame", "frame_ms"] + self.sections)
+            for frame, total, sections in self.frames:
+                writer.writerow([frame, f"{total * 1000:.3f}"] +
+                                [f"{sections.get(name, 0.0) * 1000:.3f}" for name in self.sections])
+        return path
+
+
+# Profileur partagé par tout le jeu
+profiler = FrameProfiler()
+
+
+def profile_section(name):
+    """Raccourci : contexte chronométrant une section avec le profileur partagé"""
+    return profiler.section(name)
@@ -0,0 +1,76 @@
+from constants import QUALITY_PRESET
+
+# Préréglages de qualité graphique. "high" correspond au rendu d'origine ;
+# "low" vise les petites machines (ARM) qui n'atteignent pas 60 images par seconde.
+QUALITY_PRESETS = {
+    "low": {
+        "particle_scale": 0.3,  # Proportion des particules générées par les effets
+        "trail_scale": 0.4,  # Proportion de la longueur des traînées des projectiles
+        "explosion_blur_steps": 0,  # Nombre maximum de cercles de flou des explosions (None = pas de limite)
+        "trajectory_points": 12,  # Nombre de points de l'aperçu de trajectoire
+    },
+    "medium": {
+        "particle_scale": 0.6,
+        "trail_scale": 0.7,
+        "explosion_blur_steps": 3,
+        "trajectory_points": 24,
+    },
+    "high": {
+        "particle_scale": 1.0,
+        "trail_scale": 1.0,
+        "explosion_blur_steps": None,
+        "trajectory_points": 40,
+    },
+}
+
+
+class QualitySettings:
+    """
+    Réglages de qualité graphique partagés par les deux phases.
+    Les effets, le lanceur et les projectiles consultent l'instance partagée au
+    moment de leur création ou de leur dessin ; changer de préréglage en cours
+    de partie s'applique donc aux objets suivants.
+    """
+
+    def __init__(self, preset=QUALITY_PRESET):
+        """
+        :param preset: nom du préréglage ("low", "medium" ou "high")
+        """
+        self.preset = None
+        self.apply_preset(preset)
+
+    def apply_preset(self, preset):
+        """
+        Applique un préréglage
+        :raises ValueError: si le préréglage n'existe pas
+        """
+        if preset not in QUALITY_PRESETS:
+            raise ValueError(f"Erreur : préréglage de qualité inconnu : {preset} "
+                             f"(attendu : {', '.join(QUALITY_PRESETS)})")
+
+        self.preset = preset
+        for name, value in QUALITY_PRESETS[preset].items():
+            setattr(self, name, value)
+
+    def particle_count(self, count):
+        """Nombre de particules à générer pour un effet qui en prévoit count en qualité maximale"""
+        return max(1, round(count * self.particle_scale))
+
+    def trail_length(self, length):
+        """Longueur de traînée pour un projectile qui en prévoit length en qualité maximale"""
+        return max(2, round(length * self.trail_scale))
+
+    def blur_steps(self, steps):
+        """Nombre de cercles de flou pour une explosion qui en prévoit steps en qualité maximale"""
+        if self.explosion_blur_steps is None:
+            return steps
+        return min(steps, self.explosion_blur_steps)
+
+
+# Réglages partagés par tout le jeu
+quality = QualitySettings()
+
+
+def set_quality_preset(preset):
+    """Raccourci pour changer le préréglage de qualité partagé"""
+    quality.apply_preset(preset)
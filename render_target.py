@@ -0,0 +1,116 @@
+import pygame
+
+from constants import WINDOW_SCALE
+from profiler import profiler
+
+
+class RenderTarget:
+    """
+    Surface de rendu à la résolution interne du jeu, agrandie d'un facteur entier
+    (au plus proche voisin) dans la fenêtre au moment de l'affichage.
+    Avec un facteur 1, la surface de rendu est directement la fenêtre : aucune copie.
+    """
+
+    def __init__(self, window, scale=1):
+        """
+        :param window: surface de la fenêtre (pygame.display.set_mode)
+        :param scale: facteur entier entre la résolution interne et la fenêtre
+        """
+        self.window = window
+        self.scale = max(1, int(scale))
+
+        if self.scale == 1:
+            self.surface = window
+        else:
+            width, height = window.get_size()
+            self.surface = pygame.Surface((width // self.scale, height // self.scale)).convert()
+
+    def present(self, rects=None):
+        """
+        Affiche la surface de rendu dans la fenêtre
+        :param rects: zones modifiées (en coordonnées internes), None pour tout l'écran
+        """
+        if self.surface is self.window:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+
+        if rects is None:
+            pygame.transform.scale(self.surface, self.window.get_size(), self.window)
+            pygame.display.flip()
+            return
+
+        # Seules les zones modifiées sont agrandies puis affichées
+        surface_rect = self.surface.get_rect()
+        window_rects = []
+        for rect in rects:
+            rect = pygame.Rect(rect).clip(surface_rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            window_rect = pygame.Rect(rect.x * self.scale, rect.y * self.scale,
+                                      rect.width * self.scale, rect.height * self.scale)
+            self.window.blit(pygame.transform.scale(self.surface.subsurface(rect), window_rect.size), window_rect)
+            window_rects.append(window_rect)
+        pygame.display.update(window_rects)
+
+    def to_internal(self, pos):
+        """Convertit une position dans la fenêtre (souris) en position dans la surface de rendu"""
+        return pos[0] // self.scale, pos[1] // self.scale
+
+
+# Cible de rendu partagée, créée par create_window()
+_shared_target = None
+
+
+def create_window(width, height, scale=WINDOW_SCALE):
+    """
+    Ouvre la fenêtre du jeu agrandie d'un facteur entier
+    :param width: largeur interne du rendu
+    :param height: hauteur interne du rendu
+    :param scale: facteur d'agrandissement de la fenêtre
+    :return: surface de rendu à la résolution interne (à passer au jeu comme écran)
+    """
+    global _shared_target
+    scale = max(1, int(scale))
+    window = pygame.display.set_mode((width * scale, height * scale))
+    _shared_target = RenderTarget(window, scale)
+    return _shared_target.surface
+
+
+def present(rects=None):
+    """
+    Affiche l'image rendue (toute la surface, ou seulement les zones données).
+    Sans cible de rendu (simulation, outils), affiche directement l'écran.
+    Le profileur, s'il est actif, est dessiné par-dessus juste avant l'affichage.
+    :return: zone du panneau du profileur dessinée sur la surface de rendu (None s'il est inactif)
+    """
+    overlay_rect = None
+    if profiler.enabled:
+        surface = _shared_target.surface if _shared_target is not None else pygame.display.get_surface()
+        if surface is not None:
+            overlay_rect = profiler.draw(surface)
+            if rects is not None:
+                rects = list(rects) + [overlay_rect]
+
+    if _shared_target is None:
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        return overlay_rect
+    _shared_target.present(rects)
+    return overlay_rect
+
+
+def to_internal(pos):
+    """Convertit une position de la fenêtre en position dans la surface de rendu"""
+    if _shared_target is None:
+        return pos
+    return _shared_target.to_internal(pos)
+
+
+def get_mouse_pos():
+    """Position de la souris dans la surface de rendu"""
+    return to_internal(pygame.mouse.get_pos())
@@ -0,0 +1,494 @@
+"""
+Enregistrement et relecture des entrées du joueur.
+
+Le jeu lit ses entrées (événements, touches maintenues) et son horloge à travers
+une source d'entrées : LiveInput pour une partie normale, éventuellement avec un
+Recorder qui enregistre les entrées utiles au jeu, ou PlaybackInput qui rejoue
+un enregistrement sans fenêtre et sans attendre l'horloge.
+
+Chaque image enregistre les touches de jeu maintenues, les événements de jeu
+(flèches, E, C, Espace... et souris de la phase de défense) et le nombre de pas
+de simulation exécutés : la relecture reproduit exactement le découpage en pas
+de la partie enregistrée. Avec la graine de la partie et les empreintes des
+fichiers de données, un enregistrement rejoue la même partie.
+
+Exemples (depuis la racine du projet) :
+    python main.py --record parties/session.pxr
+    python -m replay play parties/session.pxr
+    python -m replay info parties/session.pxr
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+
+from constants import SIMULATION_STEP, WINDOW_WIDTH, WINDOW_HEIGHT
+from log import get_logger
+from render_target import to_internal
+
+logger = get_logger(__name__)
+
+MAGIC = b"PXRP"
+FORMAT_VERSION = 1
+
+# Touches de jeu enregistrées (l'indice dans ce tuple est leur code dans le fichier).
+# Les touches de débogage (F1-F4, F6) ne changent pas la partie et ne sont pas enregistrées.
+ACTION_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,  # Déplacement (phase 1), choix de potion (phase 2)
+    pygame.K_e, pygame.K_c,  # Interaction et mélange (phase 1)
+    pygame.K_SPACE, pygame.K_ESCAPE, pygame.K_h, pygame.K_r, pygame.K_RETURN,  # Visée, pause, aide, menus
+    pygame.K_F5,  # Lancement direct de la phase de défense
+)
+ACTION_INDEX = {key: index for index, key in enumerate(ACTION_KEYS)}
+
+# Types d'événements enregistrés
+EVENT_KEY_DOWN = 1
+EVENT_KEY_UP = 2
+EVENT_MOUSE_MOTION = 3
+EVENT_MOUSE_DOWN = 4
+EVENT_QUIT = 5
+
+# Drapeaux d'une image enregistrée
+FLAG_HELD = 1  # Les touches maintenues ont changé
+FLAG_STEPS = 2  # Nombre de pas de simulation différent de 1
+FLAG_EVENTS = 4  # L'image contient des événements
+FLAG_END = 128  # Fin de l'enregistrement
+
+
+def data_file_hashes(data_dir="Data"):
+    """Empreintes (SHA-256 abrégé) des fichiers de données JSON, par nom de fichier"""
+    hashes = {}
+    for name in sorted(os.listdir(data_dir)):
+        if name.endswith(".json"):
+            with open(os.path.join(data_dir, name), "rb") as file:
+                hashes[name] = hashlib.sha256(file.read()).hexdigest()[:16]
+    return hashes
+
+
+def write_varint(buffer, value):
+    """Écrit un entier positif sur 7 bits par octet (les petites valeurs tiennent sur un octet)"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    """:return: (valeur, position suivante)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def zigzag(value):
+    """Entier signé -> entier positif (0, -1, 1, -2... -> 0, 1, 2, 3...)"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+class Recorder:
+    """
+    Enregistre les entrées de jeu image par image, encodées par différence :
+    une suite d'images sans événement, aux mêmes touches maintenues et à un seul
+    pas de simulation ne coûte qu'un compteur. Les positions de souris sont
+    stockées en coordonnées de rendu, relatives à la position précédente.
+    """
+
+    def __init__(self, path, seed, data_dir="Data"):
+        """
+        :param path: fichier écrit par save()
+        :param seed: graine de la partie enregistrée
+        """
+        self.path = path
+        self.header = {
+            "version": FORMAT_VERSION,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seed": seed,
+            "step": SIMULATION_STEP,
+            "data_hashes": data_file_hashes(data_dir),
+        }
+
+        self.body = bytearray()
+        self.skipped = 0  # Images identiques à la précédente, pas encore écrites
+        self.held = 0  # Masque des touches maintenues de la dernière image écrite
+        self.mouse = (0, 0)  # Dernière position de souris écrite
+        self.pending = None  # (touches maintenues, événements) de l'image en cours, en attente de ses pas
+
+        self.frame_count = 0
+        self.step_count = 0
+
+    def record_frame(self, events, pressed):
+        """Début d'une image : événements lus et touches maintenues"""
+        # Une image sans pas de simulation (attente d'une touche, écran de pause...)
+        if self.pending is not None:
+            self._write_frame(0)
+
+        held = 0
+        for index, key in enumerate(ACTION_KEYS):
+            if pressed[key]:
+                held |= 1 << index
+        self.pending = (held, self._map_events(events))
+
+    def record_steps(self, steps):
+        """Fin d'une image : nombre de pas de simulation exécutés"""
+        if self.pending is not None:
+            self._write_frame(steps)
+
+    @staticmethod
+    def _map_events(events):
+        """Garde les événements de jeu, en coordonnées de rendu"""
+        mapped = []
+        for event in events:
+            if event.type == pygame.QUIT:
+                mapped.append((EVENT_QUIT,))
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in ACTION_INDEX:
+                kind = EVENT_KEY_DOWN if event.type == pygame.KEYDOWN else EVENT_KEY_UP
+                mapped.append((kind, ACTION_INDEX[event.key]))
+            elif event.type == pygame.MOUSEMOTION:
+                # Seule la dernière position d'une suite de mouvements compte
+                if mapped and mapped[-1][0] == EVENT_MOUSE_MOTION:
+                    mapped.pop()
+                mapped.append((EVENT_MOUSE_MOTION, to_internal(event.pos)))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                mapped.append((EVENT_MOUSE_DOWN, event.button, to_internal(event.pos)))
+        return mapped
+
+    def _write_frame(self, steps):
+        held, events = self.pending
+        self.pending = None
+        self.frame_count += 1
+        self.step_count += steps
+
+        if not events and held == self.held and steps == 1:
+            self.skipped += 1
+            return
+
+        flags = (FLAG_HELD if held != self.held else 0) | (FLAG_STEPS if steps != 1 else 0) | \
+                (FLAG_EVENTS if events else 0)
+        write_varint(self.body, self.skipped)
+        self.body.append(flags)
+        self.skipped = 0
+
+        if flags & FLAG_HELD:
+            write_varint(self.body, held)
+            self.held = held
+        if flags & FLAG_STEPS:
+            write_varint(self.body, steps)
+        if flags & FLAG_EVENTS:
+            write_varint(self.body, len(events))
+            for event in events:
+                self._write_event(event)
+
+    def _write_event(self, event):
+        kind = event[0]
+        self.body.append(kind)
+        if kind in (EVENT_KEY_DOWN, EVENT_KEY_UP):
+            write_varint(self.body, event[1])
+        elif kind in (EVENT_MOUSE_MOTION, EVENT_MOUSE_DOWN):
+            if kind == EVENT_MOUSE_DOWN:
+                write_varint(self.body, event[1])
+            x, y = event[-1]
+            write_varint(self.body, zigzag(x - self.mouse[0]))
+            write_varint(self.body, zigzag(y - self.mouse[1]))
+            self.mouse = (x, y)
+
+    def save(self):
+        """Termine l'enregistrement et l'écrit dans son fichier"""
+        if self.pending is not None:
+            self._write_frame(0)
+
+        body = bytearray(self.body)
+        write_varint(body, self.skipped)
+        body.append(FLAG_END)
+
+        header = dict(self.header, frames=self.frame_count, steps=self.step_count)
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "wb") as file:
+            file.write(MAGIC)
+            file.write(struct.pack("<BI", FORMAT_VERSION, len(header_bytes)))
+            file.write(header_bytes)
+            file.write(zlib.compress(bytes(body), 9))
+
+        logger.info("Entrées enregistrées dans %s (%d images, %d pas, %d octets)",
+                    self.path, self.frame_count, self.step_count, len(header_bytes) + len(body))
+        return self.path
+
+
+class Recording:
+    """Enregistrement chargé : en-tête (graine, empreintes des données...) et images encodées"""
+
+    def __init__(self, header, body):
+        self.header = header
+        self.body = body
+
+    @property
+    def seed(self):
+        return self.header["seed"]
+
+    def check_data_hashes(self, data_dir="Data"):
+        """:return: noms des fichiers de données différents de ceux de l'enregistrement"""
+        current = data_file_hashes(data_dir)
+        recorded = self.header.get("data_hashes", {})
+        return sorted(name for name in set(current) | set(recorded) if current.get(name) != recorded.get(name))
+
+    def frames(self):
+        """Générateur des images : (masque des touches maintenues, nombre de pas, événements)"""
+        data = self.body
+        offset = 0
+        held = 0
+        mouse = (0, 0)
+
+        while True:
+            skipped, offset = read_varint(data, offset)
+            for _ in range(skipped):
+                yield held, 1, ()
+
+            flags = data[offset]
+            offset += 1
+            if flags & FLAG_END:
+                return
+
+            steps = 1
+            events = []
+            if flags & FLAG_HELD:
+                held, offset = read_varint(data, offset)
+            if flags & FLAG_STEPS:
+                steps, offset = read_varint(data, offset)
+            if flags & FLAG_EVENTS:
+                count, offset = read_varint(data, offset)
+                for _ in range(count):
+                    kind = data[offset]
+                    offset += 1
+                    if kind in (EVENT_KEY_DOWN, EVENT_KEY_UP):
+                        action, offset = read_varint(data, offset)
+                        events.append((kind, action))
+                    elif kind in (EVENT_MOUSE_MOTION, EVENT_MOUSE_DOWN):
+                        button = None
+                        if kind == EVENT_MOUSE_DOWN:
+                            button, offset = read_varint(data, offset)
+                        dx, offset = read_varint(data, offset)
+                        dy, offset = read_varint(data, offset)
+                        mouse = (mouse[0] + unzigzag(dx), mouse[1] + unzigzag(dy))
+                        events.append((kind, mouse) if button is None else (kind, button, mouse))
+                    else:
+                        events.append((kind,))
+            yield held, steps, events
+
+
+def load_recording(path):
+    """
+    Charge un enregistrement
+    :raise ValueError: si le fichier n'est pas un enregistrement dans une version connue
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Erreur : {path} n'est pas un enregistrement d'entrées")
+    offset = len(MAGIC)
+    version, header_size = struct.unpack_from("<BI", data, offset)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Erreur : version d'enregistrement {version} non prise en charge")
+    offset += struct.calcsize("<BI")
+
+    header = json.loads(data[offset:offset + header_size].decode("utf-8"))
+    body = zlib.decompress(data[offset + header_size:])
+    return Recording(header, body)
+
+
+class LiveInput:
+    """Entrées du joueur et horloge réelles, avec enregistrement facultatif"""
+
+    playback = False
+
+    def __init__(self, recorder=None):
+        """
+        :param recorder: Recorder qui enregistre les entrées (None pour ne rien enregistrer)
+        """
+        self.recorder = recorder
+
+    def get_events(self):
+        """Événements en attente (remplace pygame.event.get)"""
+        events = pygame.event.get()
+        if self.recorder is not None:
+            self.recorder.record_frame(events, pygame.key.get_pressed())
+        return events
+
+    def get_pressed(self):
+        """État des touches (remplace pygame.key.get_pressed)"""
+        return pygame.key.get_pressed()
+
+    def frame_steps(self, steps):
+        """
+        Nombre de pas de simulation de l'image
+        :param steps: nombre de pas calculé par la boucle de jeu
+        """
+        if self.recorder is not None:
+            self.recorder.record_steps(steps)
+        return steps
+
+    def tick(self, clock, max_fps):
+        """Attend l'image suivante et retourne le temps écoulé (en secondes)"""
+        return clock.tick(max_fps) / 1000.0
+
+    def delay(self, milliseconds):
+        """Pause (transitions entre les phases)"""
+        pygame.time.delay(milliseconds)
+
+
+class _HeldKeys:
+    """Touches maintenues d'une image rejouée, indexables comme pygame.key.get_pressed()"""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        index = ACTION_INDEX.get(key)
+        return index is not None and bool(self.mask >> index & 1)
+
+
+class PlaybackInput:
+    """
+    Rejoue un enregistrement : chaque lecture d'événements passe à l'image suivante,
+    la boucle de jeu exécute les pas enregistrés sans attendre l'horloge.
+    Une fois l'enregistrement terminé, seul l'événement QUIT est retourné.
+    """
+
+    playback = True
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.frames = recording.frames()
+        self.held = _HeldKeys(0)
+        self.steps = 0
+        self.finished = False
+
+        # Compteurs
+        self.frame_count = 0
+        self.step_count = 0
+
+    def get_events(self):
+        frame = next(self.frames, None)
+        if frame is None:
+            self.finished = True
+            self.steps = 0
+            return [pygame.event.Event(pygame.QUIT)]
+
+        held, self.steps, events = frame
+        self.held = _HeldKeys(held)
+        self.frame_count += 1
+        return [self._make_event(event) for event in events]
+
+    @staticmethod
+    def _make_event(event):
+        kind = event[0]
+        if kind == EVENT_KEY_DOWN:
+            return pygame.event.Event(pygame.KEYDOWN, key=ACTION_KEYS[event[1]], mod=0, unicode="")
+        if kind == EVENT_KEY_UP:
+            return pygame.event.Event(pygame.KEYUP, key=ACTION_KEYS[event[1]], mod=0)
+        if kind == EVENT_MOUSE_MOTION:
+            return pygame.event.Event(pygame.MOUSEMOTION, pos=event[1], rel=(0, 0), buttons=(0, 0, 0))
+        if kind == EVENT_MOUSE_DOWN:
+            return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=event[1], pos=event[2])
+        return pygame.event.Event(pygame.QUIT)
+
+    def get_pressed(self):
+        return self.held
+
+    def frame_steps(self, steps):
+        self.step_count += self.steps
+        return self.steps
+
+    def tick(self, clock, max_fps):
+        return 0.0
+
+    def delay(self, milliseconds):
+        pass
+
+
+def play(path, screen=None):
+    """
+    Rejoue un enregistrement dans Game, aussi vite que possible
+    :param screen: surface de rendu (par défaut : fenêtre factice à la taille du jeu)
+    :return: dictionnaire (images, pas, durée réelle, fichiers de données modifiés)
+    """
+    from game import Game
+    from Phase2.simulation import init_headless
+    from render_target import create_window
+
+    recording = load_recording(path)
+    changed = recording.check_data_hashes()
+    if changed:
+        logger.warning("Fichiers de données modifiés depuis l'enregistrement : %s "
+                       "(la relecture peut diverger)", ", ".join(changed))
+
+    if screen is None:
+        init_headless()
+        screen = create_window(WINDOW_WIDTH, WINDOW_HEIGHT, 1)
+
+    source = PlaybackInput(recording)
+    game = Game(screen, input_source=source, seed=recording.seed)
+
+    start = time.perf_counter()
+    game.run()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "frames": source.frame_count,
+        "steps": source.step_count,
+        "elapsed": round(elapsed, 3),
+        "changed_data": changed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m replay", description="Relecture des entrées enregistrées")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    play_parser = subparsers.add_parser("play", help="Rejoue un enregistrement sans fenêtre, aussi vite que possible")
+    play_parser.add_argument("path", help="Fichier d'enregistrement")
+
+    info_parser = subparsers.add_parser("info", help="Affiche l'en-tête d'un enregistrement")
+    info_parser.add_argument("path", help="Fichier d'enregistrement")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        recording = load_recording(args.path)
+        print(json.dumps(recording.header, ensure_ascii=False, indent=2))
+        changed = recording.check_data_hashes()
+        if changed:
+            print(f"Fichiers de données modifiés depuis l'enregistrement : {', '.join(changed)}")
+        return 0
+
+    result = play(args.path)
+    pygame.quit()
+    simulated = result["steps"] * SIMULATION_STEP
+    print(f"{result['frames']} images, {result['steps']} pas ({simulated:.1f} s de jeu) "
+          f"rejoués en {result['elapsed']:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
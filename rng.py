@@ -0,0 +1,84 @@
+"""
+Générateurs aléatoires nommés et reproductibles.
+
+Chaque sous-système tire ses nombres de son propre flux, dérivé de la graine
+de la partie et du nom du flux : les effets visuels peuvent consommer autant
+de nombres qu'ils veulent sans changer les apparitions ni le comportement
+des ennemis, et une partie se rejoue à l'identique à partir de sa graine.
+"""
+import hashlib
+import random
+
+import numpy as np
+
+from constants import RNG_SEED
+
+# Flux de jeu : ils décident du déroulement de la partie
+SPAWN_STREAM = "spawn"  # Apparition des ennemis (type, hauteur)
+ENEMY_STREAM = "enemy"  # Comportement des ennemis (changements de direction)
+DEFENSE_STREAM = "defense"  # Graines des phases de défense successives d'une partie
+
+# Flux visuels : sans effet sur le déroulement de la partie
+EFFECTS_STREAM = "effects"  # Particules et formes des effets
+EFFECT_FRAMES_STREAM = "effect_frames"  # Images générées des effets et des ennemis
+DECOR_STREAM = "decor"  # Décor par défaut et conseils de fin de partie
+
+
+class RandomStreams:
+    """
+    Ensemble de flux aléatoires indépendants, créés à la demande par nom.
+    stream() retourne un random.Random, numpy_stream() un numpy.random.Generator ;
+    un même nom retourne toujours le même objet, que les sous-systèmes peuvent garder.
+    """
+
+    def __init__(self, seed=None):
+        """
+        :param seed: graine entière (None pour une graine tirée au hasard, gardée dans self.seed)
+        """
+        self.streams = {}  # nom -> random.Random
+        self.numpy_streams = {}  # nom -> numpy.random.Generator
+        self.seed = None
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """
+        Change la graine et réinitialise tous les flux existants (les références gardées restent valides)
+        :param seed: graine entière (None pour une graine tirée au hasard)
+        """
+        self.seed = random.SystemRandom().randrange(2 ** 32) if seed is None else seed
+
+        for name, stream in self.streams.items():
+            stream.seed(self._derive(name))
+        for name, generator in self.numpy_streams.items():
+            generator.bit_generator.state = np.random.PCG64(self._derive(name)).state
+
+    def _derive(self, name):
+        """Graine d'un flux, stable d'une exécution à l'autre (contrairement à hash())"""
+        digest = hashlib.sha256(f"{self.seed}:{name}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def stream(self, name):
+        """Flux random.Random nommé"""
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = random.Random(self._derive(name))
+            self.streams[name] = stream
+        return stream
+
+    def numpy_stream(self, name):
+        """Flux numpy.random.Generator nommé (tirages vectorisés des particules)"""
+        generator = self.numpy_streams.get(name)
+        if generator is None:
+            generator = np.random.Generator(np.random.PCG64(self._derive(name)))
+            self.numpy_streams[name] = generator
+        return generator
+
+
+# Flux partagés par les ressources communes à toutes les parties (banques d'images, teintes)
+# et par défaut des objets créés sans flux explicite
+random_streams = RandomStreams(RNG_SEED)
+
+
+def get_stream(name):
+    """Raccourci : flux random.Random nommé des flux partagés"""
+    return random_streams.stream(name)
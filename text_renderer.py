@@ -0,0 +1,90 @@
+from collections import OrderedDict
+
+import pygame
+
+from constants import TEXT_CACHE_MAX_SIZE
+
+
+class TextRenderer:
+    """
+    Service de rendu de texte partagé par tout le jeu.
+    - Registre de polices : une seule police par (nom, taille, gras, italique),
+      la recherche SysFont (fontconfig) n'est faite qu'une fois.
+    - Cache LRU des textes déjà rendus, indexé par (police, texte, couleur, anticrénelage).
+    Les surfaces retournées sont partagées : ne pas les modifier, faire une copie si besoin.
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_MAX_SIZE):
+        """
+        :param max_size: nombre maximum de textes rendus gardés en mémoire
+        """
+        self.max_size = max_size
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+        # Compteurs pour mesurer l'efficacité du cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_font(self, name, size, bold=False, italic=False):
+        """
+        Retourne la police demandée (créée au premier appel, mêmes paramètres que SysFont)
+        """
+        key = (name, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, antialias, color):
+        """
+        Équivalent de font.render(text, antialias, color), avec mise en cache
+        :return: la surface du texte (partagée)
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Vide le cache des textes rendus (les polices sont conservées)"""
+        self.surfaces.clear()
+
+    def stats(self):
+        """Retourne les compteurs du cache"""
+        requests = self.hits + self.misses
+        return {
+            "fonts": len(self.fonts),
+            "size": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+
+# Instance partagée par tout le jeu
+text_renderer = TextRenderer()
+
+
+def get_font(name, size, bold=False, italic=False):
+    """Raccourci vers le registre de polices partagé"""
+    return text_renderer.get_font(name, size, bold, italic)
+
+
+def render_text(font, text, antialias, color):
+    """Raccourci vers le cache de textes partagé"""
+    return text_renderer.render(font, text, antialias, color)
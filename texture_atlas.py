@@ -0,0 +1,198 @@
+import json
+import os
+import sys
+import weakref
+
+import pygame
+
+from texture_cache import load_texture
+from log import get_logger
+
+logger = get_logger(__name__)
+
+# Dossiers des objets regroupés dans l'atlas (relatifs à la racine du projet)
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+ITEMS_DIR = os.path.join(ROOT_DIR, "Assets", "Art", "Items")
+ATLAS_CATEGORIES = ("Elements", "Potions", "Stones")
+ATLAS_IMAGE_FILE = "atlas.png"
+ATLAS_INDEX_FILE = "atlas.json"
+ATLAS_VERSION = 1
+
+# Marge entre deux sprites pour éviter que le filtrage ne "bave" sur les voisins
+ATLAS_PADDING = 1
+ATLAS_MAX_WIDTH = 1024
+
+
+def pack_shelves(sizes, max_width=ATLAS_MAX_WIDTH, padding=ATLAS_PADDING):
+    """
+    Range des rectangles sur des étagères horizontales (du plus haut au plus bas)
+    :param sizes: dictionnaire nom -> (largeur, hauteur)
+    :param max_width: largeur maximale de l'atlas
+    :param padding: marge entre deux rectangles
+    :return: (positions nom -> (x, y), largeur, hauteur) de l'atlas
+    """
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name))
+    positions = {}
+    x = y = 0
+    shelf_height = 0
+    width = 0
+
+    for name in order:
+        w, h = sizes[name]
+        if w > max_width:
+            raise ValueError(f"Erreur : le sprite {name} ({w}px) est plus large que l'atlas ({max_width}px)")
+
+        # Nouvelle étagère si le sprite ne rentre plus sur la ligne courante
+        if x and x + w > max_width:
+            y += shelf_height + padding
+            x = 0
+            shelf_height = 0
+
+        positions[name] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        width = max(width, x - padding)
+
+    return positions, width, y + shelf_height
+
+
+def build_atlas(items_dir=ITEMS_DIR, categories=ATLAS_CATEGORIES):
+    """
+    Regroupe toutes les images d'objets dans une seule image + un index JSON
+    :param items_dir: dossier contenant les sous-dossiers Elements/Potions/Stones
+    :param categories: sous-dossiers à inclure
+    :return: nombre de sprites placés dans l'atlas
+    """
+    images = {}
+    for category in categories:
+        folder = os.path.join(items_dir, category)
+        if not os.path.isdir(folder):
+            continue
+        for file_name in sorted(os.listdir(folder)):
+            if file_name.lower().endswith(".png"):
+                images[f"{category}/{file_name}"] = pygame.image.load(os.path.join(folder, file_name))
+
+    if not images:
+        raise FileNotFoundError(f"Aucune image d'objet trouvée dans {items_dir}")
+
+    positions, width, height = pack_shelves({name: image.get_size() for name, image in images.items()})
+
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    sprites = {}
+    for name, (x, y) in positions.items():
+        atlas.blit(images[name], (x, y))
+        sprites[name] = [x, y, images[name].get_width(), images[name].get_height()]
+
+    pygame.image.save(atlas, os.path.join(items_dir, ATLAS_IMAGE_FILE))
+    with open(os.path.join(items_dir, ATLAS_INDEX_FILE), "w", encoding="utf-8") as file:
+        json.dump({"version": ATLAS_VERSION, "image": ATLAS_IMAGE_FILE, "sprites": sprites},
+                  file, ensure_ascii=False, indent=1, sort_keys=True)
+
+    return len(sprites)
+
+
+class Atlas:
+    """
+    Atlas de textures chargé à l'exécution : une seule lecture disque et une seule
+    grande surface, dont on distribue des sous-surfaces par nom de texture.
+    """
+
+    def __init__(self, image, sprites):
+        """
+        :param image: surface contenant tous les sprites
+        :param sprites: dictionnaire nom -> (x, y, largeur, hauteur)
+        """
+        self.image = image
+        self.sprites = sprites
+        self.subsurfaces = {}
+
+    @classmethod
+    def load(cls, items_dir=ITEMS_DIR):
+        """Charge l'atlas construit par build_atlas()"""
+        with open(os.path.join(items_dir, ATLAS_INDEX_FILE), encoding="utf-8") as file:
+            index = json.load(file)
+
+        if index.get("version") != ATLAS_VERSION:
+            raise ValueError("Erreur : l'index de l'atlas n'est pas à jour, relancez texture_atlas.py")
+
+        image = load_texture(os.path.join(items_dir, index["image"]))
+        return cls(image, {name: tuple(rect) for name, rect in index["sprites"].items()})
+
+    def __contains__(self, name):
+        return name in self.sprites
+
+    def get(self, name):
+        """
+        Retourne la sous-surface d'une texture (partagée, ne pas la modifier)
+        :param name: nom de la texture, ex: "Elements/fire.png"
+        :raises KeyError: si la texture n'est pas dans l'atlas
+        """
+        subsurface = self.subsurfaces.get(name)
+        if subsurface is None:
+            subsurface = self.image.subsurface(pygame.Rect(self.sprites[name]))
+            self.subsurfaces[name] = subsurface
+        return subsurface
+
+
+# Atlas partagé, chargé au premier besoin (False = pas d'atlas disponible)
+_shared_atlas = None
+
+
+def get_atlas():
+    """Retourne l'atlas partagé, ou None s'il n'a pas été construit"""
+    global _shared_atlas
+    if _shared_atlas is None:
+        try:
+            _shared_atlas = Atlas.load()
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug("Atlas de textures indisponible (%s), chargement image par image", e)
+            _shared_atlas = False
+    return _shared_atlas or None
+
+
+def load_item_texture(category, file_name, fallback_path=None):
+    """
+    Retourne la texture d'un objet depuis l'atlas, ou depuis son fichier si
+    l'atlas n'existe pas ou ne la contient pas
+    :param category: "Elements", "Potions" ou "Stones"
+    :param file_name: nom du fichier de la texture
+    :param fallback_path: chemin du fichier à utiliser hors atlas
+    :raises FileNotFoundError: si la texture n'existe nulle part
+    """
+    name = f"{category}/{file_name}"
+    atlas = get_atlas()
+    if atlas is not None and name in atlas:
+        return atlas.get(name)
+
+    if fallback_path is None:
+        fallback_path = os.path.join(ITEMS_DIR, category, file_name)
+    return load_texture(fallback_path)
+
+
+# Icônes redimensionnées pour l'inventaire, indexées par surface source puis par taille
+_scaled_icons = weakref.WeakKeyDictionary()
+
+
+def get_scaled_icon(image, size):
+    """
+    Retourne une copie redimensionnée d'une texture, calculée une seule fois
+    :param image: surface source
+    :param size: taille (largeur, hauteur) voulue
+    """
+    if image.get_size() == tuple(size):
+        return image
+
+    sizes = _scaled_icons.setdefault(image, {})
+    icon = sizes.get(size)
+    if icon is None:
+        icon = pygame.transform.scale(image, size)
+        sizes[size] = icon
+    return icon
+
+
+if __name__ == "__main__":
+    # Construction de l'atlas : python texture_atlas.py [dossier des objets]
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else ITEMS_DIR
+    count = build_atlas(target_dir)
+    print(f"Atlas construit : {count} sprites dans {os.path.join(target_dir, ATLAS_IMAGE_FILE)}")
@@ -0,0 +1,88 @@
+import os
+from collections import OrderedDict
+
+import pygame
+
+from constants import TEXTURE_CACHE_MAX_SIZE
+
+
+class TextureCache:
+    """
+    Cache des textures décodées, partagé par tout le processus.
+    Chaque fichier n'est lu et converti au format de l'écran qu'une seule fois ;
+    les instances (éléments, potions, ennemis...) partagent ensuite la même surface.
+    Les surfaces retournées ne doivent donc pas être modifiées : faire une copie si besoin.
+    """
+
+    def __init__(self, max_size=None):
+        """
+        :param max_size: nombre maximum de textures gardées (None = pas de limite).
+                         Au-delà, la texture la moins récemment utilisée est évincée.
+        """
+        self.max_size = max_size
+        self.textures = OrderedDict()
+
+        # Compteurs pour mesurer l'efficacité du cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, alpha=True):
+        """
+        Retourne la texture du fichier demandé, en la chargeant si nécessaire
+        :param path: chemin du fichier image
+        :param alpha: True pour convert_alpha(), False pour convert()
+        :return: la surface partagée
+        :raises FileNotFoundError: si le fichier n'existe pas (l'absence est aussi mise en cache)
+        """
+        key = (os.path.normpath(path), alpha)
+
+        if key in self.textures:
+            self.hits += 1
+            self.textures.move_to_end(key)
+            texture = self.textures[key]
+        else:
+            self.misses += 1
+            try:
+                image = pygame.image.load(path)
+                texture = image.convert_alpha() if alpha else image.convert()
+            except FileNotFoundError:
+                # On mémorise l'absence du fichier pour ne pas retourner sur le disque à chaque fois
+                texture = None
+            self._store(key, texture)
+
+        if texture is None:
+            raise FileNotFoundError(f"Texture introuvable : {path}")
+        return texture
+
+    def _store(self, key, texture):
+        """Ajoute une texture au cache en respectant la taille maximale"""
+        self.textures[key] = texture
+        if self.max_size is not None:
+            while len(self.textures) > self.max_size:
+                self.textures.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vide le cache (par exemple après un changement de mode vidéo)"""
+        self.textures.clear()
+
+    def stats(self):
+        """Retourne les compteurs du cache"""
+        requests = self.hits + self.misses
+        return {
+            "size": len(self.textures),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+
+# Instance partagée par tout le jeu
+texture_cache = TextureCache(TEXTURE_CACHE_MAX_SIZE)
+
+
+def load_texture(path, alpha=True):
+    """Raccourci vers le cache de textures partagé"""
+    return texture_cache.get(path, alpha)